@@ -1,5 +1,6 @@
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Optional, List, Dict
 import uvicorn
 import os
 import sys
@@ -11,9 +12,30 @@ from datetime import datetime
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'model_ai1')))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'model_traffic2')))
 
-from integrated_runner import calculate_integrated_scenario
-from model_ai1.what_if_engine import simulate_what_if
-from model_ai1.run_model import run_model as run_basic_model
+from startup import tracker as startup_tracker
+
+# Heavy subsystems (Gemini, Prophet/CmdStan, NumPy engines) are imported on first use
+# and warmed on a background thread once the server is up; see startup.py
+calculate_integrated_scenario = startup_tracker.lazy("integrated_runner", "calculate_integrated_scenario")
+sample_uncertainty_bands = startup_tracker.lazy("uncertainty", "sample_uncertainty_bands")
+load_traffic_aqi_beta = startup_tracker.lazy("integrated_batch", "load_traffic_aqi_beta")
+run_composition = startup_tracker.lazy("project_composer", "run_composition")
+optimize_siting = startup_tracker.lazy("siting_optimizer", "optimize_siting")
+run_sensitivity = startup_tracker.lazy("sensitivity", "run_sensitivity")
+run_basic_model = startup_tracker.lazy("model_ai1.run_model", "run_model")
+simulate_congestion = startup_tracker.lazy("congestion", "simulate_congestion")
+
+WARMUP_MODULES = [
+    "model_traffic2.artifact_registry",
+    "integrated_batch",
+    "uncertainty",
+    "project_composer",
+    "siting_optimizer",
+    "sensitivity",
+    "congestion",
+    "integrated_runner",
+    "model_ai1.run_model"
+]
 
 app = FastAPI(title="CityView Integrated AI Model")
 
@@ -22,16 +44,103 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
 OPENAI_OSS_API_KEY = os.getenv("OPENAI_OSS_API_KEY", "")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
+@app.on_event("startup")
+async def start_warmup():
+    startup_tracker.mark_ready()
+    if os.getenv("AI_SERVER_WARMUP", "1") != "0":
+        startup_tracker.warm_up(WARMUP_MODULES)
+
+@app.middleware("http")
+async def track_first_response(request, call_next):
+    response = await call_next(request)
+    startup_tracker.record_response(request.url.path, response.status_code)
+    return response
+
+# Request limits: out-of-range values are rejected with 422 before any work is done
+MAX_UNCERTAINTY_SAMPLES = 200000
+MAX_UNCERTAINTY_BUDGET_MS = 2000.0
+MIN_CELL_KM = 0.25
+MAX_CELL_KM = 5.0
+MAX_COMPOSITION_MONTHS = 120
+MIN_SENSITIVITY_EVALUATIONS = 64
+MAX_SENSITIVITY_EVALUATIONS = 1048576
+
 class SimulationRequest(BaseModel):
     lat: float
     lon: float
     scenario: str
     duration_months: int = 6
+    uncertainty: bool = False
+    uncertainty_samples: int = Field(10000, gt=0, le=MAX_UNCERTAINTY_SAMPLES)
+    uncertainty_seed: Optional[int] = None
+    uncertainty_budget_ms: float = Field(20.0, gt=0, le=MAX_UNCERTAINTY_BUDGET_MS)
 
 class BasicPredictionRequest(BaseModel):
     lat: float
     lon: float
 
+class CompositionRequest(BaseModel):
+    projects: List[Dict]
+    months: int = Field(24, ge=1, le=MAX_COMPOSITION_MONTHS)
+    cell_km: float = Field(0.5, ge=MIN_CELL_KM, le=MAX_CELL_KM)
+    baseline_aqi: Optional[float] = None
+    station_aqi: Optional[Dict[str, float]] = None
+    kernel: str = "exponential"
+    query_points: Optional[List[Dict]] = None
+    include_tensor: bool = False
+
+class SitingBounds(BaseModel):
+    lat_min: float
+    lat_max: float
+    lon_min: float
+    lon_max: float
+
+    @model_validator(mode="after")
+    def check_order(self):
+        if self.lat_min >= self.lat_max or self.lon_min >= self.lon_max:
+            raise ValueError("bounds need lat_min < lat_max and lon_min < lon_max")
+        return self
+
+class SitingRequest(BaseModel):
+    project_type: str = "park"
+    project: Optional[Dict] = None
+    months_ahead: int = Field(12, ge=1, le=MAX_COMPOSITION_MONTHS)
+    top_k: int = Field(5, ge=1, le=100)
+    cell_km: float = Field(0.5, ge=MIN_CELL_KM, le=MAX_CELL_KM)
+    baseline_aqi: Optional[float] = None
+    station_aqi: Optional[Dict[str, float]] = None
+    existing_projects: Optional[List[Dict]] = None
+    bounds: Optional[SitingBounds] = None
+    kernel: str = "exponential"
+
+class SensitivityRequest(BaseModel):
+    method: str = "sobol"
+    months_ahead: int = 6
+    duration_months: int = 6
+    n_evaluations: int = Field(65536, ge=MIN_SENSITIVITY_EVALUATIONS, le=MAX_SENSITIVITY_EVALUATIONS)
+    seed: Optional[int] = None
+    traffic_impact: Optional[float] = None
+    construction_score: Optional[float] = None
+    operational_score: Optional[float] = None
+    baseline_aqi: Optional[float] = None
+    ranges: Optional[Dict[str, List[float]]] = None
+
+    @field_validator("ranges")
+    @classmethod
+    def check_ranges(cls, ranges):
+        for name, bounds in (ranges or {}).items():
+            if len(bounds) != 2 or not bounds[0] < bounds[1]:
+                raise ValueError(f"ranges['{name}'] must be [low, high] with low < high")
+        return ranges
+
+class CongestionRequest(BaseModel):
+    projects: List[Dict]
+    damping: float = Field(0.6, gt=0, lt=1)
+    kernel: str = "exponential"
+    cell_km: float = Field(0.5, ge=MIN_CELL_KM, le=MAX_CELL_KM)
+    top_links: int = Field(20, ge=1, le=1000)
+    include_links: bool = False
+
 def call_meta_llama(prompt: str, api_key: str = None) -> str:
     """Call Groq Meta Llama 3.3 70B model for reasoning"""
     key_to_use = api_key or GROQ_API_KEY
@@ -182,6 +291,23 @@ async def predict_impact(request: SimulationRequest):
                 "technical_details": tech_result
             }
         }
+
+        # 4. Optional Monte Carlo bands (reuses the parsed scores, no extra LLM calls)
+        if request.uncertainty:
+            aqi_prediction = tech_result.get("aqi_prediction", {})
+            horizon = tech_result.get("forecast_horizon_months", 6)
+            response["uncertainty"] = sample_uncertainty_bands(
+                baseline_aqi=float(tech_result.get("baseline_aqi", 150)),
+                traffic_impact=float(tech_result.get("traffic_prediction", {}).get("traffic_impact", 0) or 0),
+                beta=tech_result.get("traffic_aqi_beta", 0.5),
+                duration_months=aqi_prediction.get("duration_months", 6) or 0,
+                construction_score=aqi_prediction.get("construction_impact_score", 0) or 0,
+                operational_score=aqi_prediction.get("operational_impact_score", 0) or 0,
+                horizons=(1, 3, 6, horizon),
+                n_samples=request.uncertainty_samples,
+                seed=request.uncertainty_seed,
+                time_budget_ms=request.uncertainty_budget_ms
+            )
         
         return response
 
@@ -190,6 +316,117 @@ async def predict_impact(request: SimulationRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/compose")
+async def compose_projects(request: CompositionRequest):
+    """
+    City-wide composition of several projects (location, type/scores, start, duration).
+    Returns per-month summaries, optional point queries and optionally the months x grid tensor.
+    """
+    try:
+        return run_composition(
+            request.projects,
+            months=request.months,
+            cell_km=request.cell_km,
+            baseline_aqi=request.baseline_aqi,
+            station_aqi=request.station_aqi,
+            beta=float(load_traffic_aqi_beta()),
+            kernel=request.kernel,
+            query_points=request.query_points,
+            include_tensor=request.include_tensor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Composition error: {str(e)}")
+
+@app.post("/api/optimize-siting")
+async def optimize_project_siting(request: SitingRequest):
+    """
+    Evaluates a project type at every candidate grid cell in one batched sweep and
+    returns the top-k sites by population-weighted AQI change.
+    """
+    try:
+        return optimize_siting(
+            project_type=request.project_type,
+            project=request.project,
+            months_ahead=request.months_ahead,
+            top_k=request.top_k,
+            cell_km=request.cell_km,
+            baseline_aqi=request.baseline_aqi,
+            station_aqi=request.station_aqi,
+            existing_projects=request.existing_projects,
+            beta=float(load_traffic_aqi_beta()),
+            kernel=request.kernel,
+            bounds=request.bounds.model_dump() if request.bounds else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Siting optimization error: {str(e)}")
+
+@app.post("/api/sensitivity")
+async def sensitivity_analysis(request: SensitivityRequest):
+    """
+    Sobol or Morris global sensitivity of the integrated traffic + AQI math.
+    Pure NumPy evaluation, no LLM calls.
+    """
+    try:
+        return run_sensitivity(
+            method=request.method,
+            months_ahead=request.months_ahead,
+            duration_months=request.duration_months,
+            n_evaluations=request.n_evaluations,
+            seed=request.seed,
+            ranges=request.ranges,
+            beta=float(load_traffic_aqi_beta()),
+            traffic_impact=request.traffic_impact,
+            construction_score=request.construction_score,
+            operational_score=request.operational_score,
+            baseline_aqi=request.baseline_aqi
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Sensitivity analysis error: {str(e)}")
+
+@app.post("/api/congestion")
+async def congestion_propagation(request: CongestionRequest):
+    """
+    Spreads the traffic change of one or more projects over the cached road network.
+    Returns per-link and per-cell congestion deltas.
+    """
+    try:
+        return simulate_congestion(
+            request.projects,
+            damping=request.damping,
+            kernel=request.kernel,
+            cell_km=request.cell_km,
+            top_links=request.top_links,
+            include_links=request.include_links
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Congestion propagation error: {str(e)}")
+
+@app.get("/api/models/status")
+async def model_status():
+    """Versions and load state of the served model artifacts"""
+    return {"artifacts": startup_tracker.load("model_traffic2.artifact_registry").registry.status()}
+
+@app.get("/api/startup-report")
+async def startup_report():
+    """Per-module import times, warmup state and time to first response"""
+    return startup_tracker.report()
+
 @app.get("/api/models/files")
 async def list_model_files():
     """List available model files"""
@@ -0,0 +1,94 @@
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'model_ai1')))
+
+from model_ai1.spatial_interpolation import haversine_batch
+
+# Ahmedabad extent used for city-wide grids
+AHMEDABAD_BOUNDS = {"lat_min": 22.90, "lat_max": 23.15, "lon_min": 72.45, "lon_max": 72.70}
+
+KM_PER_DEG_LAT = 111.32
+
+
+class CityGrid:
+    """
+    Regular lat/lon grid over the city. Cells are numbered row-major
+    (south to north, west to east) and exposed as flat arrays.
+    """
+
+    def __init__(self, bounds=None, cell_km=0.5):
+        self.bounds = dict(bounds or AHMEDABAD_BOUNDS)
+        self.cell_km = float(cell_km)
+
+        mid_lat = (self.bounds["lat_min"] + self.bounds["lat_max"]) / 2
+        self.dlat = self.cell_km / KM_PER_DEG_LAT
+        self.dlon = self.cell_km / (KM_PER_DEG_LAT * np.cos(np.radians(mid_lat)))
+
+        self.rows = int(np.ceil((self.bounds["lat_max"] - self.bounds["lat_min"]) / self.dlat))
+        self.cols = int(np.ceil((self.bounds["lon_max"] - self.bounds["lon_min"]) / self.dlon))
+
+        self.lat_centers = self.bounds["lat_min"] + (np.arange(self.rows) + 0.5) * self.dlat
+        self.lon_centers = self.bounds["lon_min"] + (np.arange(self.cols) + 0.5) * self.dlon
+
+        lat_grid, lon_grid = np.meshgrid(self.lat_centers, self.lon_centers, indexing="ij")
+        self.cell_lat = lat_grid.ravel()
+        self.cell_lon = lon_grid.ravel()
+
+        # Local equirectangular projection (km), accurate to well under 1% at city scale
+        self._km_per_deg_lon = KM_PER_DEG_LAT * np.cos(np.radians(mid_lat))
+        self.cell_x, self.cell_y = self.project_km(self.cell_lat, self.cell_lon)
+
+    @property
+    def shape(self):
+        return (self.rows, self.cols)
+
+    @property
+    def size(self):
+        return self.rows * self.cols
+
+    def contains(self, lat, lon):
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        return ((lat >= self.bounds["lat_min"]) & (lat <= self.bounds["lat_max"]) &
+                (lon >= self.bounds["lon_min"]) & (lon <= self.bounds["lon_max"]))
+
+    def locate(self, lat, lon):
+        """
+        Flat cell index for each point. Points outside the extent snap to the nearest edge cell.
+        """
+        row = np.floor((np.asarray(lat, dtype=float) - self.bounds["lat_min"]) / self.dlat).astype(int)
+        col = np.floor((np.asarray(lon, dtype=float) - self.bounds["lon_min"]) / self.dlon).astype(int)
+        row = np.clip(row, 0, self.rows - 1)
+        col = np.clip(col, 0, self.cols - 1)
+        return row * self.cols + col
+
+    def distances_km(self, lat, lon):
+        """
+        Distance matrix (points x cells) from each point to every cell centre.
+        """
+        lat = np.atleast_1d(np.asarray(lat, dtype=float))
+        lon = np.atleast_1d(np.asarray(lon, dtype=float))
+        return haversine_batch(lat[:, None], lon[:, None], self.cell_lat[None, :], self.cell_lon[None, :])
+
+    def project_km(self, lat, lon):
+        x = (np.asarray(lon, dtype=float) - self.bounds["lon_min"]) * self._km_per_deg_lon
+        y = (np.asarray(lat, dtype=float) - self.bounds["lat_min"]) * KM_PER_DEG_LAT
+        return x, y
+
+    def planar_distances_km(self, lat, lon):
+        """
+        Cheaper distances_km using the projected coordinates; use for large point sets.
+        """
+        x, y = self.project_km(np.atleast_1d(lat), np.atleast_1d(lon))
+        return np.hypot(x[:, None] - self.cell_x[None, :], y[:, None] - self.cell_y[None, :])
+
+    def describe(self):
+        return {
+            "bounds": self.bounds,
+            "cell_km": self.cell_km,
+            "rows": self.rows,
+            "cols": self.cols,
+            "cells": self.size
+        }
@@ -0,0 +1,195 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'model_traffic2')))
+
+from model_traffic2.road_edges import EDGE_TABLE_FILE, EARTH_RADIUS_M, HIGHWAY_WEIGHTS, build_edge_table
+from city_grid import CityGrid
+from project_composer import resolve_project, decay_kernel
+
+DEFAULT_DAMPING = 0.6
+
+# Links further than this many project radii get no direct demand change
+KERNEL_CUTOFF = 4.0
+
+
+class RoadNetwork:
+    """
+    Link graph of the cached road network for congestion propagation.
+
+    Links are the edge-table segments; two links are adjacent when they share
+    a node (A = B^T B for the node x link incidence B). Capacity is the
+    highway class weight (at least 1) times the number of directions. P is the
+    column-stochastic operator that moves demand from a link to its neighbours
+    in proportion to their capacity, so diffusion conserves total demand.
+    """
+
+    def __init__(self, path=EDGE_TABLE_FILE):
+        import scipy.sparse as sp
+        from scipy.spatial import cKDTree
+
+        if not os.path.exists(path) or "end_nodes" not in np.load(path).files:
+            build_edge_table(path=path)
+        table = np.load(path)
+
+        self.mid_lat = table["mid_lat"]
+        self.mid_lon = table["mid_lon"]
+        self.length_m = table["length_m"].astype(float)
+        self.classes = [str(c) for c in table["classes"]]
+        self.highway_class = table["highway_class"]
+        end_nodes = table["end_nodes"]
+        n_links = len(self.mid_lat)
+        n_nodes = int(end_nodes.max()) + 1 if n_links else 0
+
+        class_weight = np.array([max(HIGHWAY_WEIGHTS.get(c, 1), 1) for c in self.classes], dtype=float)
+        self.capacity = class_weight[self.highway_class] * table["directions"]
+
+        links = np.arange(n_links)
+        B = sp.csr_matrix(
+            (np.ones(2 * n_links), (end_nodes.T.ravel(), np.concatenate([links, links]))),
+            shape=(n_nodes, n_links)
+        )
+        A = (B.T @ B).tocsr()
+        A.setdiag(0)
+        A.eliminate_zeros()
+        A.data[:] = 1.0
+
+        # Isolated links keep their own demand
+        isolated = np.asarray(A.sum(axis=0)).ravel() == 0
+        A = A + sp.diags(isolated.astype(float))
+
+        # P[j, i] = cap_j / sum_{k ~ i} cap_k  for neighbours j of i
+        W = sp.diags(self.capacity) @ A
+        column_sums = np.asarray(W.sum(axis=0)).ravel()
+        self.P = (W @ sp.diags(1.0 / column_sums)).tocsr()
+
+        self.ref_lat = float(self.mid_lat.mean()) if n_links else 0.0
+        self._x, self._y = self.project(self.mid_lat, self.mid_lon)
+        self._tree = cKDTree(np.column_stack([self._x, self._y]))
+
+    @property
+    def size(self):
+        return len(self.mid_lat)
+
+    def project(self, lat, lon):
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        y = np.radians(lat) * EARTH_RADIUS_M
+        x = np.radians(lon) * EARTH_RADIUS_M * np.cos(np.radians(self.ref_lat))
+        return x, y
+
+    def demand_sources(self, projects, kernel="exponential"):
+        """
+        Demand change per link injected by the projects: traffic_impact% of the link's
+        capacity, scaled by the project's decay kernel over distance.
+        """
+        source = np.zeros(self.size)
+        for project in projects:
+            px, py = self.project(project["lat"], project["lon"])
+            radius_m = project["radius_km"] * 1000.0
+            idx = np.asarray(self._tree.query_ball_point([float(px), float(py)], r=KERNEL_CUTOFF * radius_m),
+                             dtype=np.int64)
+            if not len(idx):
+                continue
+            d_km = np.hypot(self._x[idx] - px, self._y[idx] - py) / 1000.0
+            weight = decay_kernel(d_km, project["radius_km"], kernel)
+            source[idx] += project["traffic_impact"] / 100.0 * weight * self.capacity[idx]
+        return source
+
+    def diffuse(self, source, damping=DEFAULT_DAMPING, tol=1e-6, max_iter=200):
+        """
+        x = (1 - a) * sum_k (a P)^k s, by repeated sparse mat-vecs until the next
+        term is below tol (relative to s). Returns (x, iterations).
+        """
+        total = np.abs(source).sum()
+        if total == 0:
+            return np.zeros_like(source), 0
+
+        term = source.copy()
+        x = term.copy()
+        iterations = 0
+        for iterations in range(1, max_iter + 1):
+            term = damping * (self.P @ term)
+            x += term
+            if np.abs(term).sum() < tol * total:
+                break
+        return (1 - damping) * x, iterations
+
+
+_network = None
+
+
+def get_road_network():
+    global _network
+    if _network is None:
+        _network = RoadNetwork()
+    return _network
+
+
+def simulate_congestion(projects, damping=DEFAULT_DAMPING, kernel="exponential", cell_km=0.5,
+                        top_links=20, include_links=False):
+    """
+    Congestion change on every road link and grid cell from one or more projects.
+
+    Each project (lat/lon plus type or explicit traffic_impact / radius_km, see
+    project_composer.resolve_project) changes demand on nearby links; the change
+    then spreads over the network by damped diffusion. Deltas are relative to link
+    capacity, in percent (negative = less congestion).
+    """
+    start = time.perf_counter()
+    network = get_road_network()
+    resolved = [resolve_project(p) for p in projects]
+
+    source = network.demand_sources(resolved, kernel)
+    flow, iterations = network.diffuse(source, damping)
+    link_delta = 100.0 * flow / network.capacity
+
+    grid = CityGrid(cell_km=cell_km)
+    cell = grid.locate(network.mid_lat, network.mid_lon)
+    inside = grid.contains(network.mid_lat, network.mid_lon)
+    cell_flow = np.bincount(cell[inside], weights=flow[inside], minlength=grid.size)
+    cell_capacity = np.bincount(cell[inside], weights=network.capacity[inside], minlength=grid.size)
+    affected = np.flatnonzero((cell_capacity > 0) & (np.abs(cell_flow) > 1e-9))
+    cell_delta = 100.0 * cell_flow[affected] / cell_capacity[affected]
+
+    order = np.argsort(-np.abs(link_delta))[:top_links]
+    result = {
+        "links": network.size,
+        "iterations": iterations,
+        "damping": damping,
+        "total_demand_change": round(float(source.sum()), 4),
+        "summary": {
+            "links_affected": int((np.abs(link_delta) > 1e-6).sum()),
+            "min_delta_percent": round(float(link_delta.min()), 4) if network.size else 0.0,
+            "max_delta_percent": round(float(link_delta.max()), 4) if network.size else 0.0,
+            "mean_delta_percent": round(float(np.average(link_delta, weights=network.capacity)), 4)
+            if network.size else 0.0
+        },
+        "top_links": [
+            {
+                "lat": round(float(network.mid_lat[i]), 6),
+                "lon": round(float(network.mid_lon[i]), 6),
+                "highway": network.classes[network.highway_class[i]],
+                "length_m": round(float(network.length_m[i]), 1),
+                "delta_percent": round(float(link_delta[i]), 4)
+            }
+            for i in order
+        ],
+        "grid": grid.describe(),
+        "cells": [
+            {
+                "cell": int(c),
+                "lat": round(float(grid.cell_lat[c]), 5),
+                "lon": round(float(grid.cell_lon[c]), 5),
+                "delta_percent": round(float(v), 4)
+            }
+            for c, v in zip(affected, cell_delta)
+        ]
+    }
+    if include_links:
+        result["link_delta_percent"] = np.round(link_delta, 4).tolist()
+
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
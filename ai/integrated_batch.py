@@ -0,0 +1,56 @@
+import sys
+import os
+
+# Add both model directories to path so we can import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'model_ai1')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'model_traffic2')))
+
+from model_ai1.what_if_engine import simulate_what_if_batch
+from model_traffic2.traffic_what_if import apply_traffic_what_if_batch
+from model_traffic2.artifact_registry import get_traffic_aqi_beta
+
+BASE_TRAFFIC_SIGNAL = 0.5
+DEFAULT_BETA = 0.5
+
+
+def load_traffic_aqi_beta():
+    """
+    Learned traffic -> AQI coefficient from the artifact registry, falling back to DEFAULT_BETA.
+    """
+    try:
+        return get_traffic_aqi_beta()
+    except Exception as e:
+        print(f"Warning: Could not load beta coefficient: {e}")
+        return DEFAULT_BETA # Default strict connection
+
+
+def evaluate_integrated_batch(baseline_aqi, traffic_impact, beta, months_ahead, duration_months,
+                              construction_score, operational_score,
+                              base_traffic_signal=BASE_TRAFFIC_SIGNAL, season_factor=1.0):
+    """
+    Pure-math part of calculate_integrated_scenario (steps 4 and 5), vectorized.
+    Every argument may be a scalar or a NumPy array; arrays broadcast against each other.
+    No LLM or network calls happen here.
+
+    Returns a dict of arrays: traffic_aqi_shift, adjusted_base_aqi and final_aqi.
+    """
+    baseline_aqi = baseline_aqi * season_factor
+
+    # Traffic what-if -> AQI shift through the learned beta
+    new_traffic_signal = apply_traffic_what_if_batch(base_traffic_signal, traffic_impact)
+    traffic_aqi_shift = (new_traffic_signal - base_traffic_signal) * beta * baseline_aqi
+    adjusted_base_aqi = baseline_aqi + traffic_aqi_shift
+
+    final_aqi = simulate_what_if_batch(
+        base_aqi=adjusted_base_aqi,
+        duration_months=duration_months,
+        months_ahead=months_ahead,
+        construction_score=construction_score,
+        operational_score=operational_score
+    )
+
+    return {
+        "traffic_aqi_shift": traffic_aqi_shift,
+        "adjusted_base_aqi": adjusted_base_aqi,
+        "final_aqi": final_aqi
+    }
@@ -1,7 +1,6 @@
 import sys
 import os
 import json
-import joblib
 
 # Add both model directories to path so we can import modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'model_ai1')))
@@ -19,6 +18,8 @@ from model_ai1.llm_parser import parse_sentence as parse_aqi_scenario
 from model_ai1.what_if_engine import simulate_what_if as simulate_aqi_what_if
 from model_ai1.run_model import fetch_station_data
 
+from integrated_batch import load_traffic_aqi_beta
+
 def calculate_integrated_scenario(lat, lon, user_prompt):
     """
     Returns a dictionary with the Integrated Simulation results.
@@ -80,17 +81,11 @@ def calculate_integrated_scenario(lat, lon, user_prompt):
     time.sleep(2)
 
     # 4. Integrate Traffic Influence into AQI
-    try:
-        # Use absolute path based on this file's location
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        beta_path = os.path.join(base_dir, 'model_traffic2', 'traffic_to_aqi_beta.pkl')
-        beta = joblib.load(beta_path)
-    except Exception as e:
-        print(f"Warning: Could not load beta coefficient: {e}")
-        beta = 0.5 # Default strict connection
+    beta = load_traffic_aqi_beta()
     
     traffic_induced_aqi_change = (new_traffic_signal - base_traffic_signal) * beta * current_aqi
     result["traffic_aqi_shift"] = traffic_induced_aqi_change
+    result["traffic_aqi_beta"] = float(beta)
 
     # 5. Run Final What-If Simulation
     adjusted_base_aqi = current_aqi + traffic_induced_aqi_change
@@ -23,12 +23,6 @@ from confidence_explainer import explain_confidence
 
 
 
-month = datetime.now().month
-season_factor = seasonal_multiplier(month)
-
-
-
-
 def fetch_station_data(station):
     """
     Fetch current AQI for a station and generate synthetic history.
@@ -87,6 +81,9 @@ def run_model(user_lat, user_lon):
         [{"lat": s["lat"], "lon": s["lon"], "aqi": s["aqi_6m"]} for s in station_predictions]
     )
 
+    # Seasonal factor for the current month
+    season_factor = seasonal_multiplier(datetime.now().month)
+
     aqi_1m *= season_factor
     aqi_3m *= season_factor
     aqi_6m *= season_factor
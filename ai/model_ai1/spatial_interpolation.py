@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 def haversine(lat1, lon1, lat2, lon2):
     R = 6371
@@ -15,3 +16,28 @@ def idw_interpolation(user_lat, user_lon, stations):
         num += w * s["aqi"]
         den += w
     return round(num / den, 2)
+
+
+def haversine_batch(lat1, lon1, lat2, lon2):
+    """
+    Vectorized haversine distance in km. Arguments broadcast like NumPy arrays.
+    """
+    R = 6371
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat/2)**2 + np.cos(lat1)*np.cos(lat2)*np.sin(dlon/2)**2
+    return R * 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+
+
+def idw_interpolation_batch(lats, lons, stations, key="aqi", power=2):
+    """
+    Vectorized idw_interpolation for many points at once (same 0.1 km distance floor).
+    """
+    s_lat = np.array([s["lat"] for s in stations], dtype=float)
+    s_lon = np.array([s["lon"] for s in stations], dtype=float)
+    values = np.array([s[key] for s in stations], dtype=float)
+
+    d = haversine_batch(np.asarray(lats, dtype=float)[..., None], np.asarray(lons, dtype=float)[..., None], s_lat, s_lon)
+    w = 1 / np.maximum(d, 0.1) ** power
+    return (w * values).sum(axis=-1) / w.sum(axis=-1)
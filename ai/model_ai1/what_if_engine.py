@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def simulate_what_if(base_aqi, duration_months, months_ahead, construction_score, operational_score):
     """
     Universal What-If Engine.
@@ -33,3 +36,26 @@ def simulate_what_if(base_aqi, duration_months, months_ahead, construction_score
          impact *= 0.7
 
     return round(base_aqi * (1 + impact), 2)
+
+
+def simulate_what_if_batch(base_aqi, duration_months, months_ahead, construction_score, operational_score):
+    """
+    Vectorized What-If Engine.
+    Same rules as simulate_what_if, evaluated with NumPy broadcasting so that
+    thousands of sampled scenarios/horizons run in one pass. Results are not rounded.
+    """
+    base_aqi = np.asarray(base_aqi, dtype=float)
+    duration_months = np.nan_to_num(np.asarray(duration_months, dtype=float))
+    months_ahead = np.asarray(months_ahead, dtype=float)
+
+    # Construction phase while months_ahead <= duration, operational afterwards
+    impact = np.where(
+        months_ahead <= duration_months,
+        np.asarray(construction_score, dtype=float),
+        np.asarray(operational_score, dtype=float)
+    )
+
+    # Same saturation damping as the scalar engine
+    impact = np.where((base_aqi > 200) & (impact > 0), impact * 0.7, impact)
+
+    return base_aqi * (1 + impact)
@@ -1,3 +1,13 @@
+import numpy as np
+
+# Activity multiplier per hour of day, same buckets as compute_activity_density
+ACTIVITY_MULTIPLIER = np.full(24, 0.9)
+ACTIVITY_MULTIPLIER[7:11] = 1.2     # morning peak
+ACTIVITY_MULTIPLIER[17:21] = 1.3    # evening peak
+ACTIVITY_MULTIPLIER[22:] = 0.6      # night
+ACTIVITY_MULTIPLIER[:6] = 0.6
+
+
 def compute_activity_density(population_density, hour):
     """
     Converts static population into time-aware activity demand
@@ -10,3 +20,11 @@ def compute_activity_density(population_density, hour):
         return population_density * 0.6
     else:
         return population_density * 0.9
+
+
+def compute_activity_density_batch(population_density, hours):
+    """
+    Vectorized compute_activity_density; population_density and hours broadcast.
+    """
+    hours = np.asarray(hours, dtype=np.int64) % 24
+    return np.asarray(population_density, dtype=float) * ACTIVITY_MULTIPLIER[hours]
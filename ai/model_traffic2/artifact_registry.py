@@ -0,0 +1,186 @@
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+# Relative so the registry works whether imported as ai.model_traffic2 or model_traffic2 (api_server)
+from .compiled_model import COMPILED_MODEL_FILE, load_compiled_model, load_compiled_beta
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_pickle(path):
+    # joblib (and scikit-learn, when unpickling) are only imported for legacy .pkl artifacts
+    import joblib
+    return joblib.load(path)
+
+
+def validate_traffic_model(model):
+    if not hasattr(model, "predict"):
+        raise ValueError("traffic model has no predict()")
+    return model
+
+
+def load_json(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def validate_station_means(means):
+    if not isinstance(means, dict) or not means:
+        raise ValueError("station traffic means must be a non-empty mapping")
+    return {str(k): float(v) for k, v in means.items()}
+
+
+def validate_beta(beta):
+    beta = float(beta)
+    if not math.isfinite(beta):
+        raise ValueError(f"beta is not finite: {beta}")
+    return beta
+
+
+class ArtifactRegistry:
+    """
+    Loads model files once per process and serves them from memory.
+
+    get() re-stats a file at most every `check_interval` seconds. When its mtime or
+    size changed, the file is loaded and validated off to the side and swapped in
+    with a single assignment, so requests never see a half-loaded model and a bad
+    file keeps the previous version in service. Every worker watches the same
+    files, so a retrained model written with os.replace() reaches all of them
+    without a restart.
+    """
+
+    def __init__(self, check_interval=2.0):
+        self.check_interval = check_interval
+        self._artifacts = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, path, loader=load_pickle, validator=None):
+        self._artifacts[name] = {
+            "path": path,
+            "loader": loader,
+            "validator": validator,
+            "value": None,
+            "stat": None,
+            "version": None,
+            "loaded_at": None,
+            "checked_at": 0.0,
+            "loads": 0,
+            "last_error": None
+        }
+
+    def get(self, name):
+        entry = self._artifacts[name]
+        now = time.monotonic()
+        if entry["value"] is None or now - entry["checked_at"] >= self.check_interval:
+            entry["checked_at"] = now
+            self._refresh(name, entry)
+        if entry["value"] is None:
+            raise RuntimeError(f"Artifact '{name}' unavailable: {entry['last_error']}")
+        return entry["value"]
+
+    def reload(self, name=None):
+        names = [name] if name else list(self._artifacts)
+        for n in names:
+            entry = self._artifacts[n]
+            entry["stat"] = None
+            self._refresh(n, entry)
+
+    def _refresh(self, name, entry):
+        try:
+            st = os.stat(entry["path"])
+        except OSError as e:
+            entry["last_error"] = str(e)
+            return
+
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if stat_key == entry["stat"]:
+            return
+
+        with self._lock:
+            if stat_key == entry["stat"]:
+                return
+            try:
+                with open(entry["path"], "rb") as f:
+                    version = hashlib.sha256(f.read()).hexdigest()[:12]
+                value = entry["loader"](entry["path"])
+                if entry["validator"]:
+                    value = entry["validator"](value)
+            except Exception as e:
+                print(f"Warning: could not load artifact '{name}': {e}")
+                entry["last_error"] = str(e)
+                entry["stat"] = stat_key  # don't retry a broken file until it changes
+                return
+
+            entry["value"] = value
+            entry["stat"] = stat_key
+            entry["version"] = version
+            entry["loaded_at"] = datetime.now().isoformat()
+            entry["loads"] += 1
+            entry["last_error"] = None
+
+    def status(self):
+        return {
+            name: {
+                "path": os.path.relpath(entry["path"], BASE_DIR),
+                "version": entry["version"],
+                "loaded": entry["value"] is not None,
+                "loaded_at": entry["loaded_at"],
+                "mtime": datetime.fromtimestamp(entry["stat"][0] / 1e9).isoformat() if entry["stat"] else None,
+                "size": entry["stat"][1] if entry["stat"] else None,
+                "loads": entry["loads"],
+                "last_error": entry["last_error"]
+            }
+            for name, entry in self._artifacts.items()
+        }
+
+
+registry = ArtifactRegistry()
+
+# The compiled JSON artifact is served when present, so the server runs without scikit-learn
+if os.path.exists(COMPILED_MODEL_FILE):
+    registry.register(
+        "traffic_ai_model",
+        COMPILED_MODEL_FILE,
+        loader=load_compiled_model,
+        validator=validate_traffic_model
+    )
+    registry.register(
+        "traffic_to_aqi_beta",
+        COMPILED_MODEL_FILE,
+        loader=load_compiled_beta,
+        validator=validate_beta
+    )
+else:
+    registry.register(
+        "traffic_ai_model",
+        os.path.join(BASE_DIR, "traffic_ai_model.pkl"),
+        validator=validate_traffic_model
+    )
+    registry.register(
+        "traffic_to_aqi_beta",
+        os.path.join(BASE_DIR, "traffic_to_aqi_beta.pkl"),
+        validator=validate_beta
+    )
+registry.register(
+    "station_traffic_means",
+    os.path.join(BASE_DIR, "station_traffic_means.json"),
+    loader=load_json,
+    validator=validate_station_means
+)
+
+
+def get_traffic_model():
+    return registry.get("traffic_ai_model")
+
+
+def get_traffic_aqi_beta():
+    return registry.get("traffic_to_aqi_beta")
+
+
+def get_station_traffic_means():
+    return registry.get("station_traffic_means")
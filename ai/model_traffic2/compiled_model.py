@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COMPILED_MODEL_FILE = os.path.join(BASE_DIR, "traffic_model.json")
+
+FORMAT_NAME = "cityview-linear"
+FORMAT_VERSION = 1
+
+
+def _checksum(payload):
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class CompiledLinearModel:
+    """
+    NumPy evaluation of an exported linear model: X @ coef_ + intercept_.
+
+    Mirrors the parts of the scikit-learn estimator that callers use
+    (predict, coef_, intercept_, feature_names_in_), so it can be served
+    wherever the pickled LinearRegression was.
+    """
+
+    def __init__(self, feature_names, coefficients, intercept, beta=None, version=None, created_at=None):
+        self.feature_names_in_ = np.array(feature_names, dtype=object)
+        self.coef_ = np.asarray(coefficients, dtype=np.float64)
+        self.intercept_ = float(intercept)
+        self.n_features_in_ = len(self.coef_)
+        self.beta = beta
+        self.version = version
+        self.created_at = created_at
+
+        if len(self.feature_names_in_) != self.n_features_in_:
+            raise ValueError("feature_names and coefficients differ in length")
+
+    def predict(self, X):
+        if hasattr(X, "columns"):
+            X = X[list(self.feature_names_in_)].to_numpy(dtype=np.float64)
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got {X.shape[1]}")
+        return X @ self.coef_ + self.intercept_
+
+
+def export_compiled_model(model, beta, path=COMPILED_MODEL_FILE, feature_names=None):
+    """
+    Writes a fitted linear model and the traffic->AQI beta as a versioned,
+    checksummed JSON artifact. The file is replaced atomically so serving
+    workers never read a partial write.
+    """
+    if feature_names is None:
+        feature_names = getattr(model, "feature_names_in_", None)
+    coefficients = np.ravel(model.coef_)
+    if feature_names is None:
+        feature_names = [f"x{i}" for i in range(len(coefficients))]
+
+    payload = {
+        "format": FORMAT_NAME,
+        "format_version": FORMAT_VERSION,
+        "model_type": "linear_regression",
+        "feature_names": [str(n) for n in feature_names],
+        "coefficients": [float(c) for c in coefficients],
+        "intercept": float(np.ravel(model.intercept_)[0]),
+        "beta": float(beta),
+        "created_at": datetime.now().isoformat()
+    }
+    artifact = dict(payload, sha256=_checksum(payload))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(artifact, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_compiled_model(path=COMPILED_MODEL_FILE):
+    """
+    Reads and verifies an artifact written by export_compiled_model.
+    """
+    with open(path, "r") as f:
+        artifact = json.load(f)
+
+    if artifact.get("format") != FORMAT_NAME:
+        raise ValueError(f"Not a {FORMAT_NAME} artifact: {path}")
+    if artifact.get("format_version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported format_version {artifact.get('format_version')}")
+
+    checksum = artifact.pop("sha256", None)
+    if checksum != _checksum(artifact):
+        raise ValueError(f"Checksum mismatch in {path}")
+
+    return CompiledLinearModel(
+        artifact["feature_names"],
+        artifact["coefficients"],
+        artifact["intercept"],
+        beta=artifact.get("beta"),
+        version=checksum[:12],
+        created_at=artifact.get("created_at")
+    )
+
+
+def load_compiled_beta(path=COMPILED_MODEL_FILE):
+    beta = load_compiled_model(path).beta
+    if beta is None:
+        raise ValueError(f"No beta in {path}")
+    return beta
+
+
+def convert_pickles(model_path=os.path.join(BASE_DIR, "traffic_ai_model.pkl"),
+                    beta_path=os.path.join(BASE_DIR, "traffic_to_aqi_beta.pkl"),
+                    path=COMPILED_MODEL_FILE):
+    """
+    One-off conversion of the existing joblib pickles (needs scikit-learn installed).
+    """
+    import joblib
+
+    return export_compiled_model(joblib.load(model_path), joblib.load(beta_path), path)
+
+
+if __name__ == "__main__":
+    out = convert_pickles()
+    model = load_compiled_model(out)
+    print(f"Compiled model written to {out} (version {model.version}, features {list(model.feature_names_in_)})")
@@ -14,4 +14,7 @@ AQI_STATIONS = [
     {"id": "paldi", "lat": 23.0280, "lon": 72.5182},
     {"id": "vastrapur", "lat": 23.0391, "lon": 72.5296},
     {"id": "naroda", "lat": 23.0670, "lon": 72.6677},
-]
\ No newline at end of file
+]
+
+# Traffic data is collected at the AQI station locations
+TRAFFIC_STATIONS = AQI_STATIONS
@@ -1,34 +1,46 @@
-from ai.model_traffic2.activity_density import compute_activity_density
-from ai.model_traffic2.population_density import get_population_density
-from ai.model_traffic2.road_density import compute_road_density
-from ai.model_traffic2.config import TRAFFIC_STATIONS
+from ai.model_traffic2.activity_density import ACTIVITY_MULTIPLIER
+from ai.model_traffic2.population_density import POPULATION_DENSITY, get_population_density
+from ai.model_traffic2.road_density_cache import load_road_density_cache
 import pandas as pd
 
-def build_dataset(df):
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
+DATASET_COLUMNS = [
+    "hour",
+    "is_weekend",
+    "month",
+    "road_density",
+    "activity_density",
+    "traffic_signal",
+    "aqi_change"
+]
 
-    df["hour"] = df["timestamp"].dt.hour
-    df["month"] = df["timestamp"].dt.month
-    df["is_weekend"] = (df["timestamp"].dt.weekday >= 5).astype(int)
+RAW_COLUMNS = ["timestamp", "station", "observed_aqi"]
 
-    road_map = {
-        s["id"]: compute_road_density(s["lat"], s["lon"])
-        for s in TRAFFIC_STATIONS
-    }
+# City average used by get_population_density for unknown stations
+DEFAULT_POPULATION = get_population_density(None)
 
-    df["road_density"] = df["station"].map(road_map)
 
-    df["population_density"] = df["station"].apply(get_population_density)
+def add_features(df, road_map):
+    """
+    Adds the time, density and traffic_signal columns to a raw frame, vectorized.
+    """
+    timestamp = pd.to_datetime(df["timestamp"])
+
+    df["hour"] = timestamp.dt.hour
+    df["month"] = timestamp.dt.month
+    df["is_weekend"] = (timestamp.dt.weekday >= 5).astype(int)
+
+    df["road_density"] = df["station"].map(road_map)
+    df["population_density"] = df["station"].map(POPULATION_DENSITY).fillna(DEFAULT_POPULATION)
 
-    # 🔥 NEW: activity-based demand
-    df["activity_density"] = df.apply(
-        lambda x: compute_activity_density(
-            x["population_density"], x["hour"]
-        ),
-        axis=1
-    )
+    # 🔥 activity-based demand: hour-bucket multiplier lookup
+    df["activity_density"] = df["population_density"] * ACTIVITY_MULTIPLIER[df["hour"].to_numpy()]
 
     df["traffic_signal"] = df["activity_density"] * df["road_density"]
+    return df
+
+
+def build_dataset(df):
+    df = add_features(df, load_road_density_cache())
 
     df["baseline_aqi"] = df.groupby("station")["observed_aqi"].transform("mean")
 
@@ -36,12 +48,47 @@ def build_dataset(df):
         df["observed_aqi"] - df["baseline_aqi"]
     ) / df["baseline_aqi"]
 
-    return df[[
-        "hour",
-        "is_weekend",
-        "month",
-        "road_density",
-        "activity_density",
-        "traffic_signal",
-        "aqi_change"
-    ]]
+    return df[DATASET_COLUMNS]
+
+
+def station_baselines(path, chunksize=500_000):
+    """
+    First pass over a raw CSV: mean observed_aqi per station.
+    """
+    sums, counts = None, None
+    for chunk in pd.read_csv(path, usecols=["station", "observed_aqi"], chunksize=chunksize):
+        grouped = chunk.groupby("station")["observed_aqi"].agg(["sum", "count"])
+        sums = grouped["sum"] if sums is None else sums.add(grouped["sum"], fill_value=0)
+        counts = grouped["count"] if counts is None else counts.add(grouped["count"], fill_value=0)
+
+    if sums is None:
+        return pd.Series(dtype=float)
+    return sums / counts
+
+
+def iter_dataset_chunks(path, chunksize=500_000):
+    """
+    build_dataset for raw CSVs that don't fit in memory. Two passes over the file:
+    the first computes each station's baseline AQI, the second yields feature
+    chunks of at most `chunksize` rows. The result is identical to
+    build_dataset(pd.read_csv(path)).
+    """
+    baselines = station_baselines(path, chunksize)
+    road_map = load_road_density_cache()
+
+    for chunk in pd.read_csv(path, usecols=RAW_COLUMNS, chunksize=chunksize):
+        chunk = add_features(chunk, road_map)
+        baseline = chunk["station"].map(baselines)
+        chunk["aqi_change"] = (chunk["observed_aqi"] - baseline) / baseline
+        yield chunk[DATASET_COLUMNS]
+
+
+def build_dataset_file(path, output_path, chunksize=500_000):
+    """
+    Streams a raw CSV through iter_dataset_chunks into a training CSV. Returns the row count.
+    """
+    rows = 0
+    for i, chunk in enumerate(iter_dataset_chunks(path, chunksize)):
+        chunk.to_csv(output_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        rows += len(chunk)
+    return rows
@@ -5,7 +5,7 @@ import os
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
-from ai.model_ai1.config import OPENWEATHER_API_KEY
+from ai.model_ai1.config import AQICN_API_KEY
 from ai.model_ai1.fetch_current_api import fetch_current_aqi
 
 def get_real_aqi():
@@ -15,7 +15,7 @@ def get_real_aqi():
     print(f"Fetching Real-Time AQI for: {lat}, {lon}")
     
     try:
-        aqi = fetch_current_aqi(lat, lon, OPENWEATHER_API_KEY)
+        aqi = fetch_current_aqi(lat, lon, AQICN_API_KEY)
         print(f"Real-Time AQI: {aqi}")
     except Exception as e:
         print(f"Error fetching AQI: {e}")
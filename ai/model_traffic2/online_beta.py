@@ -0,0 +1,217 @@
+import os
+from datetime import datetime
+
+import numpy as np
+
+from ai.model_traffic2.compiled_model import (
+    COMPILED_MODEL_FILE, CompiledLinearModel, export_compiled_model, load_compiled_model
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ONLINE_STATE_FILE = os.path.join(BASE_DIR, "online_beta_state.npz")
+
+DEFAULT_FORGETTING = 0.995
+DEFAULT_DELTA = 100.0
+# Stop discounting when P grows this large (no new information arriving: covariance wind-up)
+MAX_COVARIANCE_TRACE = 1e6
+
+
+class OnlineBetaLearner:
+    """
+    Recursive least squares with exponential forgetting for the traffic model.
+
+    theta holds the model coefficients followed by the intercept, P the inverse
+    information matrix. Each observation costs O(features^2): no refit over past
+    data. Older observations are down-weighted by `forgetting` per update, so the
+    coefficients track slow drift. Per-station baseline AQI is tracked with the
+    same forgetting factor, giving aqi_change for single snapshots the way
+    build_dataset does for a whole history.
+
+    beta is the coefficient of the last feature, as in train_traffic_model.
+    """
+
+    def __init__(self, feature_names, coefficients, intercept, forgetting=DEFAULT_FORGETTING,
+                 delta=DEFAULT_DELTA):
+        self.feature_names = [str(n) for n in feature_names]
+        self.theta = np.append(np.asarray(coefficients, dtype=float), float(intercept))
+        self.P = np.eye(len(self.theta)) * delta
+        self.forgetting = float(forgetting)
+        self.n_obs = 0
+        self.station_ids = []
+        self.station_baselines = np.zeros(0)
+        self.station_weights = np.zeros(0)
+        self.updated_at = None
+
+    @classmethod
+    def from_compiled(cls, path=COMPILED_MODEL_FILE, **kwargs):
+        """
+        Warm start from the currently served coefficients.
+        """
+        model = load_compiled_model(path)
+        return cls(model.feature_names_in_, model.coef_, model.intercept_, **kwargs)
+
+    @classmethod
+    def load(cls, path=ONLINE_STATE_FILE, **kwargs):
+        """
+        Restores a saved learner, or warm-starts from the served model if there is no state yet.
+        """
+        if not os.path.exists(path):
+            return cls.from_compiled(**kwargs)
+
+        state = np.load(path)
+        learner = cls([str(n) for n in state["feature_names"]], state["theta"][:-1], state["theta"][-1],
+                      forgetting=float(state["forgetting"]))
+        learner.theta = state["theta"].astype(float)
+        learner.P = state["P"].astype(float)
+        learner.n_obs = int(state["n_obs"])
+        learner.station_ids = [str(s) for s in state["station_ids"]]
+        learner.station_baselines = state["station_baselines"].astype(float)
+        learner.station_weights = state["station_weights"].astype(float)
+        learner.updated_at = str(state["updated_at"]) or None
+        return learner
+
+    def save(self, path=ONLINE_STATE_FILE):
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            feature_names=np.array(self.feature_names),
+            theta=self.theta,
+            P=self.P,
+            forgetting=self.forgetting,
+            n_obs=self.n_obs,
+            station_ids=np.array(self.station_ids, dtype=str),
+            station_baselines=self.station_baselines,
+            station_weights=self.station_weights,
+            updated_at=self.updated_at or ""
+        )
+        os.replace(tmp_path, path)
+        return path
+
+    @property
+    def coefficients(self):
+        return self.theta[:-1]
+
+    @property
+    def intercept(self):
+        return float(self.theta[-1])
+
+    @property
+    def beta(self):
+        return float(self.theta[-2])
+
+    def as_model(self):
+        return CompiledLinearModel(self.feature_names, self.coefficients, self.intercept, beta=self.beta)
+
+    def update(self, x, y):
+        """
+        One RLS step for feature row x (model feature order) and target y. Returns the prior error.
+        """
+        phi = np.append(np.asarray(x, dtype=float), 1.0)
+        lam = self.forgetting if np.trace(self.P) < MAX_COVARIANCE_TRACE else 1.0
+
+        P_phi = self.P @ phi
+        gain = P_phi / (lam + phi @ P_phi)
+        error = float(y - phi @ self.theta)
+
+        self.theta = self.theta + gain * error
+        self.P = (self.P - np.outer(gain, P_phi)) / lam
+        self.P = (self.P + self.P.T) / 2
+
+        self.n_obs += 1
+        self.updated_at = datetime.now().isoformat()
+        return error
+
+    def update_batch(self, X, y):
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        return np.array([self.update(X[i], y[i]) for i in range(len(y))])
+
+    def update_baselines(self, station_ids, observed_aqi):
+        """
+        Forgetting-weighted mean AQI per station, updated with this snapshot.
+        Returns the baselines for the given stations from before the update (NaN for
+        a station seen for the first time), so a target never includes its own observation.
+        """
+        index = {s: i for i, s in enumerate(self.station_ids)}
+        out = np.full(len(station_ids), np.nan)
+        for j, (station, aqi) in enumerate(zip(station_ids, observed_aqi)):
+            station = str(station)
+            if station not in index:
+                index[station] = len(self.station_ids)
+                self.station_ids.append(station)
+                self.station_baselines = np.append(self.station_baselines, float(aqi))
+                self.station_weights = np.append(self.station_weights, 0.0)
+            i = index[station]
+            if self.station_weights[i] > 0:
+                out[j] = self.station_baselines[i]
+            self.station_weights[i] = self.forgetting * self.station_weights[i] + 1.0
+            self.station_baselines[i] += (float(aqi) - self.station_baselines[i]) / self.station_weights[i]
+        return out
+
+    def observe_snapshot(self, df_raw):
+        """
+        Updates the learner from a collect_aqi_snapshot frame (station, timestamp, observed_aqi).
+        """
+        from ai.model_traffic2.dataset_builder import add_features
+        from ai.model_traffic2.road_density_cache import load_road_density_cache
+        from ai.model_traffic2.traffic_model import build_feature_matrix, station_traffic_means_batch
+
+        df = add_features(df_raw.copy(), load_road_density_cache())
+        df = df.dropna(subset=["observed_aqi", "road_density"])
+        if df.empty:
+            return np.zeros(0)
+
+        # Targets are relative to each station's baseline before this snapshot;
+        # a station's first snapshot only seeds its baseline
+        baseline = self.update_baselines(df["station"].tolist(), df["observed_aqi"].to_numpy(dtype=float))
+        known = np.isfinite(baseline) & (baseline > 0)
+        if not known.any():
+            return np.zeros(0)
+        df = df[known]
+        baseline = baseline[known]
+        aqi_change = (df["observed_aqi"].to_numpy(dtype=float) - baseline) / baseline
+
+        X = build_feature_matrix(
+            self.as_model(),
+            hours=df["hour"].to_numpy(),
+            is_weekend=df["is_weekend"].to_numpy(),
+            months=df["month"].to_numpy(),
+            traffic_signal=df["traffic_signal"].to_numpy(dtype=float),
+            station_mean=station_traffic_means_batch(df["station"].tolist())
+        )
+        return self.update_batch(X, aqi_change)
+
+    def publish(self, path=COMPILED_MODEL_FILE):
+        """
+        Writes the current coefficients and beta to the serving artifact. export_compiled_model
+        replaces the file atomically; the artifact registry picks it up on its next check.
+        """
+        return export_compiled_model(self.as_model(), self.beta, path)
+
+
+def run_online_update(min_observations=6, state_path=ONLINE_STATE_FILE, publish_path=COMPILED_MODEL_FILE):
+    """
+    Collects one AQI snapshot, updates the learner and publishes once it has
+    seen at least `min_observations` observations.
+    """
+    from ai.model_traffic2.collect_aqi import collect_aqi_snapshot
+
+    learner = OnlineBetaLearner.load(state_path)
+    errors = learner.observe_snapshot(collect_aqi_snapshot())
+    learner.save(state_path)
+
+    published = learner.n_obs >= min_observations
+    if published:
+        learner.publish(publish_path)
+
+    return {
+        "observations": len(errors),
+        "total_observations": learner.n_obs,
+        "mean_abs_error": float(np.abs(errors).mean()) if len(errors) else None,
+        "beta": learner.beta,
+        "published": published
+    }
+
+
+if __name__ == "__main__":
+    print(run_online_update())
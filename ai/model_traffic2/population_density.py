@@ -1,3 +1,5 @@
+import numpy as np
+
 POPULATION_DENSITY = {
     "bopal": 3500,
     "maninagar": 12000,
@@ -13,3 +15,13 @@ def get_population_density(station_id):
     Falls back to city average if unknown.
     """
     return POPULATION_DENSITY.get(station_id, 8000)
+
+
+def get_population_density_batch(station_ids):
+    """
+    Vectorized get_population_density: one dict lookup per distinct station id.
+    """
+    keys = np.array(["" if s is None else str(s) for s in station_ids])
+    unique, inverse = np.unique(keys, return_inverse=True)
+    values = np.array([get_population_density(s or None) for s in unique], dtype=float)
+    return values[inverse]
@@ -1,6 +1,22 @@
-import osmnx as ox
+from ai.model_traffic2.road_edges import HIGHWAY_WEIGHTS, get_road_density_index
+
 
 def compute_road_density(lat, lon, radius=1000):
+    # Offline first: cached Overpass edges, no network and no graph build
+    index = get_road_density_index()
+    if index.covered(lat, lon):
+        return index.density(lat, lon, radius)
+
+    return compute_road_density_osmnx(lat, lon, radius)
+
+
+def compute_road_density_batch(lats, lons, radius=1000):
+    return get_road_density_index().density_batch(lats, lons, radius)
+
+
+def compute_road_density_osmnx(lat, lon, radius=1000):
+    import osmnx as ox
+
     G = ox.graph_from_point((lat, lon), dist=radius, network_type="drive")
     roads = ox.graph_to_gdfs(G, nodes=False)
 
@@ -8,11 +24,6 @@ def compute_road_density(lat, lon, radius=1000):
     for road in roads["highway"]:
         if isinstance(road, list):
             road = road[0]
-        if road == "primary":
-            score += 3
-        elif road == "secondary":
-            score += 2
-        elif road in ["residential", "tertiary"]:
-            score += 1
+        score += HIGHWAY_WEIGHTS.get(road, 0)
 
     return score
@@ -16,5 +16,25 @@ def build_road_density_cache():
 
     print("Road density cache saved.")
 
+
+def load_road_density_cache(stations=TRAFFIC_STATIONS):
+    """
+    Road density per station id from road_density_cache.json. Stations missing
+    from the cache are computed once and written back.
+    """
+    cache = {}
+    if os.path.exists(CACHE_FILE):
+        with open(CACHE_FILE, "r") as f:
+            cache = json.load(f)
+
+    missing = [s for s in stations if s["id"] not in cache]
+    if missing:
+        for s in missing:
+            cache[s["id"]] = compute_road_density(s["lat"], s["lon"])
+        with open(CACHE_FILE, "w") as f:
+            json.dump(cache, f)
+
+    return cache
+
 if __name__ == "__main__":
     build_road_density_cache()
@@ -0,0 +1,316 @@
+import glob
+import json
+import os
+import re
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "..", "cache"))
+EDGE_TABLE_FILE = os.path.join(BASE_DIR, "road_edges.npz")
+
+# Weighting used by compute_road_density
+HIGHWAY_WEIGHTS = {
+    "primary": 3,
+    "secondary": 2,
+    "tertiary": 1,
+    "residential": 1,
+}
+
+ONEWAY_VALUES = {"yes", "true", "1", "-1", "reverse", "t", "f"}
+REVERSED_VALUES = {"-1", "reverse", "t"}
+
+# OSMnx network_type="drive" filter (Overpass !~ is an unanchored regex match)
+DRIVE_EXCLUDE = {
+    "area": re.compile("yes"),
+    "access": re.compile("private"),
+    "highway": re.compile(
+        "abandoned|bridleway|bus_guideway|construction|corridor|cycleway|elevator|escalator|"
+        "footway|no|path|pedestrian|planned|platform|proposed|raceway|razed|service|steps|track"
+    ),
+    "motor_vehicle": re.compile("no"),
+    "motorcar": re.compile("no"),
+    "service": re.compile("alley|driveway|emergency_access|parking|parking_aisle|private"),
+}
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def _haversine_m(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS_M * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def is_drivable(tags):
+    """
+    True when a way passes the OSMnx drive filter.
+    """
+    return "highway" in tags and not any(
+        key in tags and pattern.search(str(tags[key])) for key, pattern in DRIVE_EXCLUDE.items()
+    )
+
+
+def is_oneway(tags):
+    """
+    OSMnx oneway rule: oneway-tagged ways and roundabouts.
+    """
+    return str(tags.get("oneway", "no")).lower() in ONEWAY_VALUES or tags.get("junction") == "roundabout"
+
+
+def load_overpass_elements(cache_dir=CACHE_DIR):
+    """
+    Reads every cached Overpass response. Returns (nodes, ways, extents) where
+    nodes maps id -> (lat, lon), ways maps id -> way element and extents holds
+    each file's node bounding box (lat_min, lat_max, lon_min, lon_max).
+    """
+    nodes, ways, extents = {}, {}, []
+    for path in sorted(glob.glob(os.path.join(cache_dir, "*.json"))):
+        with open(path, "r") as f:
+            data = json.load(f)
+
+        lats, lons = [], []
+        for element in data.get("elements", []):
+            if element["type"] == "node":
+                nodes[element["id"]] = (element["lat"], element["lon"])
+                lats.append(element["lat"])
+                lons.append(element["lon"])
+            elif element["type"] == "way" and is_drivable(element.get("tags", {})):
+                ways[element["id"]] = element
+
+        if lats:
+            extents.append((min(lats), max(lats), min(lons), max(lons)))
+
+    return nodes, ways, extents
+
+
+def _directed_edges(nodes, ways):
+    """
+    Successor lists (node -> [(next node, way id)]) and predecessor lists of
+    the directed OSM graph: one edge per way step, both directions unless oneway.
+    """
+    succ, pred = {}, {}
+    for way_id, way in ways.items():
+        way_nodes = [n for n in way["nodes"] if n in nodes]
+        tags = way["tags"]
+        if str(tags.get("oneway", "no")).lower() in REVERSED_VALUES:
+            way_nodes = way_nodes[::-1]
+
+        steps = list(zip(way_nodes[:-1], way_nodes[1:]))
+        if not is_oneway(tags):
+            steps += [(v, u) for u, v in steps]
+        for u, v in steps:
+            succ.setdefault(u, []).append((v, way_id))
+            pred.setdefault(v, []).append(u)
+    return succ, pred
+
+
+def _is_endpoint(node, succ, pred):
+    # OSMnx rule: self-loops, dead ends and anything but a pass-through node
+    out = [v for v, _ in succ.get(node, [])]
+    inc = pred.get(node, [])
+    neighbours = set(out) | set(inc)
+    if node in neighbours or not out or not inc:
+        return True
+    return not (len(neighbours) == 2 and len(out) + len(inc) in (2, 4))
+
+
+def build_edge_table(cache_dir=CACHE_DIR, path=EDGE_TABLE_FILE):
+    """
+    Parses the cached Overpass JSON once into a compact edge table (.npz).
+
+    Ways pass the OSMnx drive filter and are simplified the way OSMnx does it:
+    edges are merged through every pass-through node (whichever way it belongs
+    to) and split at intersections, dead ends and oneway changes. Each segment
+    is stored with its midpoint, end points (and their node index, for building
+    the network), length, highway class (of the way each direction starts on)
+    and number of directed edges (2 unless oneway), so counts line up with
+    ox.graph_to_gdfs(G, nodes=False).
+    """
+    nodes, ways, extents = load_overpass_elements(cache_dir)
+    succ, pred = _directed_edges(nodes, ways)
+    endpoints = [n for n in dict.fromkeys(list(succ) + list(pred)) if _is_endpoint(n, succ, pred)]
+    endpoint_set = set(endpoints)
+
+    # Walk each directed edge out of an end point to the next end point; a
+    # two-way segment is found from both ends and kept once with 2 directions
+    paths = {}
+    for start in endpoints:
+        for first, way_id in succ.get(start, []):
+            walk, way_ids = [start, first], [way_id]
+            while walk[-1] not in endpoint_set:
+                prev, node = walk[-2], walk[-1]
+                nxt, way_id = next((v, w) for v, w in succ[node] if v != prev)
+                walk.append(nxt)
+                way_ids.append(way_id)
+
+            # Merged edges take the class of the way they start on, per direction
+            walk = tuple(walk)
+            highway = ways[way_ids[0]]["tags"]["highway"]
+            key = (min(walk, walk[::-1]), highway)
+            if key in paths:
+                paths[key][1] += 1
+            else:
+                paths[key] = [walk, 1]
+
+    classes = sorted({highway for _, highway in paths})
+    class_index = {name: i for i, name in enumerate(classes)}
+
+    mid_lat, mid_lon, lengths, class_codes, directions = [], [], [], [], []
+    ends, end_nodes = [], []
+    node_index = {}
+
+    for (_, highway), (path_nodes, n_dir) in paths.items():
+        segment = np.array([nodes[n] for n in path_nodes])
+        seg_steps = _haversine_m(segment[:-1, 0], segment[:-1, 1], segment[1:, 0], segment[1:, 1])
+        length = seg_steps.sum()
+
+        # Point halfway along the segment
+        cum = np.concatenate([[0.0], np.cumsum(seg_steps)])
+        half = length / 2
+        mid_lat.append(np.interp(half, cum, segment[:, 0]))
+        mid_lon.append(np.interp(half, cum, segment[:, 1]))
+        ends.append((segment[0, 0], segment[0, 1], segment[-1, 0], segment[-1, 1]))
+        end_nodes.append((
+            node_index.setdefault(path_nodes[0], len(node_index)),
+            node_index.setdefault(path_nodes[-1], len(node_index))
+        ))
+        lengths.append(length)
+        class_codes.append(class_index[highway])
+        directions.append(n_dir)
+
+    np.savez_compressed(
+        path,
+        mid_lat=np.array(mid_lat, dtype=np.float64),
+        mid_lon=np.array(mid_lon, dtype=np.float64),
+        ends=np.array(ends, dtype=np.float64).reshape(-1, 4),
+        end_nodes=np.array(end_nodes, dtype=np.int64).reshape(-1, 2),
+        length_m=np.array(lengths, dtype=np.float32),
+        highway_class=np.array(class_codes, dtype=np.uint8),
+        directions=np.array(directions, dtype=np.uint8),
+        classes=np.array(classes),
+        extents=np.array(extents, dtype=np.float64).reshape(-1, 4)
+    )
+    return path
+
+
+class RoadDensityIndex:
+    """
+    Offline road density over the edge table.
+
+    Edge midpoints are projected to local metres and put in a KD-tree. A query
+    uses the Chebyshev (p=inf) metric, i.e. the same square bounding box of
+    half-side `radius` that ox.graph_from_point(dist=radius) downloads, and sums
+    HIGHWAY_WEIGHTS over the directed edges inside it. Like OSMnx's truncation,
+    a segment counts only when both of its end points are inside the box, and
+    only the largest weakly connected component of what is left is kept
+    (retain_all=False); the KD-tree search on midpoints is widened by the
+    longest half-segment so no candidate is missed. No network, no graph build.
+    """
+
+    def __init__(self, path=EDGE_TABLE_FILE):
+        from scipy.spatial import cKDTree
+
+        if not os.path.exists(path):
+            build_edge_table(path=path)
+
+        table = np.load(path)
+        self.mid_lat = table["mid_lat"]
+        self.mid_lon = table["mid_lon"]
+        self.length_m = table["length_m"]
+        self.highway_class = table["highway_class"]
+        self.directions = table["directions"]
+        self.classes = [str(c) for c in table["classes"]]
+        self.extents = table["extents"]
+        self.end_nodes = table["end_nodes"]
+        ends = table["ends"]
+
+        class_weights = np.array([HIGHWAY_WEIGHTS.get(c, 0) for c in self.classes], dtype=np.float64)
+        self.edge_weight = class_weights[self.highway_class] * self.directions
+
+        self.ref_lat = float(self.mid_lat.mean())
+        self.mid_x, self.mid_y = self.project(self.mid_lat, self.mid_lon)
+        self.end_x, self.end_y = self.project(ends[:, [0, 2]], ends[:, [1, 3]])
+        self._tree = cKDTree(np.column_stack([self.mid_x, self.mid_y]))
+
+        # Largest midpoint -> end point offset (Chebyshev), used to widen searches
+        self._reach = float(np.max(np.maximum(
+            np.abs(self.end_x - self.mid_x[:, None]), np.abs(self.end_y - self.mid_y[:, None])
+        ), initial=0.0))
+
+    def project(self, lat, lon):
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        y = np.radians(lat) * EARTH_RADIUS_M
+        x = np.radians(lon) * EARTH_RADIUS_M * np.cos(np.radians(self.ref_lat))
+        return x, y
+
+    def covered(self, lat, lon):
+        """
+        True where the point lies inside the area of one of the cached downloads.
+        """
+        lat = np.asarray(lat, dtype=float)[..., None]
+        lon = np.asarray(lon, dtype=float)[..., None]
+        e = self.extents
+        inside = (lat >= e[:, 0]) & (lat <= e[:, 1]) & (lon >= e[:, 2]) & (lon <= e[:, 3])
+        return inside.any(axis=-1)
+
+    def _half_width(self, lat, radius):
+        # East-west half-side in projected metres: OSMnx widens the box by
+        # 1 / cos(lat) at the query point, the projection uses ref_lat
+        return radius * np.cos(np.radians(self.ref_lat)) / np.cos(np.radians(lat))
+
+    def _inside(self, idx, x, y, half_x, radius):
+        idx = np.asarray(idx, dtype=np.int64)
+        ex = np.abs(self.end_x[idx] - x)
+        ey = np.abs(self.end_y[idx] - y)
+        return idx[((ex <= half_x) & (ey <= radius)).all(axis=1)]
+
+    def _largest_component(self, idx):
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        if len(idx) == 0:
+            return idx
+        nodes, local = np.unique(self.end_nodes[idx], return_inverse=True)
+        local = local.reshape(-1, 2)
+        graph = coo_matrix((np.ones(len(idx)), (local[:, 0], local[:, 1])), shape=(len(nodes), len(nodes)))
+        _, labels = connected_components(graph, directed=False)
+        return idx[labels[local[:, 0]] == np.bincount(labels).argmax()]
+
+    def _kept(self, idx, x, y, half_x, radius):
+        return self._largest_component(self._inside(idx, x, y, half_x, radius))
+
+    def density(self, lat, lon, radius=1000):
+        x, y = self.project(lat, lon)
+        x, y = float(x), float(y)
+        half_x = float(self._half_width(lat, radius))
+        idx = self._tree.query_ball_point([x, y], r=max(half_x, radius) + self._reach, p=np.inf)
+        return int(self.edge_weight[self._kept(idx, x, y, half_x, radius)].sum())
+
+    def density_batch(self, lats, lons, radius=1000):
+        x, y = self.project(lats, lons)
+        x, y = np.atleast_1d(x), np.atleast_1d(y)
+        half_x = np.atleast_1d(self._half_width(lats, radius))
+        reach = max(float(half_x.max(initial=radius)), radius) + self._reach
+        neighbours = self._tree.query_ball_point(np.column_stack([x, y]), r=reach, p=np.inf)
+        return np.array([
+            self.edge_weight[self._kept(idx, x[i], y[i], half_x[i], radius)].sum()
+            for i, idx in enumerate(neighbours)
+        ], dtype=np.int64)
+
+
+_index = None
+
+
+def get_road_density_index():
+    global _index
+    if _index is None:
+        _index = RoadDensityIndex()
+    return _index
+
+
+if __name__ == "__main__":
+    out = build_edge_table()
+    table = np.load(out)
+    print(f"Edge table written to {out}: {len(table['mid_lat'])} segments, classes {[str(c) for c in table['classes']]}")
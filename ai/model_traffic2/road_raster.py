@@ -0,0 +1,183 @@
+import json
+import os
+
+import numpy as np
+
+from ai.model_traffic2.road_edges import (
+    EDGE_TABLE_FILE, EARTH_RADIUS_M, HIGHWAY_WEIGHTS, build_edge_table
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RASTER_FILE = os.path.join(BASE_DIR, "road_raster.npy")
+RASTER_META_FILE = os.path.join(BASE_DIR, "road_raster.json")
+
+# Ahmedabad extent, grown at build time to cover every cached download
+RASTER_BOUNDS = {"lat_min": 22.90, "lat_max": 23.15, "lon_min": 72.45, "lon_max": 72.70}
+RASTER_CELL_M = 50.0
+
+# Relative over-count of density() against road_density_cache.json at the stations
+RASTER_DENSITY_TOLERANCE = 0.10
+
+# Sqrt(pi)/2: half-side of the square with the same area as a circle of radius 1
+CIRCLE_HALF_SIDE = np.sqrt(np.pi) / 2
+
+
+def build_road_raster(edge_path=EDGE_TABLE_FILE, path=RASTER_FILE, meta_path=RASTER_META_FILE,
+                      cell_m=RASTER_CELL_M):
+    """
+    Rasterises the edge table into per-class summed-area tables and saves them as .npy.
+
+    Array layout is (2, classes, rows + 1, cols + 1): channel 0 holds directed edge
+    counts (each segment at its midpoint cell), channel 1 road length in metres
+    (spread along the segment). Row/column 0 is the zero border of the integral image.
+    """
+    if not os.path.exists(edge_path):
+        build_edge_table(path=edge_path)
+    table = np.load(edge_path)
+    classes = [str(c) for c in table["classes"]]
+    extents = table["extents"]
+
+    bounds = {
+        "lat_min": float(min(RASTER_BOUNDS["lat_min"], extents[:, 0].min())),
+        "lat_max": float(max(RASTER_BOUNDS["lat_max"], extents[:, 1].max())),
+        "lon_min": float(min(RASTER_BOUNDS["lon_min"], extents[:, 2].min())),
+        "lon_max": float(max(RASTER_BOUNDS["lon_max"], extents[:, 3].max())),
+    }
+    ref_lat = (bounds["lat_min"] + bounds["lat_max"]) / 2
+    dlat = np.degrees(cell_m / EARTH_RADIUS_M)
+    dlon = dlat / np.cos(np.radians(ref_lat))
+    rows = int(np.ceil((bounds["lat_max"] - bounds["lat_min"]) / dlat))
+    cols = int(np.ceil((bounds["lon_max"] - bounds["lon_min"]) / dlon))
+
+    def cell_of(lat, lon):
+        r = np.clip(((lat - bounds["lat_min"]) / dlat).astype(np.int64), 0, rows - 1)
+        c = np.clip(((lon - bounds["lon_min"]) / dlon).astype(np.int64), 0, cols - 1)
+        return r, c
+
+    grid = np.zeros((2, len(classes), rows, cols), dtype=np.float64)
+    code = table["highway_class"].astype(np.int64)
+
+    # Counts at the midpoint cell
+    r, c = cell_of(table["mid_lat"], table["mid_lon"])
+    np.add.at(grid[0], (code, r, c), table["directions"])
+
+    # Lengths sampled along the chord between the end points, <= half a cell apart
+    ends = table["ends"]
+    length = table["length_m"].astype(np.float64)
+    n_samples = np.maximum(np.ceil(length / (cell_m / 2)).astype(np.int64), 1)
+    seg = np.repeat(np.arange(len(length)), n_samples)
+    offset = np.arange(len(seg)) - np.repeat(np.cumsum(n_samples) - n_samples, n_samples)
+    t = (offset + 0.5) / n_samples[seg]
+    lat = ends[seg, 0] + t * (ends[seg, 2] - ends[seg, 0])
+    lon = ends[seg, 1] + t * (ends[seg, 3] - ends[seg, 1])
+    r, c = cell_of(lat, lon)
+    np.add.at(grid[1], (code[seg], r, c), length[seg] / n_samples[seg])
+
+    sat = np.zeros((2, len(classes), rows + 1, cols + 1), dtype=np.float64)
+    sat[:, :, 1:, 1:] = grid.cumsum(axis=2).cumsum(axis=3)
+    np.save(path, sat)
+
+    meta = {
+        "bounds": bounds,
+        "cell_m": cell_m,
+        "dlat": dlat,
+        "dlon": dlon,
+        "rows": rows,
+        "cols": cols,
+        "classes": classes,
+        "channels": ["count", "length_m"]
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    return path
+
+
+class RoadRaster:
+    """
+    Memory-mapped summed-area tables of road counts and lengths per highway class.
+
+    Any axis-aligned window costs four lookups per class, whatever its size, so
+    city-wide density maps don't need a range query per cell. Windows snap to
+    whole raster cells (RASTER_CELL_M), which is the price of O(1) queries.
+
+    Counts are a map-scale estimate, not the training scale: each segment
+    counts at its midpoint cell, without road_edges' both-end-points rule or
+    largest-component trimming, so at the stations a window reads 0 to
+    RASTER_DENSITY_TOLERANCE above road_density_cache.json. Predictions take
+    their density from traffic_model.road_density_at instead.
+    """
+
+    def __init__(self, path=RASTER_FILE, meta_path=RASTER_META_FILE):
+        # Rebuild when missing or older than the edge table it was rasterised from
+        if not (os.path.exists(path) and os.path.exists(meta_path)) or (
+                os.path.exists(EDGE_TABLE_FILE) and os.path.getmtime(EDGE_TABLE_FILE) > os.path.getmtime(path)):
+            build_road_raster(path=path, meta_path=meta_path)
+
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        self.bounds = meta["bounds"]
+        self.cell_m = meta["cell_m"]
+        self.dlat = meta["dlat"]
+        self.dlon = meta["dlon"]
+        self.rows = meta["rows"]
+        self.cols = meta["cols"]
+        self.classes = meta["classes"]
+        self.sat = np.load(path, mmap_mode="r")
+
+        self.class_weights = np.array([HIGHWAY_WEIGHTS.get(c, 0) for c in self.classes], dtype=np.float64)
+
+    def _window(self, lats, lons, half_side_m):
+        lats = np.atleast_1d(np.asarray(lats, dtype=float))
+        lons = np.atleast_1d(np.asarray(lons, dtype=float))
+        # Cells are cell_m on both sides, so the half-side in cells is the same along rows and columns
+        half = np.asarray(half_side_m, dtype=float) / self.cell_m
+
+        row = (lats - self.bounds["lat_min"]) / self.dlat
+        col = (lons - self.bounds["lon_min"]) / self.dlon
+        r0 = np.clip(np.round(row - half), 0, self.rows).astype(np.int64)
+        r1 = np.clip(np.round(row + half), 0, self.rows).astype(np.int64)
+        c0 = np.clip(np.round(col - half), 0, self.cols).astype(np.int64)
+        c1 = np.clip(np.round(col + half), 0, self.cols).astype(np.int64)
+        return r0, r1, c0, c1
+
+    def window_sums(self, lats, lons, half_side_m, channel=0):
+        """
+        Per-class totals (points x classes) inside square windows of the given half-side.
+        """
+        r0, r1, c0, c1 = self._window(lats, lons, half_side_m)
+        s = self.sat[channel]
+        return (s[:, r1, c1] - s[:, r0, c1] - s[:, r1, c0] + s[:, r0, c0]).T
+
+    def density(self, lats, lons, radius=1000, shape="square"):
+        """
+        Weighted road density (compute_road_density scale). "square" is the
+        ox.graph_from_point bounding box of half-side `radius`; "circle" uses the
+        equal-area square, half-side radius * sqrt(pi) / 2.
+        """
+        half_side = radius * CIRCLE_HALF_SIDE if shape == "circle" else radius
+        return self.window_sums(lats, lons, half_side, channel=0) @ self.class_weights
+
+    def length_km(self, lats, lons, radius=1000, shape="square"):
+        """
+        Road length (km) per class inside the window, as {class: array}.
+        """
+        half_side = radius * CIRCLE_HALF_SIDE if shape == "circle" else radius
+        sums = self.window_sums(lats, lons, half_side, channel=1) / 1000.0
+        return {name: sums[:, i] for i, name in enumerate(self.classes)}
+
+
+_raster = None
+
+
+def get_road_raster():
+    global _raster
+    if _raster is None:
+        _raster = RoadRaster()
+    return _raster
+
+
+if __name__ == "__main__":
+    out = build_road_raster()
+    raster = RoadRaster()
+    print(f"Road raster written to {out}: {raster.rows}x{raster.cols} cells of {raster.cell_m:.0f} m, "
+          f"{len(raster.classes)} classes")
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from ai.model_ai1.config import AQICN_API_KEY, AQI_STATIONS as AQI_MODEL_STATIONS
+from ai.model_ai1.fetch_current_api import fetch_current_aqi
+from ai.model_traffic2.config import TRAFFIC_STATIONS
+from ai.model_traffic2.snapshot_store import SnapshotStore, SNAPSHOT_DIR
+
+DEFAULT_INTERVAL_S = int(os.getenv("SNAPSHOT_INTERVAL_S", "900"))
+METRICS_FILE = os.path.join(SNAPSHOT_DIR, "metrics.json")
+
+
+def collector_stations():
+    """
+    TRAFFIC_STATIONS plus the AQI model stations, one entry per station id.
+    """
+    stations = {}
+    for s in list(TRAFFIC_STATIONS) + list(AQI_MODEL_STATIONS):
+        stations.setdefault(s["id"], s)
+    return list(stations.values())
+
+
+class SnapshotCollector:
+    """
+    Fetches every station concurrently on a fixed cadence and appends the
+    readings to a SnapshotStore.
+
+    Timestamps are aligned to the cadence, so a rerun or an overlapping
+    worker writes the same (station, timestamp) key and is deduplicated.
+    A station that still fails after `retries` attempts is left as a gap for
+    that slot. Closed days are compacted after the UTC day rolls over.
+    """
+
+    def __init__(self, store=None, interval_s=DEFAULT_INTERVAL_S, stations=None, max_workers=8,
+                 retries=3, backoff_s=2.0, fetch=fetch_current_aqi, api_key=AQICN_API_KEY,
+                 metrics_file=METRICS_FILE):
+        self.store = store or SnapshotStore()
+        self.interval_s = interval_s
+        self.stations = stations or collector_stations()
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.fetch = fetch
+        self.api_key = api_key
+        self.metrics_file = metrics_file
+        self._last_day = None
+        self._metrics = {
+            "runs": 0,
+            "rows_written": 0,
+            "duplicates_skipped": 0,
+            "fetch_failures": 0,
+            "retries": 0,
+            "segments_compacted": 0,
+            "last_run_at": None,
+            "last_run_ms": None,
+            "last_error": None,
+            "stations": {}
+        }
+
+    def _fetch_station(self, station):
+        attempts = 0
+        for attempt in range(self.retries):
+            attempts += 1
+            try:
+                aqi = self.fetch(station["lat"], station["lon"], self.api_key)
+                if aqi is not None:
+                    return station, aqi, attempts, None
+                error = "no AQI returned"
+            except Exception as e:
+                error = str(e)
+            if attempt < self.retries - 1:
+                time.sleep(self.backoff_s * (2 ** attempt))
+        return station, None, attempts, error
+
+    def collect_once(self, now=None):
+        """
+        One collection round. Returns the rows written this round.
+        """
+        start = time.perf_counter()
+        now = now or time.time()
+        slot = int(now // self.interval_s * self.interval_s)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(self._fetch_station, self.stations))
+
+        rows = []
+        m = self._metrics
+        for station, aqi, attempts, error in results:
+            m["retries"] += attempts - 1
+            status = m["stations"].setdefault(station["id"], {"last_success": None, "failures": 0})
+            if aqi is None:
+                m["fetch_failures"] += 1
+                status["failures"] += 1
+                status["last_error"] = error
+                continue
+            status["last_success"] = datetime.fromtimestamp(slot, tz=timezone.utc).isoformat()
+            rows.append({
+                "station": station["id"],
+                "timestamp": slot,
+                "observed_aqi": aqi,
+                "lat": station["lat"],
+                "lon": station["lon"]
+            })
+
+        try:
+            written, duplicates = self.store.append(rows)
+            m["last_error"] = None
+        except Exception as e:
+            print(f"Warning: snapshot write failed: {e}")
+            written, duplicates = 0, 0
+            m["last_error"] = str(e)
+
+        m["runs"] += 1
+        m["rows_written"] += written
+        m["duplicates_skipped"] += duplicates
+        m["last_run_at"] = datetime.now(timezone.utc).isoformat()
+
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        if self._last_day is not None and today != self._last_day:
+            m["segments_compacted"] += sum(self.store.compact_closed_days().values())
+        self._last_day = today
+
+        m["last_run_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self._write_metrics()
+        return written
+
+    def metrics(self):
+        return json.loads(json.dumps(self._metrics))
+
+    def _write_metrics(self):
+        try:
+            tmp_path = f"{self.metrics_file}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._metrics, f, indent=2)
+            os.replace(tmp_path, self.metrics_file)
+        except OSError as e:
+            print(f"Warning: could not write collector metrics: {e}")
+
+    def run_forever(self, stop_event=None):
+        """
+        Collects at every cadence boundary until stop_event is set.
+        """
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            try:
+                self.collect_once()
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                self._metrics["last_error"] = str(e)
+            wait = self.interval_s - (time.time() % self.interval_s)
+            stop_event.wait(wait)
+
+
+if __name__ == "__main__":
+    collector = SnapshotCollector()
+    print(f"Collecting {len(collector.stations)} stations every {collector.interval_s}s into {collector.store.root}")
+    collector.run_forever()
@@ -0,0 +1,181 @@
+import glob
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_DIR = os.path.join(BASE_DIR, "snapshots")
+
+COLUMNS = ["station", "timestamp", "observed_aqi", "lat", "lon"]
+COMPACTED_SEGMENT = "compacted.npz"
+
+
+def _day(ts):
+    return datetime.fromtimestamp(int(ts), tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _epoch(value):
+    # Naive values are taken as UTC, aware ones are converted
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts.timestamp()
+
+
+class SnapshotStore:
+    """
+    Append-only columnar store of station readings, partitioned by UTC day.
+
+    Each append writes one small .npz segment (one array per column) into
+    date=YYYY-MM-DD/. compact() merges a day's segments into a single
+    compacted.npz, dropping duplicate (station, timestamp) rows, so closed
+    days end up as one file. Timestamps are epoch seconds.
+    """
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._keys = {}   # day -> set of (station, timestamp) already stored
+        os.makedirs(root, exist_ok=True)
+
+    def _partition(self, day):
+        return os.path.join(self.root, f"date={day}")
+
+    def _segments(self, day):
+        return sorted(glob.glob(os.path.join(self._partition(day), "*.npz")))
+
+    def days(self):
+        return sorted(
+            os.path.basename(p)[len("date="):]
+            for p in glob.glob(os.path.join(self.root, "date=*"))
+            if os.path.isdir(p)
+        )
+
+    @staticmethod
+    def _read_segment(path):
+        with np.load(path) as data:
+            return {c: data[c] for c in COLUMNS}
+
+    def _day_keys(self, day):
+        if day not in self._keys:
+            keys = set()
+            for path in self._segments(day):
+                seg = self._read_segment(path)
+                keys.update(zip(seg["station"].tolist(), seg["timestamp"].tolist()))
+            self._keys[day] = keys
+        return self._keys[day]
+
+    def append(self, rows):
+        """
+        Writes rows (dicts with COLUMNS) not already stored. Returns (written, duplicates).
+        """
+        if not rows:
+            return 0, 0
+
+        written, duplicates = 0, 0
+        with self._lock:
+            by_day, pending = {}, set()
+            for row in rows:
+                key = (str(row["station"]), int(row["timestamp"]))
+                day = _day(key[1])
+                if key in pending or key in self._day_keys(day):
+                    duplicates += 1
+                    continue
+                pending.add(key)
+                by_day.setdefault(day, []).append(row)
+
+            for day, day_rows in by_day.items():
+                self._write_segment(day, day_rows)
+                self._keys[day].update((str(r["station"]), int(r["timestamp"])) for r in day_rows)
+                written += len(day_rows)
+
+        return written, duplicates
+
+    def _write_segment(self, day, rows):
+        os.makedirs(self._partition(day), exist_ok=True)
+        name = f"segment-{datetime.now(timezone.utc).strftime('%H%M%S%f')}-{os.getpid()}.npz"
+        path = os.path.join(self._partition(day), name)
+        columns = {
+            "station": np.array([str(r["station"]) for r in rows]),
+            "timestamp": np.array([int(r["timestamp"]) for r in rows], dtype=np.int64),
+            "observed_aqi": np.array([float(r["observed_aqi"]) for r in rows], dtype=np.float64),
+            "lat": np.array([float(r.get("lat", np.nan)) for r in rows], dtype=np.float64),
+            "lon": np.array([float(r.get("lon", np.nan)) for r in rows], dtype=np.float64),
+        }
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, **columns)
+        os.replace(tmp_path, path)
+
+    def compact(self, day):
+        """
+        Merges all segments of a day into compacted.npz (sorted by timestamp, deduplicated).
+        Returns the number of segment files removed.
+        """
+        with self._lock:
+            segments = self._segments(day)
+            if len(segments) <= 1 and (not segments or segments[0].endswith(COMPACTED_SEGMENT)):
+                return 0
+
+            parts = [self._read_segment(p) for p in segments]
+            merged = {c: np.concatenate([p[c] for p in parts]) for c in COLUMNS}
+
+            order = np.lexsort((merged["station"], merged["timestamp"]))
+            merged = {c: v[order] for c, v in merged.items()}
+            keep = np.ones(len(order), dtype=bool)
+            keep[1:] = ((merged["timestamp"][1:] != merged["timestamp"][:-1]) |
+                        (merged["station"][1:] != merged["station"][:-1]))
+            merged = {c: v[keep] for c, v in merged.items()}
+
+            target = os.path.join(self._partition(day), COMPACTED_SEGMENT)
+            tmp_path = f"{target}.tmp.npz"
+            np.savez(tmp_path, **merged)
+            os.replace(tmp_path, target)
+
+            removed = 0
+            for path in segments:
+                if path != target:
+                    os.remove(path)
+                    removed += 1
+            self._keys.pop(day, None)
+            return removed
+
+    def compact_closed_days(self):
+        """
+        Compacts every partition before today (UTC). Returns {day: segments removed}.
+        """
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        return {day: self.compact(day) for day in self.days() if day < today}
+
+    def read(self, start=None, end=None, stations=None):
+        """
+        Readings as a DataFrame (station, timestamp, observed_aqi, lat, lon), the
+        input format of build_dataset. start/end are anything pd.Timestamp accepts;
+        naive values are read as UTC.
+        """
+        start_ts = _epoch(start) if start is not None else None
+        end_ts = _epoch(end) if end is not None else None
+
+        parts = []
+        for day in self.days():
+            if start_ts is not None and day < _day(start_ts):
+                continue
+            if end_ts is not None and day > _day(end_ts):
+                continue
+            parts.extend(self._read_segment(p) for p in self._segments(day))
+
+        if not parts:
+            return pd.DataFrame(columns=COLUMNS)
+
+        df = pd.DataFrame({c: np.concatenate([p[c] for p in parts]) for c in COLUMNS})
+        if start_ts is not None:
+            df = df[df["timestamp"] >= start_ts]
+        if end_ts is not None:
+            df = df[df["timestamp"] <= end_ts]
+        if stations is not None:
+            df = df[df["station"].isin(list(stations))]
+
+        df = df.drop_duplicates(["station", "timestamp"]).sort_values(["timestamp", "station"])
+        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
+        return df.reset_index(drop=True)
@@ -0,0 +1,121 @@
+import json
+import os
+
+import numpy as np
+
+from ai.model_traffic2.config import TRAFFIC_STATIONS
+from ai.model_traffic2.population_density import POPULATION_DENSITY
+from ai.model_traffic2.road_edges import EARTH_RADIUS_M
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ROAD_DENSITY_CACHE_FILE = os.path.join(BASE_DIR, "road_density_cache.json")
+
+# Points closer than this to a station take the station's own value
+SNAP_M = 1.0
+
+
+class StationField:
+    """
+    Interpolates one per-station quantity to arbitrary coordinates.
+
+    Stations are projected to local metres once and put in a KD-tree; each
+    query takes the k nearest stations and blends them with inverse-distance
+    ("idw", weight d^-power) or Gaussian ("gaussian", bandwidth_km) weights.
+    The stations are several km apart, so the default power of 1 blends them
+    smoothly; with d^-2 the nearest one dominates the points between them.
+    Queries are vectorized over any number of points, and a point on a station
+    returns exactly that station's value, like the id-based lookup.
+    """
+
+    def __init__(self, stations, values, method="idw", power=1, bandwidth_km=3.0, k=8):
+        from scipy.spatial import cKDTree
+
+        if method not in ("idw", "gaussian"):
+            raise ValueError("method must be 'idw' or 'gaussian'")
+
+        self.ids = [s["id"] for s in stations]
+        self.values = np.array([values[i] for i in self.ids], dtype=float)
+        self.method = method
+        self.power = power
+        self.bandwidth_m = bandwidth_km * 1000.0
+        self.k = min(k, len(self.ids))
+
+        lat = np.array([s["lat"] for s in stations], dtype=float)
+        lon = np.array([s["lon"] for s in stations], dtype=float)
+        self.ref_lat = float(lat.mean())
+        self._tree = cKDTree(np.column_stack(self.project(lat, lon)))
+
+    def project(self, lat, lon):
+        lat = np.asarray(lat, dtype=float)
+        lon = np.asarray(lon, dtype=float)
+        y = np.radians(lat) * EARTH_RADIUS_M
+        x = np.radians(lon) * EARTH_RADIUS_M * np.cos(np.radians(self.ref_lat))
+        return x, y
+
+    def query(self, lats, lons):
+        lats = np.atleast_1d(np.asarray(lats, dtype=float))
+        lons = np.atleast_1d(np.asarray(lons, dtype=float))
+        x, y = self.project(lats.ravel(), lons.ravel())
+
+        d, idx = self._tree.query(np.column_stack([x, y]), k=self.k)
+        d = d.reshape(len(x), -1)
+        idx = idx.reshape(len(x), -1)
+        values = self.values[idx]
+
+        if self.method == "idw":
+            w = 1.0 / np.maximum(d, SNAP_M) ** self.power
+        else:
+            w = np.exp(-0.5 * (d / self.bandwidth_m) ** 2)
+            # Far outside every kernel: fall back to the nearest station
+            empty = w.sum(axis=1) == 0
+            w[empty, 0] = 1.0
+
+        result = (w * values).sum(axis=1) / w.sum(axis=1)
+
+        snapped = d[:, 0] < SNAP_M
+        result[snapped] = values[snapped, 0]
+        return result.reshape(lats.shape)
+
+
+_fields = {}
+
+
+def _field(name, values, **kwargs):
+    """
+    Builds a field once per (name, values object, kernel options). Registry-served values are
+    swapped on reload, so a new object rebuilds the tree.
+    """
+    key = (name, tuple(sorted(kwargs.items())))
+    cached = _fields.get(key)
+    if cached is None or cached[0] is not values:
+        stations = [s for s in TRAFFIC_STATIONS if s["id"] in values]
+        cached = (values, StationField(stations, values, **kwargs))
+        _fields[key] = cached
+    return cached[1]
+
+
+def interpolate_traffic_mean(lats, lons, **kwargs):
+    """
+    Station mean traffic_signal (the traffic_signal_norm divisor / baseline capacity) at each point.
+    """
+    from ai.model_traffic2.artifact_registry import get_station_traffic_means
+    return _field("traffic_mean", get_station_traffic_means(), **kwargs).query(lats, lons)
+
+
+def interpolate_population(lats, lons, **kwargs):
+    return _field("population", POPULATION_DENSITY, **kwargs).query(lats, lons)
+
+
+_road_density_cache = None
+
+
+def interpolate_road_density(lats, lons, **kwargs):
+    """
+    Station road densities from road_density_cache.json, interpolated. For real
+    local road density use road_raster, which measures the network at the point.
+    """
+    global _road_density_cache
+    if _road_density_cache is None:
+        with open(ROAD_DENSITY_CACHE_FILE, "r") as f:
+            _road_density_cache = json.load(f)
+    return _field("road_density", _road_density_cache, **kwargs).query(lats, lons)
@@ -1,32 +1,186 @@
-import joblib
-from datetime import datetime
-import os
+from datetime import datetime, timedelta
 
-from ai.model_traffic2.activity_density import compute_activity_density
-from ai.model_traffic2.population_density import get_population_density
+import numpy as np
+import pandas as pd
 
-BASE_DIR = os.path.dirname(__file__)
-model = joblib.load(os.path.join(BASE_DIR, "traffic_ai_model.pkl"))
+from ai.model_traffic2.activity_density import compute_activity_density_batch
+from ai.model_traffic2.population_density import get_population_density_batch
+from ai.model_traffic2.artifact_registry import get_traffic_model, get_station_traffic_means
+from ai.model_traffic2.compiled_model import CompiledLinearModel
+from ai.model_traffic2.road_edges import get_road_density_index
+from ai.model_traffic2.spatial_lookup import (
+    interpolate_population, interpolate_road_density, interpolate_traffic_mean
+)
 
-def predict_traffic_signal(road_density, station_id):
+# Feature order of models trained by train_traffic_ai before feature names were stored
+LEGACY_FEATURES = ["hour", "is_weekend", "month", "traffic_signal"]
+
+
+def week_hours(start=None):
+    """
+    The 168 hourly timestamps of the week starting Monday 00:00 (current week by default).
+    """
+    if start is None:
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        start = today - timedelta(days=today.weekday())
+    return pd.date_range(start, periods=7 * 24, freq="h")
+
+
+def station_traffic_means_batch(station_ids):
+    """
+    Mean traffic_signal per station id (the traffic_signal_norm divisor); unknown
+    stations get the average over stations.
+    """
+    means = get_station_traffic_means()
+    default = float(np.mean(list(means.values())))
+    return np.array([means.get(s, default) for s in station_ids], dtype=float)
+
+
+def get_baseline_capacity(station_id=None, lat=None, lon=None):
+    """
+    Mean traffic_signal of a station, or interpolated from the stations at (lat, lon).
+    """
+    means = get_station_traffic_means()
+    if station_id in means:
+        return means[station_id]
+    if lat is not None and lon is not None:
+        return float(interpolate_traffic_mean(lat, lon)[0])
+    return float(station_traffic_means_batch([station_id])[0])
+
+
+def road_density_at(lats, lons, radius=1000):
+    """
+    Road density at each point on the scale the model was trained on: the
+    edge index (same graph and rule as road_density_cache.json) where the
+    cached downloads cover the point, the interpolated station densities elsewhere.
+    """
+    lats = np.atleast_1d(np.asarray(lats, dtype=float))
+    lons = np.atleast_1d(np.asarray(lons, dtype=float))
+    index = get_road_density_index()
+    covered = index.covered(lats, lons)
+
+    density = np.zeros(len(lats))
+    if covered.any():
+        density[covered] = index.density_batch(lats[covered], lons[covered], radius)
+    if not covered.all():
+        density[~covered] = interpolate_road_density(lats[~covered], lons[~covered])
+    return density
+
+
+def build_feature_matrix(model, hours, is_weekend, months, traffic_signal, station_mean):
+    """
+    Model input for flat arrays of rows, in the column order the model was fitted with
+    (feature_names_in_), falling back to LEGACY_FEATURES.
     """
-    Predicts traffic proxy signal using AI-trained model
+    names = list(getattr(model, "feature_names_in_", LEGACY_FEATURES))
+
+    columns = {}
+    for name in names:
+        if name == "hour":
+            columns[name] = hours
+        elif name == "is_weekend":
+            columns[name] = is_weekend
+        elif name == "month":
+            columns[name] = months
+        elif name == "traffic_signal":
+            columns[name] = traffic_signal
+        elif name == "traffic_signal_norm":
+            columns[name] = traffic_signal / station_mean
+        else:
+            raise ValueError(f"Traffic model expects unknown feature '{name}'")
+
+    # scikit-learn estimators fitted on a DataFrame want one back; compiled models take arrays
+    if hasattr(model, "feature_names_in_") and not isinstance(model, CompiledLinearModel):
+        return pd.DataFrame(columns, columns=names)
+    return np.column_stack([columns[n] for n in names])
+
+
+def predict_traffic_profile(lats=None, lons=None, timestamps=None, station_ids=None,
+                            road_density=None, radius=1000):
+    """
+    Traffic signal for every location at every timestamp, as a dense
+    (locations x timestamps) array from a single model.predict call.
+
+    Locations are given by lat/lon (road density from road_density_at) and/or
+    road_density; station_ids select population density and per-station
+    normalisation. Locations without a station id take both from the stations
+    around them (spatial_lookup). Timestamps default to the hours of the current week.
     """
-    now = datetime.now()
+    if road_density is None:
+        if lats is None or lons is None:
+            raise ValueError("Provide road_density or lat/lon")
+        road_density = road_density_at(lats, lons, radius)
+    road_density = np.atleast_1d(np.asarray(road_density, dtype=float))
+    n_loc = len(road_density)
+
+    if station_ids is None:
+        station_ids = [None] * n_loc
+    station_ids = list(station_ids)
+
+    times = pd.DatetimeIndex(week_hours() if timestamps is None else pd.to_datetime(timestamps))
+    hours = times.hour.to_numpy()
+    is_weekend = (times.weekday >= 5).astype(int)
+    months = times.month.to_numpy()
+
+    population = get_population_density_batch(station_ids)
+    station_mean = station_traffic_means_batch(station_ids)
+
+    if lats is not None and lons is not None:
+        no_station = np.array([s is None for s in station_ids])
+        if no_station.any():
+            lats = np.atleast_1d(np.asarray(lats, dtype=float))
+            lons = np.atleast_1d(np.asarray(lons, dtype=float))
+            population[no_station] = interpolate_population(lats[no_station], lons[no_station])
+            station_mean[no_station] = interpolate_traffic_mean(lats[no_station], lons[no_station])
 
-    population_density = get_population_density(station_id)
-    activity_density = compute_activity_density(
-        population_density,
-        now.hour
+    activity = compute_activity_density_batch(population[:, None], hours[None, :])
+    traffic_signal = activity * road_density[:, None]                      # (locations, times)
+
+    model = get_traffic_model()
+    X = build_feature_matrix(
+        model,
+        hours=np.broadcast_to(hours, traffic_signal.shape).ravel(),
+        is_weekend=np.broadcast_to(is_weekend, traffic_signal.shape).ravel(),
+        months=np.broadcast_to(months, traffic_signal.shape).ravel(),
+        traffic_signal=traffic_signal.ravel(),
+        station_mean=np.broadcast_to(station_mean[:, None], traffic_signal.shape).ravel()
     )
+    return np.asarray(model.predict(X), dtype=float).reshape(traffic_signal.shape)
+
+
+def predict_weekly_profile(lats=None, lons=None, station_ids=None, road_density=None,
+                           radius=1000, week_start=None):
+    """
+    predict_traffic_profile over one week, shaped (locations, 7 days, 24 hours) for heatmaps.
+    """
+    profile = predict_traffic_profile(lats, lons, week_hours(week_start), station_ids,
+                                      road_density, radius)
+    return profile.reshape(len(profile), 7, 24)
 
-    traffic_signal = activity_density * road_density
 
-    X = [[
-        now.hour,
-        1 if now.weekday() >= 5 else 0,
-        now.month,
-        traffic_signal
-    ]]
+def predict_traffic_signal(road_density=None, station_id=None, lat=None, lon=None, radius=1000):
+    """
+    Predicts traffic proxy signal using AI-trained model.
+    When road_density is not given it is measured at (lat, lon) by road_density_at;
+    without a station_id, population and station mean are interpolated there.
+    """
+    return float(predict_traffic_profile(
+        lats=None if lat is None else [lat],
+        lons=None if lon is None else [lon],
+        timestamps=[datetime.now()],
+        station_ids=[station_id],
+        road_density=None if road_density is None else [road_density],
+        radius=radius
+    )[0, 0])
+
 
-    return model.predict(X)[0]
+def predict_traffic_signal_batch(lats, lons, station_ids=None, radius=1000, road_density=None):
+    """
+    predict_traffic_signal for many points in one model call. Road densities come
+    from road_density_at unless given.
+    """
+    n = len(np.atleast_1d(road_density if lats is None else lats))
+    if road_density is not None:
+        road_density = np.broadcast_to(np.asarray(road_density, dtype=float), (n,))
+    return predict_traffic_profile(lats, lons, [datetime.now()], station_ids,
+                                   road_density, radius)[:, 0]
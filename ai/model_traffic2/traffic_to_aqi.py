@@ -1,9 +1,15 @@
-import joblib
-
-beta = joblib.load("traffic_to_aqi_beta.pkl")
+try:
+    from ai.model_traffic2.artifact_registry import get_traffic_aqi_beta
+except ImportError:
+    # Run as a script from model_traffic2/ (test_aqi_link.py, test_what_if.py)
+    import os
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+    from ai.model_traffic2.artifact_registry import get_traffic_aqi_beta
 
 def apply_traffic_to_aqi(base_aqi, traffic_signal):
     """
     Applies AI-learned traffic → AQI coefficient
     """
+    beta = get_traffic_aqi_beta()
     return round(base_aqi * (1 + beta * traffic_signal), 2)
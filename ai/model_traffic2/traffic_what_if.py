@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def apply_traffic_what_if(base_impact, parsed_scenario_data):
     """
     Applies the traffic impact from the parsed scenario.
@@ -9,3 +12,11 @@ def apply_traffic_what_if(base_impact, parsed_scenario_data):
         change_percent = parsed_scenario_data
         
     return base_impact * (1 + change_percent)
+
+
+def apply_traffic_what_if_batch(base_impact, change_percent):
+    """
+    Vectorized version of apply_traffic_what_if.
+    change_percent is a signed percentage (or array of them), e.g. -15 for 15% reduction.
+    """
+    return np.asarray(base_impact, dtype=float) * (1 + np.asarray(change_percent, dtype=float) / 100.0)
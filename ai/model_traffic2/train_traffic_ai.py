@@ -1,6 +1,8 @@
 from sklearn.linear_model import LinearRegression
 import joblib
 
+from ai.model_traffic2.compiled_model import export_compiled_model
+
 def train_traffic_model(df):
     X = df[[
         "hour",
@@ -19,4 +21,7 @@ def train_traffic_model(df):
     joblib.dump(model, "traffic_ai_model.pkl")
     joblib.dump(beta, "traffic_to_aqi_beta.pkl")
 
+    # Dependency-free artifact served by the AI server
+    export_compiled_model(model, beta)
+
     return model, beta
\ No newline at end of file
@@ -0,0 +1,50 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from ai.model_traffic2.road_edges import EDGE_TABLE_FILE
+from ai.model_traffic2.road_raster import RASTER_DENSITY_TOLERANCE, get_road_raster
+from ai.model_traffic2.road_density_cache import load_road_density_cache
+from ai.model_traffic2.config import TRAFFIC_STATIONS
+
+class TestRoadRaster(unittest.TestCase):
+    
+    def test_station_windows_within_tolerance(self):
+        print("\n--- Testing Raster Density vs Road Density Cache ---")
+        
+        cache = load_road_density_cache()
+        raster = get_road_raster()
+        for s in TRAFFIC_STATIONS:
+            density = float(raster.density([s["lat"]], [s["lon"]])[0])
+            error = density / cache[s["id"]] - 1
+            print(f"{s['id']}: raster {density:.0f}, cache {cache[s['id']]}, {error:+.1%}")
+            
+            # Midpoint counting without component trimming only ever over-counts
+            self.assertGreaterEqual(error, 0)
+            self.assertLessEqual(error, RASTER_DENSITY_TOLERANCE)
+        print(f"Within {RASTER_DENSITY_TOLERANCE:.0%} at every station!")
+
+    def test_full_window_matches_edge_table(self):
+        print("\n--- Testing Raster Window Over the Whole Extent ---")
+        
+        raster = get_road_raster()
+        b = raster.bounds
+        lat = (b["lat_min"] + b["lat_max"]) / 2
+        lon = (b["lon_min"] + b["lon_max"]) / 2
+        
+        # A window covering the raster holds every directed edge of the table
+        table = np.load(EDGE_TABLE_FILE)
+        expected = np.bincount(table["highway_class"], weights=table["directions"],
+                               minlength=len(raster.classes))
+        sums = raster.window_sums([lat], [lon], 100_000)[0]
+        self.assertEqual([str(c) for c in table["classes"]], raster.classes)
+        np.testing.assert_allclose(sums, expected)
+        print("Full window equals the table totals!")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import sys
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+
+from ai.model_traffic2.snapshot_store import SnapshotStore
+
+# 2026-01-10 00:00 UTC, one reading per hour for a day
+T0 = 1768003200
+ROWS = [
+    {"station": "bopal", "timestamp": T0 + 3600 * h, "observed_aqi": 100 + h, "lat": 23.03, "lon": 72.46}
+    for h in range(24)
+]
+
+class TestSnapshotStore(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SnapshotStore(self.tmp.name)
+        self.store.append(ROWS)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_read_bounds_any_timezone(self):
+        print("\n--- Testing Snapshot Read Bounds Across Timezones ---")
+        
+        # The same 06:00-12:00 UTC window, naive, UTC-aware and IST-aware
+        windows = [
+            ("2026-01-10 06:00", "2026-01-10 12:00"),
+            (pd.Timestamp("2026-01-10 06:00", tz="UTC"), pd.Timestamp("2026-01-10 12:00", tz="UTC")),
+            ("2026-01-10 11:30+05:30", pd.Timestamp("2026-01-10 17:30", tz="Asia/Kolkata")),
+        ]
+        for start, end in windows:
+            df = self.store.read(start, end)
+            print(f"{start!s} -> {end!s}: {len(df)} readings")
+            self.assertEqual(len(df), 7)
+            self.assertEqual(df["observed_aqi"].min(), 106)
+            self.assertEqual(df["observed_aqi"].max(), 112)
+        print("Naive and aware bounds select the same readings!")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"
 
 from ai.model_traffic2.traffic_model import predict_traffic_signal
 from ai.model_traffic2.config import TRAFFIC_STATIONS
+from ai.model_traffic2.road_density_cache import load_road_density_cache
 
 class TestSpatialPrediction(unittest.TestCase):
     
@@ -30,6 +31,18 @@ class TestSpatialPrediction(unittest.TestCase):
         self.assertAlmostEqual(impact_id, impact_loc, places=4)
         print("Matched!")
 
+    def test_measured_density_matches_ids(self):
+        print("\n--- Testing Measured Road Density vs Station ID ---")
+        
+        # Without road_density, coordinates measure it on the same scale as the training cache
+        cache = load_road_density_cache()
+        for s in TRAFFIC_STATIONS:
+            impact_id = predict_traffic_signal(road_density=cache[s["id"]], station_id=s["id"])
+            impact_loc = predict_traffic_signal(lat=s["lat"], lon=s["lon"])
+            print(f"{s['id']}: ID-based {impact_id:.4f}, Loc-based {impact_loc:.4f}")
+            self.assertEqual(impact_id, impact_loc)
+        print("Matched at every station!")
+
     def test_interpolation(self):
         print("\n--- Testing Spatial Interpolation (Midpoint) ---")
         
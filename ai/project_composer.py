@@ -0,0 +1,285 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'model_ai1')))
+
+from model_ai1.config import AQI_STATIONS
+from model_ai1.spatial_interpolation import idw_interpolation_batch
+from city_grid import CityGrid
+from integrated_batch import evaluate_integrated_batch, BASE_TRAFFIC_SIGNAL, DEFAULT_BETA
+
+# Default scores per project type.
+# AQI scores follow the verify_what_if mock scenarios, traffic impact follows the
+# model_traffic2 heuristic parser (bridge -15%, metro -25%).
+PROJECT_PRESETS = {
+    "metro": {
+        "construction_impact_score": 0.05,
+        "operational_impact_score": -0.05,
+        "traffic_impact": -25.0,
+        "duration_months": 36,
+        "radius_km": 3.0
+    },
+    "bridge": {
+        "construction_impact_score": 0.15,
+        "operational_impact_score": 0.02,
+        "traffic_impact": -15.0,
+        "duration_months": 24,
+        "radius_km": 2.0
+    },
+    "flyover": {
+        "construction_impact_score": 0.12,
+        "operational_impact_score": 0.01,
+        "traffic_impact": -15.0,
+        "duration_months": 18,
+        "radius_km": 1.5
+    },
+    "road": {
+        "construction_impact_score": 0.08,
+        "operational_impact_score": 0.0,
+        "traffic_impact": -20.0,
+        "duration_months": 12,
+        "radius_km": 2.0
+    },
+    "park": {
+        "construction_impact_score": 0.01,
+        "operational_impact_score": -0.04,
+        "traffic_impact": 0.0,
+        "duration_months": 6,
+        "radius_km": 1.0
+    },
+    "hospital": {
+        "construction_impact_score": 0.05,
+        "operational_impact_score": 0.01,
+        "traffic_impact": 5.0,
+        "duration_months": 18,
+        "radius_km": 1.0
+    },
+    "school": {
+        "construction_impact_score": 0.03,
+        "operational_impact_score": 0.01,
+        "traffic_impact": 8.0,
+        "duration_months": 12,
+        "radius_km": 0.8
+    },
+    "factory": {
+        "construction_impact_score": 0.10,
+        "operational_impact_score": 0.15,
+        "traffic_impact": 10.0,
+        "duration_months": 12,
+        "radius_km": 3.0
+    }
+}
+
+DEFAULT_PROJECT_TYPE = "road"
+
+
+def resolve_project(project):
+    """
+    Fills a project dict ({"lat", "lon", "type", ...}) with preset values for its type.
+    Explicit fields on the project always win over the preset.
+    """
+    project_type = str(project.get("type", DEFAULT_PROJECT_TYPE)).lower()
+    resolved = dict(PROJECT_PRESETS.get(project_type, PROJECT_PRESETS[DEFAULT_PROJECT_TYPE]))
+    resolved.update({k: v for k, v in project.items() if v is not None})
+    resolved["type"] = project_type
+    resolved.setdefault("start_month", 0)
+
+    if "lat" not in resolved or "lon" not in resolved:
+        raise ValueError("Each project needs 'lat' and 'lon'")
+
+    return resolved
+
+
+def time_profiles(projects, months):
+    """
+    Per-project activity over months 1..months.
+    Returns (construction_mask, operational_mask, active_mask), each months x projects.
+    Month numbering follows simulate_what_if: construction while
+    0 < month - start <= duration, operational afterwards.
+    """
+    month = np.arange(1, months + 1, dtype=float)[:, None]
+    start = np.array([p["start_month"] for p in projects], dtype=float)[None, :]
+    duration = np.array([p["duration_months"] or 0 for p in projects], dtype=float)[None, :]
+
+    rel = month - start
+    active = rel > 0
+    construction = active & (rel <= duration)
+    operational = active & (rel > duration)
+    return construction, operational, active
+
+
+def decay_kernel(distances_km, radius_km, kernel="exponential"):
+    """
+    Spatial decay weights (1.0 at the project, falling with distance).
+    """
+    radius_km = np.maximum(np.asarray(radius_km, dtype=float), 1e-6)
+    if kernel == "gaussian":
+        return np.exp(-0.5 * (distances_km / radius_km) ** 2)
+    return np.exp(-distances_km / radius_km)
+
+
+class ImpactField:
+    """
+    Result of compose_city_impact: months x cells tensors over a CityGrid.
+    """
+
+    def __init__(self, grid, baseline_aqi, score_field, traffic_field, final_aqi):
+        self.grid = grid
+        self.baseline_aqi = baseline_aqi    # (cells,)
+        self.score_field = score_field      # (months, cells) combined AQI score
+        self.traffic_field = traffic_field  # (months, cells) traffic change in percent
+        self.final_aqi = final_aqi          # (months, cells)
+
+    @property
+    def months(self):
+        return self.final_aqi.shape[0]
+
+    def query(self, lat, lon, month):
+        """
+        Vectorized lookup of the composed impact at points and months (1-based).
+        """
+        cells = self.grid.locate(lat, lon)
+        month_idx = np.clip(np.asarray(month, dtype=int) - 1, 0, self.months - 1)
+        return {
+            "baseline_aqi": self.baseline_aqi[cells],
+            "final_aqi": self.final_aqi[month_idx, cells],
+            "aqi_change_percent": (self.final_aqi[month_idx, cells] / self.baseline_aqi[cells] - 1) * 100,
+            "traffic_change_percent": self.traffic_field[month_idx, cells]
+        }
+
+    def summary(self):
+        change = (self.final_aqi / self.baseline_aqi[None, :] - 1) * 100
+        return [
+            {
+                "month": m + 1,
+                "mean_aqi": round(float(self.final_aqi[m].mean()), 2),
+                "mean_change_percent": round(float(change[m].mean()), 3),
+                "max_reduction_percent": round(float(-change[m].min()), 3),
+                "max_increase_percent": round(float(change[m].max()), 3)
+            }
+            for m in range(self.months)
+        ]
+
+    def to_dict(self, include_tensor=False):
+        data = {
+            "grid": self.grid.describe(),
+            "months": self.months,
+            "summary": self.summary()
+        }
+        if include_tensor:
+            data["final_aqi"] = np.round(self.final_aqi, 2).reshape(self.months, *self.grid.shape).tolist()
+            data["traffic_change_percent"] = np.round(self.traffic_field, 3).reshape(self.months, *self.grid.shape).tolist()
+        return data
+
+
+def baseline_field(grid, baseline_aqi=None, station_aqi=None):
+    """
+    Baseline AQI per cell: a scalar, or IDW of {station_id: aqi} over AQI_STATIONS.
+    """
+    if station_aqi:
+        stations = [
+            {"lat": s["lat"], "lon": s["lon"], "aqi": station_aqi[s["id"]]}
+            for s in AQI_STATIONS if s["id"] in station_aqi
+        ]
+        if stations:
+            return idw_interpolation_batch(grid.cell_lat, grid.cell_lon, stations)
+
+    value = 150.0 if baseline_aqi is None else float(baseline_aqi)
+    return np.full(grid.size, value)
+
+
+def compose_city_impact(projects, months=24, grid=None, baseline_aqi=None, station_aqi=None,
+                        beta=DEFAULT_BETA, kernel="exponential",
+                        base_traffic_signal=BASE_TRAFFIC_SIGNAL):
+    """
+    City-wide composition of many projects.
+
+    Each project's AQI score (construction or operational, by month) and traffic
+    impact are spread over the grid with a distance-decay kernel and summed:
+        score_field   = construction_scores @ K + operational_scores @ K
+        traffic_field = traffic_impacts @ K
+    where K is the projects x cells kernel. Sums are clipped to a score in [-1, 1]
+    and a traffic change of at least -100%. The summed fields then go through the
+    same traffic->AQI and what-if math as calculate_integrated_scenario, so a
+    single project evaluated at its own location matches the single-point result.
+    """
+    grid = grid or CityGrid()
+    projects = [resolve_project(p) for p in projects]
+
+    baseline = baseline_field(grid, baseline_aqi, station_aqi)
+
+    if not projects:
+        zeros = np.zeros((months, grid.size))
+        return ImpactField(grid, baseline, zeros, zeros, np.tile(baseline, (months, 1)))
+
+    lat = np.array([p["lat"] for p in projects], dtype=float)
+    lon = np.array([p["lon"] for p in projects], dtype=float)
+    radius = np.array([p["radius_km"] for p in projects], dtype=float)
+
+    K = decay_kernel(grid.distances_km(lat, lon), radius[:, None], kernel)  # (projects, cells)
+
+    construction, operational, active = time_profiles(projects, months)
+    construction_score = np.array([p["construction_impact_score"] for p in projects], dtype=float)
+    operational_score = np.array([p["operational_impact_score"] for p in projects], dtype=float)
+    traffic_impact = np.array([p["traffic_impact"] for p in projects], dtype=float)
+
+    # (months, projects) @ (projects, cells) -> (months, cells)
+    score_weights = construction * construction_score + operational * operational_score
+    score_field = score_weights @ K
+    traffic_field = (active * traffic_impact) @ K
+
+    # Summed effects stay inside the ranges the single-project models accept
+    np.clip(score_field, -1.0, 1.0, out=score_field)
+    np.clip(traffic_field, -100.0, None, out=traffic_field)
+
+    # Phase is already resolved per project, so both scores are the summed field
+    final_aqi = evaluate_integrated_batch(
+        baseline_aqi=baseline[None, :],
+        traffic_impact=traffic_field,
+        beta=beta,
+        months_ahead=1,
+        duration_months=0,
+        construction_score=score_field,
+        operational_score=score_field,
+        base_traffic_signal=base_traffic_signal
+    )["final_aqi"]
+
+    return ImpactField(grid, baseline, score_field, traffic_field, final_aqi)
+
+
+def run_composition(projects, months=24, cell_km=0.5, baseline_aqi=None, station_aqi=None,
+                    beta=DEFAULT_BETA, kernel="exponential", query_points=None, include_tensor=False):
+    """
+    Builds an ImpactField and formats it (plus optional point/month queries) for the API.
+    """
+    start = time.perf_counter()
+    field = compose_city_impact(
+        projects, months=months, grid=CityGrid(cell_km=cell_km),
+        baseline_aqi=baseline_aqi, station_aqi=station_aqi, beta=beta, kernel=kernel
+    )
+    data = field.to_dict(include_tensor=include_tensor)
+
+    if query_points:
+        q = field.query(
+            [p["lat"] for p in query_points],
+            [p["lon"] for p in query_points],
+            [p.get("month", months) for p in query_points]
+        )
+        data["queries"] = [
+            {
+                "lat": p["lat"],
+                "lon": p["lon"],
+                "month": p.get("month", months),
+                "baseline_aqi": round(float(q["baseline_aqi"][i]), 2),
+                "final_aqi": round(float(q["final_aqi"][i]), 2),
+                "aqi_change_percent": round(float(q["aqi_change_percent"][i]), 3),
+                "traffic_change_percent": round(float(q["traffic_change_percent"][i]), 3)
+            }
+            for i, p in enumerate(query_points)
+        ]
+
+    data["projects"] = len(projects)
+    data["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return data
@@ -0,0 +1,153 @@
+import time
+import numpy as np
+
+from integrated_batch import evaluate_integrated_batch, DEFAULT_BETA
+
+# Inputs of the pure-math part of calculate_integrated_scenario
+SENSITIVITY_INPUTS = (
+    "beta",
+    "traffic_impact",
+    "construction_score",
+    "operational_score",
+    "season_factor",
+    "baseline_aqi"
+)
+
+
+def default_ranges(beta=DEFAULT_BETA, traffic_impact=-15.0, construction_score=0.05,
+                   operational_score=-0.05, baseline_aqi=150.0):
+    """
+    Uniform ranges around the nominal values. Season spans the seasonal_multiplier range.
+    """
+    return {
+        "beta": (0.5 * beta, 1.5 * beta),
+        "traffic_impact": (traffic_impact - 20.0, traffic_impact + 20.0),
+        "construction_score": (max(construction_score - 0.1, -1.0), min(construction_score + 0.1, 1.0)),
+        "operational_score": (max(operational_score - 0.1, -1.0), min(operational_score + 0.1, 1.0)),
+        "season_factor": (0.90, 1.10),
+        "baseline_aqi": (0.7 * baseline_aqi, 1.3 * baseline_aqi)
+    }
+
+
+def _model(X, months_ahead, duration_months):
+    """
+    Evaluates the integrated chain for every row of X (columns in SENSITIVITY_INPUTS order).
+    """
+    return evaluate_integrated_batch(
+        baseline_aqi=X[:, 5],
+        traffic_impact=X[:, 1],
+        beta=X[:, 0],
+        months_ahead=months_ahead,
+        duration_months=duration_months,
+        construction_score=X[:, 2],
+        operational_score=X[:, 3],
+        season_factor=X[:, 4]
+    )["final_aqi"]
+
+
+def _scale(U, ranges):
+    low = np.array([ranges[name][0] for name in SENSITIVITY_INPUTS], dtype=float)
+    high = np.array([ranges[name][1] for name in SENSITIVITY_INPUTS], dtype=float)
+    return low + U * (high - low)
+
+
+def sobol_indices(ranges, months_ahead, duration_months, n_evaluations=65536, seed=None):
+    """
+    First-order (Saltelli 2010) and total-order (Jansen) Sobol indices.
+    Builds the A, B and AB_i sample matrices and evaluates all (d + 2) * N rows in one batch.
+    """
+    rng = np.random.default_rng(seed)
+    d = len(SENSITIVITY_INPUTS)
+    n = max(n_evaluations // (d + 2), 16)
+
+    A = rng.random((n, d))
+    B = rng.random((n, d))
+    AB = np.repeat(A[None, :, :], d, axis=0)          # (d, n, d)
+    AB[np.arange(d), :, np.arange(d)] = B.T           # column i of AB_i comes from B
+
+    X = np.concatenate([A, B, AB.reshape(d * n, d)])
+    Y = _model(_scale(X, ranges), months_ahead, duration_months)
+
+    Y_A, Y_B = Y[:n], Y[n:2 * n]
+    Y_AB = Y[2 * n:].reshape(d, n)
+
+    variance = np.var(np.concatenate([Y_A, Y_B]))
+    if variance == 0:
+        zeros = np.zeros(d)
+        return zeros, zeros, len(Y)
+
+    first_order = np.mean(Y_B * (Y_AB - Y_A), axis=1) / variance
+    total_order = 0.5 * np.mean((Y_A - Y_AB) ** 2, axis=1) / variance
+    return first_order, total_order, len(Y)
+
+
+def morris_effects(ranges, months_ahead, duration_months, n_evaluations=65536, levels=4, seed=None):
+    """
+    Morris elementary effects (mu*, sigma) from one-at-a-time trajectories in the unit cube,
+    expressed in AQI per full input range. All trajectories are evaluated in one batch.
+    """
+    rng = np.random.default_rng(seed)
+    d = len(SENSITIVITY_INPUTS)
+    r = max(n_evaluations // (d + 1), 2)
+    delta = levels / (2 * (levels - 1))
+
+    # Random base points on the grid that leave room for a +delta step
+    base = rng.integers(0, levels // 2, size=(r, d)) / (levels - 1)
+    order = np.argsort(rng.random((r, d)), axis=1)    # factor moved at each step
+
+    steps = np.zeros((r, d + 1, d))
+    steps[np.arange(r)[:, None], np.arange(1, d + 1)[None, :], order] = delta
+    trajectories = base[:, None, :] + np.cumsum(steps, axis=1)
+
+    Y = _model(_scale(trajectories.reshape(-1, d), ranges), months_ahead, duration_months).reshape(r, d + 1)
+
+    effects = np.empty((r, d))
+    effects[np.arange(r)[:, None], order] = np.diff(Y, axis=1) / delta
+
+    return np.abs(effects).mean(axis=0), effects.std(axis=0), Y.size
+
+
+def run_sensitivity(method="sobol", months_ahead=6, duration_months=6, n_evaluations=65536,
+                    seed=None, ranges=None, **nominal):
+    """
+    Global sensitivity of final_aqi to the inputs of the integrated model (no LLM calls).
+    `nominal` accepts beta, traffic_impact, construction_score, operational_score and
+    baseline_aqi and centres the default ranges on them; `ranges` overrides any input.
+    """
+    start = time.perf_counter()
+    input_ranges = default_ranges(**{k: v for k, v in nominal.items() if v is not None})
+    for name, bounds in (ranges or {}).items():
+        if name not in input_ranges:
+            raise ValueError(f"Unknown sensitivity input: {name}")
+        if len(bounds) != 2 or not float(bounds[0]) < float(bounds[1]):
+            raise ValueError(f"Range for {name} must be [low, high] with low < high")
+        input_ranges[name] = (float(bounds[0]), float(bounds[1]))
+
+    result = {
+        "method": method,
+        "months_ahead": months_ahead,
+        "duration_months": duration_months,
+        "ranges": {name: list(input_ranges[name]) for name in SENSITIVITY_INPUTS}
+    }
+
+    if method == "sobol":
+        first_order, total_order, evaluations = sobol_indices(
+            input_ranges, months_ahead, duration_months, n_evaluations, seed
+        )
+        result["first_order"] = {n: round(float(v), 4) for n, v in zip(SENSITIVITY_INPUTS, first_order)}
+        result["total_order"] = {n: round(float(v), 4) for n, v in zip(SENSITIVITY_INPUTS, total_order)}
+        ranking = total_order
+    elif method == "morris":
+        mu_star, sigma, evaluations = morris_effects(
+            input_ranges, months_ahead, duration_months, n_evaluations, seed=seed
+        )
+        result["mu_star"] = {n: round(float(v), 4) for n, v in zip(SENSITIVITY_INPUTS, mu_star)}
+        result["sigma"] = {n: round(float(v), 4) for n, v in zip(SENSITIVITY_INPUTS, sigma)}
+        ranking = mu_star
+    else:
+        raise ValueError("method must be 'sobol' or 'morris'")
+
+    result["ranking"] = [SENSITIVITY_INPUTS[i] for i in np.argsort(-ranking)]
+    result["evaluations"] = int(evaluations)
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
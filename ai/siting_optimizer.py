@@ -0,0 +1,172 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'model_traffic2')))
+
+from model_traffic2 import config as traffic_config
+from model_traffic2.population_density import get_population_density
+from model_ai1.spatial_interpolation import idw_interpolation_batch
+from city_grid import CityGrid
+from integrated_batch import evaluate_integrated_batch, BASE_TRAFFIC_SIGNAL, DEFAULT_BETA
+from project_composer import resolve_project, decay_kernel, baseline_field, compose_city_impact
+
+
+def population_field(grid):
+    """
+    Population density per cell, IDW-interpolated from the traffic station densities.
+    """
+    stations = [
+        {"lat": s["lat"], "lon": s["lon"], "population": get_population_density(s["id"])}
+        for s in traffic_config.AQI_STATIONS
+    ]
+    return idw_interpolation_batch(grid.cell_lat, grid.cell_lon, stations, key="population")
+
+
+def project_phase_scores(project, months_ahead):
+    """
+    AQI score and traffic impact of a project at the given horizon, following simulate_what_if.
+    """
+    rel = months_ahead - project["start_month"]
+    if rel <= 0:
+        return 0.0, 0.0
+    duration = project["duration_months"] or 0
+    score = project["construction_impact_score"] if rel <= duration else project["operational_impact_score"]
+    return float(score), float(project["traffic_impact"])
+
+
+def evaluate_sites(grid, project, months_ahead, baseline, weights, beta=DEFAULT_BETA,
+                   kernel="exponential", candidates=None, chunk_size=512,
+                   base_traffic_signal=BASE_TRAFFIC_SIGNAL):
+    """
+    Objective for placing `project` at every candidate cell: the population-weighted
+    mean AQI change over the city (negative is better).
+
+    Candidates are processed in chunks; each chunk builds its candidates x cells
+    kernel K once. With traffic factor a = base_signal * traffic% * beta and AQI
+    score s, a cell's AQI is  b * (1 + a*k) * (1 + s*d*k),  where d is the 0.7
+    saturation damping of simulate_what_if. Kernel weights lie in [0, 1], so
+    unless some cell's adjusted AQI b*(1 + a*k) can cross 200 inside that range,
+    d is fixed per cell and the objective reduces to two mat-vecs:
+        K @ (w*b*(a + s*d)) + (K*K) @ (w*b*a*s*d)
+    Otherwise the whole block goes through evaluate_integrated_batch.
+    """
+    if candidates is None:
+        candidates = np.arange(grid.size)
+
+    score, traffic = project_phase_scores(project, months_ahead)
+    weights = weights / weights.sum()
+    baseline_weighted = (weights * baseline).sum()
+    objective = np.empty(len(candidates))
+
+    traffic_factor = base_traffic_signal * traffic / 100.0 * beta
+    crosses_saturation = (baseline > 200) != (baseline * (1 + traffic_factor) > 200)
+    closed_form = score <= 0 or not crosses_saturation.any()
+    if closed_form:
+        damping = np.where((baseline > 200) & (score > 0), 0.7, 1.0)
+        linear = weights * baseline * (traffic_factor + score * damping)
+        quadratic = weights * baseline * traffic_factor * score * damping
+
+    for start in range(0, len(candidates), chunk_size):
+        block = candidates[start:start + chunk_size]
+        K = decay_kernel(
+            grid.planar_distances_km(grid.cell_lat[block], grid.cell_lon[block]),
+            project["radius_km"], kernel
+        )  # (block, cells)
+
+        if closed_form:
+            change = K @ linear
+            if quadratic.any():
+                change += (K * K) @ quadratic
+        else:
+            final_aqi = evaluate_integrated_batch(
+                baseline_aqi=baseline[None, :],
+                traffic_impact=traffic * K,
+                beta=beta,
+                months_ahead=1,
+                duration_months=0,
+                construction_score=score * K,
+                operational_score=score * K,
+                base_traffic_signal=base_traffic_signal
+            )["final_aqi"]
+            change = final_aqi @ weights - baseline_weighted
+
+        objective[start:start + len(block)] = change
+
+    return objective
+
+
+def optimize_siting(project_type="park", project=None, months_ahead=12, top_k=5, cell_km=0.5,
+                    baseline_aqi=None, station_aqi=None, existing_projects=None,
+                    beta=DEFAULT_BETA, kernel="exponential", bounds=None):
+    """
+    Ranks every grid cell (optionally limited to `bounds`) as a site for one project
+    and returns the top_k cells with the largest population-weighted AQI reduction.
+
+    `existing_projects` are composed first (see project_composer) so new sites are
+    judged against the city as it will be at `months_ahead`.
+    """
+    if months_ahead < 1:
+        raise ValueError("months_ahead must be at least 1")
+    if cell_km <= 0:
+        raise ValueError("cell_km must be positive")
+    if bounds is not None:
+        missing = {"lat_min", "lat_max", "lon_min", "lon_max"} - set(bounds)
+        if missing:
+            raise ValueError(f"bounds missing: {', '.join(sorted(missing))}")
+
+    start = time.perf_counter()
+    grid = CityGrid(cell_km=cell_km)
+
+    project = resolve_project(dict(project or {}, type=project_type, lat=0.0, lon=0.0))
+
+    if existing_projects:
+        field = compose_city_impact(
+            existing_projects, months=months_ahead, grid=grid,
+            baseline_aqi=baseline_aqi, station_aqi=station_aqi, beta=beta, kernel=kernel
+        )
+        baseline = field.final_aqi[months_ahead - 1]
+    else:
+        baseline = baseline_field(grid, baseline_aqi, station_aqi)
+
+    weights = population_field(grid)
+
+    candidates = np.arange(grid.size)
+    if bounds:
+        inside = (
+            (grid.cell_lat >= bounds["lat_min"]) & (grid.cell_lat <= bounds["lat_max"]) &
+            (grid.cell_lon >= bounds["lon_min"]) & (grid.cell_lon <= bounds["lon_max"])
+        )
+        candidates = candidates[inside]
+        if not len(candidates):
+            raise ValueError("No grid cells inside the requested bounds")
+
+    objective = evaluate_sites(grid, project, months_ahead, baseline, weights, beta=beta,
+                               kernel=kernel, candidates=candidates)
+
+    k = min(top_k, len(candidates))
+    best = np.argpartition(objective, k - 1)[:k]
+    best = best[np.argsort(objective[best])]
+
+    sites = [
+        {
+            "rank": rank + 1,
+            "lat": round(float(grid.cell_lat[candidates[i]]), 5),
+            "lon": round(float(grid.cell_lon[candidates[i]]), 5),
+            "weighted_aqi_change": round(float(objective[i]), 4),
+            "population_density": round(float(weights[candidates[i]]), 1),
+            "local_baseline_aqi": round(float(baseline[candidates[i]]), 2)
+        }
+        for rank, i in enumerate(best)
+    ]
+
+    return {
+        "project_type": project["type"],
+        "months_ahead": months_ahead,
+        "objective": "population_weighted_aqi_change",
+        "candidates_evaluated": int(len(candidates)),
+        "grid": grid.describe(),
+        "sites": sites,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
@@ -0,0 +1,120 @@
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+STARTUP_LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_metrics.jsonl")
+
+
+class StartupTracker:
+    """
+    Imports subsystems on first use and records what each one cost.
+
+    load() times an import and counts the modules it dragged in; lazy() wraps a
+    function so its module is only imported when the function is first called.
+    warm_up() does the same imports on a background thread once the server is
+    up, so the first real request usually finds them loaded. The time from
+    process start to the first completed response is kept, printed and
+    appended to startup_metrics.jsonl for tracking across restarts.
+    """
+
+    def __init__(self, log_file=STARTUP_LOG_FILE):
+        self.started = time.perf_counter()
+        self.started_at = datetime.now().isoformat()
+        self.log_file = log_file
+        self.imports = {}
+        self.ready_ms = None
+        self.first_response = None
+        self.warmup = {"state": "not_started", "modules": [], "elapsed_ms": None}
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self):
+        return round((time.perf_counter() - self.started) * 1000, 2)
+
+    def load(self, name):
+        if name in self.imports and name in sys.modules:
+            return sys.modules[name]
+
+        before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            module = importlib.import_module(name)
+        except Exception as e:
+            self.imports[name] = {"ms": None, "new_modules": 0, "error": str(e),
+                                  "thread": threading.current_thread().name}
+            raise
+
+        with self._lock:
+            # Another thread may have finished the same import while we waited on the import lock
+            if name not in self.imports or self.imports[name].get("error"):
+                self.imports[name] = {
+                    "ms": round((time.perf_counter() - start) * 1000, 2),
+                    "new_modules": len(sys.modules) - before,
+                    "at_ms": self.elapsed_ms(),
+                    "thread": threading.current_thread().name
+                }
+        return module
+
+    def lazy(self, module_name, attr):
+        def call(*args, **kwargs):
+            return getattr(self.load(module_name), attr)(*args, **kwargs)
+        call.__name__ = attr
+        call.__doc__ = f"Lazily imported {module_name}.{attr}"
+        return call
+
+    def mark_ready(self):
+        self.ready_ms = self.elapsed_ms()
+
+    def warm_up(self, modules):
+        def run():
+            self.warmup["state"] = "running"
+            start = time.perf_counter()
+            for name in modules:
+                try:
+                    self.load(name)
+                    self.warmup["modules"].append(name)
+                except Exception as e:
+                    print(f"Warning: warmup import of {name} failed: {e}")
+            self.warmup["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            self.warmup["state"] = "done"
+
+        thread = threading.Thread(target=run, name="ai-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def record_response(self, path, status_code):
+        if self.first_response is not None:
+            return
+        with self._lock:
+            if self.first_response is not None:
+                return
+            self.first_response = {
+                "path": path,
+                "status_code": status_code,
+                "time_to_first_response_ms": self.elapsed_ms()
+            }
+
+        print(f"Time to first response: {self.first_response['time_to_first_response_ms']} ms ({path})")
+        try:
+            with open(self.log_file, "a") as f:
+                f.write(json.dumps(dict(self.report(), pid=os.getpid())) + "\n")
+        except OSError as e:
+            print(f"Warning: could not write startup metrics: {e}")
+
+    def report(self):
+        imports = sorted(self.imports.items(), key=lambda kv: -(kv[1]["ms"] or 0))
+        return {
+            "started_at": self.started_at,
+            "uptime_ms": self.elapsed_ms(),
+            "ready_ms": self.ready_ms,
+            "first_response": self.first_response,
+            "imports": [dict(module=name, **info) for name, info in imports],
+            "import_ms_total": round(sum(info["ms"] or 0 for info in self.imports.values()), 2),
+            "warmup": self.warmup
+        }
+
+
+tracker = StartupTracker()
@@ -0,0 +1,86 @@
+import time
+import numpy as np
+
+from integrated_batch import evaluate_integrated_batch, BASE_TRAFFIC_SIGNAL
+
+DEFAULT_HORIZONS = (1, 3, 6)
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def sample_uncertainty_bands(baseline_aqi, traffic_impact, beta, duration_months,
+                             construction_score, operational_score,
+                             horizons=DEFAULT_HORIZONS, n_samples=10000, seed=None,
+                             time_budget_ms=20.0, chunk_size=2500,
+                             score_sigma=0.05, beta_rel_sigma=0.2,
+                             baseline_rel_sigma=0.1, traffic_sigma=5.0,
+                             base_traffic_signal=BASE_TRAFFIC_SIGNAL):
+    """
+    Monte Carlo uncertainty bands for an integrated what-if result.
+
+    Perturbs the LLM scores, the traffic impact, the traffic->AQI beta and the
+    baseline AQI around their point estimates and pushes every sample through
+    the vectorized traffic + AQI chain in chunks of `chunk_size`.
+    Without a seed, sampling stops early once `time_budget_ms` is spent (at
+    least one chunk is always evaluated). With a seed the full `n_samples` are
+    always drawn, so the same seed gives the same bands.
+
+    Returns percentile bands per horizon, e.g. result["horizons"]["6_month"]["p50"].
+    """
+    if n_samples <= 0:
+        raise ValueError("n_samples must be positive")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    rng = np.random.default_rng(seed)
+    horizons = sorted(set(int(h) for h in horizons))
+    months = np.array(horizons, dtype=float)[:, None]
+
+    start = time.perf_counter()
+    chunks = []
+    drawn = 0
+
+    while drawn < n_samples:
+        size = min(chunk_size, n_samples - drawn)
+
+        sampled_baseline = baseline_aqi * rng.lognormal(0.0, baseline_rel_sigma, size)
+        sampled_beta = rng.normal(beta, abs(beta) * beta_rel_sigma, size)
+        sampled_traffic = rng.normal(traffic_impact, traffic_sigma, size)
+        sampled_construction = np.clip(rng.normal(construction_score, score_sigma, size), -1.0, 1.0)
+        sampled_operational = np.clip(rng.normal(operational_score, score_sigma, size), -1.0, 1.0)
+
+        # (horizons, 1) x (samples,) -> (horizons, samples)
+        chunk = evaluate_integrated_batch(
+            baseline_aqi=sampled_baseline,
+            traffic_impact=sampled_traffic,
+            beta=sampled_beta,
+            months_ahead=months,
+            duration_months=duration_months,
+            construction_score=sampled_construction,
+            operational_score=sampled_operational,
+            base_traffic_signal=base_traffic_signal
+        )["final_aqi"]
+
+        chunks.append(chunk)
+        drawn += size
+
+        if seed is None and (time.perf_counter() - start) * 1000 >= time_budget_ms:
+            break
+
+    final_aqi = np.concatenate(chunks, axis=1)
+    bands = np.percentile(final_aqi, PERCENTILES, axis=1)
+    means = final_aqi.mean(axis=1)
+
+    result = {}
+    for i, horizon in enumerate(horizons):
+        band = {f"p{p}": round(float(bands[j, i]), 2) for j, p in enumerate(PERCENTILES)}
+        band["mean"] = round(float(means[i]), 2)
+        result[f"{horizon}_month"] = band
+
+    return {
+        "horizons": result,
+        "samples": int(drawn),
+        "requested_samples": int(n_samples),
+        "budget_exhausted": bool(drawn < n_samples),
+        "seed": seed,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
@@ -0,0 +1,21 @@
+"""
+Imports the legacy ai_responses_storage JSON files into the SQLite response store.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from services.response_store import get_response_store
+
+
+class Command(BaseCommand):
+    help = 'Import AI response / prediction JSON files into the SQLite response store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', default=str(settings.AI_RESPONSES_DIR),
+                            help='Folder of JSON files (default: AI_RESPONSES_DIR)')
+
+    def handle(self, *args, **options):
+        result = get_response_store().import_json_dir(options['dir'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['imported']}, skipped {result['skipped']} existing, {result['failed']} failed"
+        ))
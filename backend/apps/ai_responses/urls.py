@@ -4,5 +4,6 @@ from . import views
 urlpatterns = [
     path('store/', views.store_ai_response, name='store_ai_response'),
     path('list/', views.get_ai_responses, name='get_ai_responses'),
+    path('stats/', views.storage_stats, name='storage_stats'),
     path('<str:response_id>/', views.get_ai_response, name='get_ai_response'),
 ]
\ No newline at end of file
@@ -5,16 +5,10 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-import json
-import os
 from datetime import datetime
-
-# Simple file-based storage for AI responses
-RESPONSES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'ai_responses_storage')
-
-def ensure_storage_dir():
-    if not os.path.exists(RESPONSES_DIR):
-        os.makedirs(RESPONSES_DIR)
+from services.response_store import (
+    get_response_store, get_prediction_writer, new_record_id, KIND_AI_RESPONSE, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -30,8 +24,6 @@ def store_ai_response(request):
             "user_id": "user123"
         }
     """
-    ensure_storage_dir()
-    
     scenario = request.data.get('scenario')
     location = request.data.get('location')
     ai_response = request.data.get('response')
@@ -44,7 +36,7 @@ def store_ai_response(request):
         )
     
     # Create response record
-    response_id = f"ai_{int(datetime.now().timestamp())}"
+    response_id = new_record_id('ai')
     response_data = {
         'id': response_id,
         'scenario': scenario,
@@ -55,10 +47,10 @@ def store_ai_response(request):
         'shared': True
     }
     
-    # Save to file
-    file_path = os.path.join(RESPONSES_DIR, f"{response_id}.json")
-    with open(file_path, 'w') as f:
-        json.dump(response_data, f, indent=2)
+    get_response_store().put(
+        response_id, KIND_AI_RESPONSE, str(user_id), response_data,
+        scenario=scenario, created_at=response_data['created_at']
+    )
     
     return Response({
         'response_id': response_id,
@@ -69,44 +61,34 @@ def store_ai_response(request):
 @permission_classes([IsAuthenticated])
 def get_ai_responses(request):
     """
-    Get stored AI responses.
+    Get stored AI responses and predictions, newest first.
     
     Query params:
-        - limit: Number of responses to return (default: 10)
+        - limit: Number of responses to return (default: 10, max: 100)
         - user_id: Filter by user (optional)
+        - kind: 'ai_response' or 'prediction' (optional)
+        - cursor: next_cursor from the previous page (optional)
     """
-    ensure_storage_dir()
-    
-    limit = int(request.query_params.get('limit', 10))
     user_filter = request.query_params.get('user_id')
+    kind = request.query_params.get('kind')
+    cursor = request.query_params.get('cursor')
     
-    responses = []
-    
-    # Read all response files
-    for filename in os.listdir(RESPONSES_DIR):
-        if filename.endswith('.json'):
-            file_path = os.path.join(RESPONSES_DIR, filename)
-            try:
-                with open(file_path, 'r') as f:
-                    response_data = json.load(f)
-                    
-                # Apply user filter if specified
-                if user_filter and response_data.get('user_id') != user_filter:
-                    continue
-                    
-                responses.append(response_data)
-            except Exception as e:
-                continue
-    
-    # Sort by creation time (newest first)
-    responses.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-    
-    # Apply limit
-    responses = responses[:limit]
+    try:
+        limit = int(request.query_params.get('limit', DEFAULT_PAGE_SIZE))
+        responses, next_cursor = get_response_store().list(
+            user_id=user_filter, kind=kind, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        return Response(
+            {'error': str(e) if cursor else 'Invalid limit'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
     return Response({
         'responses': responses,
-        'total': len(responses)
+        'total': len(responses),
+        'limit': max(1, min(limit, MAX_PAGE_SIZE)),
+        'next_cursor': next_cursor
     }, status=status.HTTP_200_OK)
 
 @api_view(['GET'])
@@ -115,22 +97,26 @@ def get_ai_response(request, response_id):
     """
     Get specific AI response by ID.
     """
-    ensure_storage_dir()
-    
-    file_path = os.path.join(RESPONSES_DIR, f"{response_id}.json")
+    try:
+        response_data = get_response_store().get(response_id)
+    except Exception as e:
+        return Response(
+            {'error': 'Failed to read response'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
     
-    if not os.path.exists(file_path):
+    if response_data is None:
         return Response(
             {'error': 'Response not found'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    try:
-        with open(file_path, 'r') as f:
-            response_data = json.load(f)
-        return Response(response_data, status=status.HTTP_200_OK)
-    except Exception as e:
-        return Response(
-            {'error': 'Failed to read response'},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+    return Response(response_data, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def storage_stats(request):
+    """
+    Write-behind queue counters for proxied predictions.
+    """
+    return Response(get_prediction_writer().stats(), status=status.HTTP_200_OK)
@@ -8,4 +8,6 @@ app_name = 'education'
 
 urlpatterns = [
     path('capacity/', views.capacity, name='capacity'),
+    path('accessibility/', views.accessibility, name='accessibility'),
+    path('assignment/', views.assignment, name='assignment'),
 ]
@@ -7,6 +7,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from services.education_service import get_education_by_location
+from services.accessibility_service import get_accessibility
+from services.school_assignment_service import get_school_assignment, DEFAULT_NEW_CAPACITY
 
 
 @api_view(['GET'])
@@ -46,3 +48,109 @@ def capacity(request):
         'overcrowded_schools': overcrowded,
         'timestamp': datetime.now().isoformat()
     }, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def accessibility(request):
+    """
+    Road-network travel distance and time to schools from a point,
+    optionally with proposed new schools (what-if).
+    
+    Request body:
+        {
+            "latitude": 23.0225,
+            "longitude": 72.5714,
+            "new_facilities": [{"name": "New School", "lat": 23.03, "lng": 72.55}]
+        }
+    
+    Response:
+        {
+            "nearest": {"name": "...", "distance_km": 2.4, "travel_time_min": 6.1, ...},
+            "facilities": [...],
+            "what_if": {"nearest": {...}, "facilities": [...], "time_saved_min": 3.2}
+        }
+    """
+    lat = request.data.get('latitude')
+    lng = request.data.get('longitude')
+    new_facilities = request.data.get('new_facilities') or []
+    
+    if lat is None or lng is None:
+        return Response(
+            {'error': 'Latitude and longitude are required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        lat = float(lat)
+        lng = float(lng)
+        new_facilities = [
+            {'name': f.get('name') or f'New school {i + 1}', 'lat': float(f['lat']), 'lng': float(f['lng'])}
+            for i, f in enumerate(new_facilities)
+        ]
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return Response(
+            {'error': 'Invalid latitude, longitude or new_facilities format'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        result = get_accessibility('schools', lat, lng, new_facilities)
+    except Exception as e:
+        return Response(
+            {'error': f'Accessibility unavailable: {str(e)}'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    
+    result['timestamp'] = datetime.now().isoformat()
+    return Response(result, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def assignment(request):
+    """
+    Capacity-constrained assignment of a ward's students to schools, with per-school
+    utilisation and overcrowding, optionally with new schools (what-if).
+    
+    Request body:
+        {
+            "ward": "Vastrapur",
+            "new_schools": [{"name": "New School", "lat": 23.03, "lng": 72.52, "capacity": 600}]
+        }
+    
+    Response:
+        {
+            "ward": "Vastrapur",
+            "students": 1750,
+            "unassigned_students": 0,
+            "schools": [{"name": "...", "utilization_percent": 100.0, "overcrowded": false, ...}],
+            "what_if": {...}
+        }
+    """
+    ward = request.data.get('ward')
+    
+    if not ward:
+        return Response(
+            {'error': 'Ward is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        new_schools = [
+            {
+                'name': s.get('name') or f'New school {i + 1}',
+                'lat': float(s['lat']),
+                'lng': float(s['lng']),
+                'capacity': float(s.get('capacity', DEFAULT_NEW_CAPACITY))
+            }
+            for i, s in enumerate(request.data.get('new_schools') or [])
+        ]
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return Response(
+            {'error': 'Invalid new_schools format'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    result = get_school_assignment(ward, new_schools)
+    return Response(result, status=status.HTTP_200_OK)
@@ -8,4 +8,6 @@ app_name = 'healthcare'
 
 urlpatterns = [
     path('capacity/', views.capacity, name='capacity'),
+    path('accessibility/', views.accessibility, name='accessibility'),
+    path('catchment/', views.catchment, name='catchment'),
 ]
@@ -7,6 +7,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from services.healthcare_service import get_healthcare_by_location
+from services.accessibility_service import get_accessibility
+from services.catchment_service import get_healthcare_access, DEFAULT_NEW_BEDS
 
 
 @api_view(['GET'])
@@ -46,3 +48,116 @@ def capacity(request):
         'available_beds': available_beds,
         'timestamp': datetime.now().isoformat()
     }, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def accessibility(request):
+    """
+    Road-network travel distance and time to hospitals from a point,
+    optionally with proposed new hospitals (what-if).
+    
+    Request body:
+        {
+            "latitude": 23.0225,
+            "longitude": 72.5714,
+            "new_facilities": [{"name": "New Hospital", "lat": 23.03, "lng": 72.55}]
+        }
+    
+    Response:
+        {
+            "nearest": {"name": "...", "distance_km": 2.4, "travel_time_min": 6.1, ...},
+            "facilities": [...],
+            "what_if": {"nearest": {...}, "facilities": [...], "time_saved_min": 3.2}
+        }
+    """
+    lat = request.data.get('latitude')
+    lng = request.data.get('longitude')
+    new_facilities = request.data.get('new_facilities') or []
+    
+    if lat is None or lng is None:
+        return Response(
+            {'error': 'Latitude and longitude are required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        lat = float(lat)
+        lng = float(lng)
+        new_facilities = [
+            {'name': f.get('name') or f'New hospital {i + 1}', 'lat': float(f['lat']), 'lng': float(f['lng'])}
+            for i, f in enumerate(new_facilities)
+        ]
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return Response(
+            {'error': 'Invalid latitude, longitude or new_facilities format'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        result = get_accessibility('hospitals', lat, lng, new_facilities)
+    except Exception as e:
+        return Response(
+            {'error': f'Accessibility unavailable: {str(e)}'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    
+    result['timestamp'] = datetime.now().isoformat()
+    return Response(result, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def catchment(request):
+    """
+    Two-step floating catchment (2SFCA) access to hospital beds per ward and grid cell,
+    optionally with new hospitals or added beds (what-if).
+    
+    Request body (all optional):
+        {
+            "mode": "network",  // or "haversine"
+            "cell_km": 1.0,
+            "include_cells": true,
+            "new_facilities": [{"name": "New Hospital", "lat": 23.03, "lng": 72.55, "beds": 200}],
+            "extra_beds": {"Apollo Hospital": 100}
+        }
+    
+    Response:
+        {
+            "city_access": 0.31,  // beds per 1000 people
+            "wards": {"Vastrapur": {"access": 0.91, "population": 198000}, ...},
+            "cells": [...],
+            "what_if": {...}
+        }
+    """
+    mode = request.data.get('mode', 'network')
+    include_cells = bool(request.data.get('include_cells', True))
+    
+    if mode not in ('network', 'haversine'):
+        return Response(
+            {'error': "mode must be 'network' or 'haversine'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        cell_km = float(request.data.get('cell_km', 1.0))
+        if not 0.2 <= cell_km <= 5.0:
+            raise ValueError
+        new_facilities = [
+            {
+                'name': f.get('name') or f'New hospital {i + 1}',
+                'lat': float(f['lat']),
+                'lng': float(f['lng']),
+                'beds': float(f.get('beds', DEFAULT_NEW_BEDS))
+            }
+            for i, f in enumerate(request.data.get('new_facilities') or [])
+        ]
+        extra_beds = {str(k): float(v) for k, v in (request.data.get('extra_beds') or {}).items()}
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return Response(
+            {'error': 'Invalid cell_km, new_facilities or extra_beds format'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    result = get_healthcare_access(new_facilities, extra_beds, mode, cell_km, include_cells)
+    return Response(result, status=status.HTTP_200_OK)
@@ -9,4 +9,6 @@ app_name = 'map'
 urlpatterns = [
     path('reverse-geocode/', views.reverse_geocode, name='reverse-geocode'),
     path('area-metrics/', views.area_metrics, name='area-metrics'),
+    path('reverse-geocode/batch/', views.reverse_geocode_batch_view, name='reverse-geocode-batch'),
+    path('area-metrics/batch/', views.area_metrics_batch, name='area-metrics-batch'),
 ]
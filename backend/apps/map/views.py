@@ -5,12 +5,13 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from utils.geocoding import reverse_geocode_tomtom
+from utils.geocoding import reverse_geocode_tomtom, reverse_geocode_batch
 from services.aqi_service import get_aqi_by_location
 from services.traffic_service import get_traffic_by_location
 from services.healthcare_service import get_healthcare_by_location
 from services.education_service import get_education_by_location
 from services.urban_dev_service import get_urban_dev_by_location
+from services.area_batch_service import get_area_metrics_batch, MAX_BATCH_POINTS
 
 
 @api_view(['POST'])
@@ -129,8 +130,8 @@ def area_metrics(request):
     # Get metrics from various services
     aqi_data = get_aqi_by_location(lat, lng, locality_info['locality'])
     traffic_data = get_traffic_by_location(lat, lng, locality_info['locality'])
-    healthcare_data = get_healthcare_by_location(locality_info['locality'], locality_info['ward'])
-    education_data = get_education_by_location(locality_info['locality'], locality_info['ward'])
+    healthcare_data = get_healthcare_by_location(locality_info['locality'], locality_info['ward'], lat, lng)
+    education_data = get_education_by_location(locality_info['locality'], locality_info['ward'], lat, lng)
     urban_dev_data = get_urban_dev_by_location(locality_info['locality'], locality_info['ward'])
     
     return Response({
@@ -141,3 +142,93 @@ def area_metrics(request):
         'education': education_data,
         'urban_development': urban_dev_data
     }, status=status.HTTP_200_OK)
+
+
+def _parse_points(request):
+    """
+    Latitude and longitude lists from a {"points": [{"latitude", "longitude"}, ...]} body.
+    Returns (lats, lngs, None) or (None, None, error Response).
+    """
+    points = request.data.get('points')
+    
+    if not isinstance(points, list) or not points:
+        return None, None, Response(
+            {'error': 'A non-empty list of points is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if len(points) > MAX_BATCH_POINTS:
+        return None, None, Response(
+            {'error': f'At most {MAX_BATCH_POINTS} points per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        lats = [float(p['latitude']) for p in points]
+        lngs = [float(p['longitude']) for p in points]
+    except (ValueError, TypeError, KeyError):
+        return None, None, Response(
+            {'error': 'Invalid latitude or longitude format'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    return lats, lngs, None
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def reverse_geocode_batch_view(request):
+    """
+    Reverse geocode many coordinates in one request.
+    
+    Request body:
+        {
+            "points": [{"latitude": 23.0225, "longitude": 72.5714}, ...]
+        }
+    
+    Response:
+        {
+            "count": 2,
+            "results": [{"locality": "SG Highway", "ward": "Vastrapur", ...}, ...]
+        }
+    """
+    lats, lngs, error = _parse_points(request)
+    if error:
+        return error
+    
+    labels, localities = reverse_geocode_batch(lats, lngs)
+    
+    return Response({
+        'count': len(lats),
+        'results': [localities[int(label)] for label in labels]
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def area_metrics_batch(request):
+    """
+    Area metrics for many map points. Ward-level services run once per distinct
+    ward and AQI/traffic once per distinct grid cell.
+    
+    Request body:
+        {
+            "points": [{"latitude": 23.0225, "longitude": 72.5714}, ...],
+            "compact": false  // Optional: shared ward/cell tables instead of repeated results
+        }
+    
+    Response:
+        {
+            "count": 500,
+            "unique_wards": 6,
+            "unique_cells": 40,
+            "points": [{"locality": {...}, "aqi": {...}, "traffic": {...}, "healthcare": {...}, ...}]
+        }
+    """
+    lats, lngs, error = _parse_points(request)
+    if error:
+        return error
+    
+    result = get_area_metrics_batch(lats, lngs, compact=bool(request.data.get('compact', False)))
+    
+    return Response(result, status=status.HTTP_200_OK)
@@ -2,6 +2,8 @@
 Scenario Management views for saving, listing, and comparing scenarios.
 Government users only.
 """
+import math
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -11,7 +13,8 @@ from services.scenarios_service import (
     save_scenario,
     list_scenarios,
     compare_scenarios,
-    get_scenario
+    get_scenario,
+    MAX_COMPARE_SCENARIOS
 )
 
 
@@ -60,7 +63,8 @@ def list(request):
     
     Query params:
         - tag: Optional tag filter
-        - limit: Optional limit (default: 50)
+        - limit: Optional limit (default: 50, max: 500)
+        - cursor: Optional next_cursor from the previous page
     
     Response:
         {
@@ -74,13 +78,21 @@ def list(request):
                 },
                 ...
             ],
-            "total": 10
+            "total": 10,
+            "next_cursor": "..."  // null on the last page
         }
     """
     tag = request.query_params.get('tag')
-    limit = int(request.query_params.get('limit', 50))
+    cursor = request.query_params.get('cursor')
     
-    scenarios_data = list_scenarios(tag=tag, limit=limit)
+    try:
+        limit = int(request.query_params.get('limit', 50))
+        scenarios_data = list_scenarios(tag=tag, limit=limit, cursor=cursor)
+    except ValueError as e:
+        return Response(
+            {'error': str(e) if cursor else 'Invalid limit'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
     return Response(scenarios_data, status=status.HTTP_200_OK)
 
@@ -89,24 +101,34 @@ def list(request):
 @permission_classes([IsAuthenticated, IsGovernmentUser])
 def compare(request):
     """
-    Compare two or more scenarios side-by-side.
+    Compare two or more scenarios: side-by-side values, pairwise differences,
+    normalized scores, Pareto front and weighted ranking.
     
     Request body:
         {
-            "scenario_ids": ["scenario_123", "scenario_456"]
+            "scenario_ids": ["scenario_123", "scenario_456"],
+            "weights": {"traffic": 2, "aqi": 1}  // Optional, finite and >= 0; missing metrics weigh 1
         }
     
     Response:
         {
             "scenarios": [...],
+            "metrics": ["traffic", "aqi", "healthcare", "education", "urban_development"],
+            "columns": {"scenario_id": [...], "weighted_score": [...], "rank": [...], "pareto_optimal": [...]},
+            "values": {"current": [[...]], "projected": [[...]], "change_percent": [[...]]},
+            "scores": [[...]],
+            "pairwise_change_diff": {"traffic": [[...]], ...},
+            "ranking": [...],
+            "pareto_front": [...],
             "comparison": {
-                "traffic": {...},
-                "aqi": {...},
+                "traffic": [...],
+                "aqi": [...],
                 ...
             }
         }
     """
     scenario_ids = request.data.get('scenario_ids', [])
+    weights = request.data.get('weights')
     
     if not scenario_ids or len(scenario_ids) < 2:
         return Response(
@@ -114,6 +136,26 @@ def compare(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    comparison = compare_scenarios(scenario_ids)
+    if len(scenario_ids) > MAX_COMPARE_SCENARIOS:
+        return Response(
+            {'error': f'At most {MAX_COMPARE_SCENARIOS} scenarios can be compared'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if weights is not None:
+        try:
+            weights = {str(k): float(v) for k, v in weights.items()}
+        except (ValueError, TypeError, AttributeError):
+            return Response(
+                {'error': 'weights must map metric names to numbers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not all(math.isfinite(v) and v >= 0 for v in weights.values()):
+            return Response(
+                {'error': 'weights must be finite and non-negative'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    comparison = compare_scenarios(scenario_ids, weights)
     
     return Response(comparison, status=status.HTTP_200_OK)
@@ -0,0 +1,16 @@
+"""
+Rebuilds the full-text search index from the scenario and response stores.
+"""
+from django.core.management.base import BaseCommand
+
+from services.search_service import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index over saved scenarios and AI responses'
+
+    def handle(self, *args, **options):
+        result = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {result['scenarios']} scenarios and {result['responses']} responses"
+        ))
@@ -0,0 +1,11 @@
+"""
+URL routing for search endpoints.
+"""
+from django.urls import path
+from . import views
+
+app_name = 'search'
+
+urlpatterns = [
+    path('', views.search, name='search'),
+]
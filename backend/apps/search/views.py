@@ -0,0 +1,67 @@
+"""
+Full-text search over saved scenarios, AI responses and predictions.
+"""
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+from services.search_service import search as search_documents, DEFAULT_SEARCH_LIMIT
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search(request):
+    """
+    Ranked search, best match first.
+    
+    Query params:
+        - q: Search text, e.g. "metro Maninagar" (required)
+        - source: 'scenario', 'ai_response' or 'prediction' (optional)
+        - user_id: Filter by user (optional)
+        - action_type: bridge, road, hospital, school, infrastructure (optional)
+        - from / to: ISO dates bounding created_at (optional)
+        - match: 'all' (every word, default) or 'any'
+        - limit: Results per page (default: 20, max: 100)
+        - offset: next_offset from the previous page (optional)
+    
+    Filters are applied before ranking. If more than MAX_RANKED_MATCHES (2000)
+    documents still match, only the most recently indexed 2000 are ranked and
+    paged, and the response has "truncated": true; narrow the query, filters
+    or date range to reach the rest.
+    """
+    query = request.query_params.get('q', '').strip()
+    
+    if not query:
+        return Response(
+            {'error': 'q parameter is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        limit = int(request.query_params.get('limit', DEFAULT_SEARCH_LIMIT))
+        offset = int(request.query_params.get('offset', 0))
+    except ValueError:
+        return Response(
+            {'error': 'limit and offset must be integers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        results = search_documents(
+            query,
+            user_id=request.query_params.get('user_id'),
+            source=request.query_params.get('source'),
+            action_type=request.query_params.get('action_type'),
+            date_from=request.query_params.get('from'),
+            date_to=request.query_params.get('to'),
+            match_all=request.query_params.get('match', 'all') != 'any',
+            limit=limit,
+            offset=offset
+        )
+    except ValueError as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    return Response(results, status=status.HTTP_200_OK)
@@ -63,9 +63,9 @@ def run(request):
 
 
 import requests
-import json
 import os
 from datetime import datetime
+from services.response_store import get_prediction_writer, new_record_id, KIND_PREDICTION
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -127,32 +127,34 @@ def predict(request):
             
         data = response.json()
         
-        # 3. Store the result in ai_responses_storage (JSON persistence)
-        storage_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'ai_responses_storage')
-        if not os.path.exists(storage_dir):
-            os.makedirs(storage_dir)
-            
-        timestamp = int(datetime.now().timestamp())
+        # 3. Queue the result for the AI response store (written in the background)
         # Handle anonymous users (AllowAny permission)
         username = 'anonymous'
         if hasattr(request, 'user') and hasattr(request.user, 'is_authenticated') and request.user.is_authenticated:
             username = getattr(request.user, 'username', 'user')
         elif hasattr(request, 'user'):
             username = str(request.user)
-        file_name = f"predict_{timestamp}_{username}.json"
-        file_path = os.path.join(storage_dir, file_name)
+        record_id = new_record_id('predict')
         
         storage_data = {
+            "id": record_id,
             "request": request.data,
             "response": data,
             "user": username,
             "timestamp": datetime.now().isoformat()
         }
         
-        with open(file_path, 'w') as f:
-            json.dump(storage_data, f, indent=2)
+        request_scenario = request.data.get('scenario') if isinstance(request.data, dict) else None
+        get_prediction_writer().put({
+            'id': record_id,
+            'kind': KIND_PREDICTION,
+            'user_id': username,
+            'scenario': request_scenario,
+            'created_at': storage_data['timestamp'],
+            'payload': storage_data
+        })
             
-        return Response(data, status=status.HTTP_200_OK)
+        return Response(data, status=status.HTTP_200_OK, headers={'X-Prediction-Id': record_id})
         
     except requests.exceptions.ConnectionError as e:
         return Response(
@@ -186,7 +188,8 @@ def explain(request):
         {
             "simulation_id": "sim_123",  // Optional
             "action_type": "bridge",
-            "location": "SG Highway"
+            "location": "SG Highway",
+            "ward": "Vastrapur"  // Optional, derived from the location otherwise
         }
     
     Response:
@@ -194,13 +197,15 @@ def explain(request):
             "explanation": "...",
             "methodology": "...",
             "assumptions": [...],
-            "confidence_score": 0.85
+            "confidence_score": 0.85,
+            "impacts": {...}
         }
     """
     simulation_id = request.data.get('simulation_id')
     action_type = request.data.get('action_type')
     location = request.data.get('location')
+    ward = request.data.get('ward')
     
-    explanation = explain_simulation(action_type, location, simulation_id)
+    explanation = explain_simulation(action_type, location, simulation_id, ward)
     
     return Response(explanation, status=status.HTTP_200_OK)
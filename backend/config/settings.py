@@ -44,6 +44,8 @@ INSTALLED_APPS = [
     'apps.scenarios',
     'apps.demand',
     'apps.settings_app',
+    'apps.ai_responses',
+    'apps.search',
 ]
 
 MIDDLEWARE = [
@@ -160,3 +162,23 @@ AQICN_API_BASE_URL = os.environ.get('AQICN_API_BASE_URL', 'https://api.waqi.info
 
 # Mock Data Configuration
 MOCK_DATA_DIR = BASE_DIR / 'mock_data'
+
+# Zone/ward regions for reverse geocoding (zones file or GeoJSON polygons)
+GEO_REGIONS_FILE = MOCK_DATA_DIR / 'ahmedabad_zones.json'
+
+# AI responses and proxied predictions (SQLite, WAL mode); the JSON folder is the legacy store
+AI_RESPONSES_DB = BASE_DIR / 'ai_responses.sqlite3'
+AI_RESPONSES_DIR = BASE_DIR / 'ai_responses_storage'
+
+# Saved what-if scenarios (SQLite, WAL mode)
+SCENARIOS_DB = BASE_DIR / 'scenarios.sqlite3'
+
+# Full-text search index over scenarios and AI responses (SQLite FTS5)
+SEARCH_DB = BASE_DIR / 'search.sqlite3'
+
+# Write-behind queue for proxied predictions: 'block' (backpressure) or 'drop' when full
+PREDICTION_QUEUE_SIZE = int(os.environ.get('PREDICTION_QUEUE_SIZE', '10000'))
+PREDICTION_QUEUE_POLICY = os.environ.get('PREDICTION_QUEUE_POLICY', 'block')
+
+# Cached Overpass road data (repository root cache/), used for accessibility
+ROAD_CACHE_DIR = BASE_DIR.parent / 'cache'
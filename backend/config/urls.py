@@ -19,5 +19,6 @@ urlpatterns = [
     path('api/predict/', simulation_views.predict, name='predict_api'),
     path('api/scenarios/', include('apps.scenarios.urls')),
     path('api/ai-responses/', include('apps.ai_responses.urls')),
+    path('api/search/', include('apps.search.urls')),
     path('api/settings/', include('apps.settings_app.urls')),
 ]
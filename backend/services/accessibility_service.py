@@ -0,0 +1,262 @@
+"""
+Accessibility Service - Road-network travel distance and time to hospitals and schools.
+"""
+import numpy as np
+from django.conf import settings
+
+from utils.geocoding import AHMEDABAD_LOCATIONS, get_distance
+from utils.road_graph import get_road_graph, ACCESS_SPEED_KMH, _haversine_km
+
+
+class AccessibilityIndex:
+    """
+    Per-node travel distance/time to facilities over the road graph.
+
+    Facilities are snapped to their nearest graph node and one Dijkstra run
+    (scipy.sparse.csgraph, all facilities as sources, on the reversed graph so
+    paths lead *to* the facility) gives a facilities x nodes table of travel
+    time and distance. The nearest facility per node is kept alongside, so
+    any point is answered with a KD-tree snap plus array lookups. A facility
+    closer in a straight line than via the snapped nodes (e.g. both snap to the
+    same road node) is reached with the direct hop instead.
+    Adding a facility runs Dijkstra from that one source and only updates the
+    nodes it now serves faster.
+    """
+
+    def __init__(self, facilities, graph=None):
+        self.graph = graph or get_road_graph()
+        self.facilities = []
+        self.facility_nodes = np.zeros(0, dtype=np.int64)
+        self.facility_lat = np.zeros(0)
+        self.facility_lng = np.zeros(0)
+        self.facility_access_km = np.zeros(0)
+        self.time_rows = np.zeros((0, self.graph.size))
+        self.distance_rows = np.zeros((0, self.graph.size))
+        self.nearest = np.full(self.graph.size, -1, dtype=np.int64)
+        self.nearest_time = np.full(self.graph.size, np.inf)
+        self._reverse_time = self.graph.time.T.tocsr()
+        self._reverse_distance = self.graph.distance.T.tocsr()
+
+        if facilities:
+            self._add(list(facilities))
+
+    def _shortest(self, nodes):
+        from scipy.sparse.csgraph import dijkstra
+
+        nodes = np.atleast_1d(nodes)
+        time_rows = dijkstra(self._reverse_time, directed=True, indices=nodes)
+        distance_rows = dijkstra(self._reverse_distance, directed=True, indices=nodes)
+        return np.atleast_2d(time_rows), np.atleast_2d(distance_rows)
+
+    def _add(self, facilities):
+        lat = [f['lat'] for f in facilities]
+        lng = [f['lng'] for f in facilities]
+        nodes, access_km = self.graph.nearest_node(lat, lng)
+        time_rows, distance_rows = self._shortest(nodes)
+
+        # Include the facility's own hop from its road node
+        time_rows = time_rows + (access_km / ACCESS_SPEED_KMH * 60.0)[:, None]
+        distance_rows = distance_rows + access_km[:, None]
+
+        offset = len(self.facilities)
+        self.facilities.extend(facilities)
+        self.facility_nodes = np.concatenate([self.facility_nodes, nodes])
+        self.facility_lat = np.concatenate([self.facility_lat, lat])
+        self.facility_lng = np.concatenate([self.facility_lng, lng])
+        self.facility_access_km = np.concatenate([self.facility_access_km, access_km])
+        self.time_rows = np.vstack([self.time_rows, time_rows])
+        self.distance_rows = np.vstack([self.distance_rows, distance_rows])
+
+        best = time_rows.argmin(axis=0)
+        best_time = time_rows[best, np.arange(self.graph.size)]
+        improved = best_time < self.nearest_time
+        self.nearest[improved] = best[improved] + offset
+        self.nearest_time[improved] = best_time[improved]
+
+    def add_facility(self, facility):
+        """
+        Adds one facility (dict with name, lat, lng) and updates the table incrementally.
+        """
+        self._add([facility])
+        return self
+
+    def with_facilities(self, facilities):
+        """
+        Copy of the index with extra facilities (what-if), leaving this one unchanged.
+        """
+        clone = AccessibilityIndex.__new__(AccessibilityIndex)
+        clone.__dict__.update(self.__dict__)
+        clone.facilities = list(self.facilities)
+        clone.nearest = self.nearest.copy()
+        clone.nearest_time = self.nearest_time.copy()
+        if facilities:
+            clone._add(list(facilities))
+        return clone
+
+    def _snap(self, lat, lng):
+        node, access_km = self.graph.nearest_node(lat, lng)
+        direct_km = _haversine_km(lat, lng, self.facility_lat, self.facility_lng)
+        return int(node[0]), float(access_km[0]), direct_km
+
+    def _travel(self, node, access_km, direct_km):
+        """
+        Per-facility (km, minutes): road network or direct hop, whichever is faster.
+        """
+        network_km = self.distance_rows[:, node] + access_km
+        network_min = self.time_rows[:, node] + access_km / ACCESS_SPEED_KMH * 60.0
+        direct_min = direct_km / ACCESS_SPEED_KMH * 60.0
+        use_direct = direct_min < network_min
+        return np.where(use_direct, direct_km, network_km), np.where(use_direct, direct_min, network_min)
+
+    def travel_matrix(self, lat, lng):
+        """
+        Travel (km, minutes) from every facility to many points, as facilities x points arrays.
+        """
+        lat = np.atleast_1d(np.asarray(lat, dtype=float))
+        lng = np.atleast_1d(np.asarray(lng, dtype=float))
+        nodes, access_km = self.graph.nearest_node(lat, lng)
+        direct_km = _haversine_km(lat[None, :], lng[None, :], self.facility_lat[:, None], self.facility_lng[:, None])
+        return self._travel(nodes, access_km, direct_km)
+
+    def nearest_facility(self, lat, lng):
+        """
+        Nearest facility by travel time from a point.
+
+        Returns:
+            dict: facility name, distance_km, travel_time_min and the straight-line
+            snap distance to the road network, or None when nothing is reachable
+        """
+        if not self.facilities:
+            return None
+        node, access_km, direct_km = self._snap(lat, lng)
+        i = self.nearest[node]
+        # Only the direct hops can beat the node's nearest facility
+        hop_min = direct_km / ACCESS_SPEED_KMH * 60.0
+        network_min = self.nearest_time[node] + access_km / ACCESS_SPEED_KMH * 60.0
+        if hop_min.min() < network_min:
+            i = int(hop_min.argmin())
+        if i < 0:
+            return None
+        km, minutes = self._travel(node, access_km, direct_km)
+        return self._format(i, km[i], minutes[i], access_km)
+
+    def facility_distances(self, lat, lng):
+        """
+        Travel distance and time from a point to every facility, nearest first.
+        """
+        if not self.facilities:
+            return []
+        node, access_km, direct_km = self._snap(lat, lng)
+        km, minutes = self._travel(node, access_km, direct_km)
+        order = np.argsort(minutes, kind='stable')
+        return [self._format(i, km[i], minutes[i], access_km) for i in order]
+
+    def _format(self, i, km, minutes, access_km):
+        reachable = np.isfinite(minutes)
+        return {
+            'name': self.facilities[i]['name'],
+            'lat': self.facilities[i]['lat'],
+            'lng': self.facilities[i]['lng'],
+            'distance_km': round(float(km), 2) if reachable else None,
+            'travel_time_min': round(float(minutes), 1) if reachable else None,
+            'network_snap_km': round(access_km, 3),
+            'reachable': bool(reachable)
+        }
+
+
+_indexes = {}
+
+
+def get_facilities(kind):
+    """
+    All mock facilities of a kind ('hospitals' or 'schools'), one entry per name.
+    """
+    if kind == 'hospitals':
+        from services.healthcare_service import MOCK_HEALTHCARE_DATA as data
+    elif kind == 'schools':
+        from services.education_service import MOCK_EDUCATION_DATA as data
+    else:
+        raise ValueError(f"Unknown facility kind: {kind}")
+
+    facilities = {}
+    for ward, ward_data in data.items():
+        for facility in ward_data[kind]:
+            if 'lat' in facility and 'lng' in facility:
+                facilities.setdefault(facility['name'], dict(facility, ward=ward))
+    return list(facilities.values())
+
+
+def get_accessibility_index(kind):
+    """
+    Shared AccessibilityIndex for 'hospitals' or 'schools', built on first use.
+    """
+    if kind not in _indexes:
+        _indexes[kind] = AccessibilityIndex(get_facilities(kind))
+    return _indexes[kind]
+
+
+def get_accessibility(kind, lat, lng, new_facilities=None):
+    """
+    Nearest facility and per-facility travel times from a point, optionally with
+    what-if facilities added.
+
+    Args:
+        kind: 'hospitals' or 'schools'
+        lat: Latitude
+        lng: Longitude
+        new_facilities: Optional list of {'name', 'lat', 'lng'} to add for the what-if
+
+    Returns:
+        dict: Current (and what-if) nearest facility and facility list
+    """
+    index = get_accessibility_index(kind)
+    result = {
+        'nearest': index.nearest_facility(lat, lng),
+        'facilities': index.facility_distances(lat, lng)
+    }
+
+    if new_facilities:
+        what_if = index.with_facilities(new_facilities)
+        after = what_if.nearest_facility(lat, lng)
+        result['what_if'] = {
+            'added': [f['name'] for f in new_facilities],
+            'nearest': after,
+            'facilities': what_if.facility_distances(lat, lng)
+        }
+        before_min = (result['nearest'] or {}).get('travel_time_min')
+        after_min = (after or {}).get('travel_time_min')
+        if before_min is not None and after_min is not None:
+            result['what_if']['time_saved_min'] = round(before_min - after_min, 1)
+
+    return result
+
+
+def ward_origin(ward):
+    """
+    Ward centre (or the city centre) used when no coordinates are given.
+    """
+    center = AHMEDABAD_LOCATIONS['wards'].get(ward, {}).get('center')
+    if center:
+        return center['lat'], center['lng']
+    return settings.AHMEDABAD_CENTER_LAT, settings.AHMEDABAD_CENTER_LNG
+
+
+def facility_travel(kind, facilities, lat, lng):
+    """
+    Distance/time from (lat, lng) to each facility, keyed by name, and the
+    nearest facility. Entries carry 'method': 'network' for road travel, or
+    'haversine' for the straight-line fallback used when the road graph is
+    unavailable (no travel time, no nearest facility).
+    """
+    try:
+        index = get_accessibility_index(kind)
+        travel = {f['name']: dict(f, method='network') for f in index.facility_distances(lat, lng)}
+        nearest = index.nearest_facility(lat, lng)
+        return travel, nearest and dict(nearest, method='network')
+    except Exception as e:
+        print(f"Accessibility index unavailable, using straight-line distance: {e}")
+        return {
+            f['name']: {'name': f['name'], 'distance_km': round(get_distance(lat, lng, f['lat'], f['lng']), 2),
+                        'travel_time_min': None, 'method': 'haversine'}
+            for f in facilities if 'lat' in f
+        }, None
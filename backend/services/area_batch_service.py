@@ -0,0 +1,192 @@
+"""
+Area Batch Service - Area metrics for many map points with shared lookups.
+
+Points are reduced to their distinct wards (ward-level services) and distinct
+grid cells (AQI and traffic), each is computed once, and the per-point
+results are assembled from those shared results.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils.geocoding import reverse_geocode_batch
+from services.aqi_service import get_aqi_by_location
+from services.traffic_service import get_traffic_by_location
+from services.healthcare_service import get_healthcare_by_location
+from services.education_service import get_education_by_location
+from services.urban_dev_service import get_urban_dev_by_location
+
+# Grid cell (degrees, about 1 km) sharing one AQI/traffic lookup
+BATCH_CELL_DEG = 0.01
+
+MAX_BATCH_POINTS = 2000
+
+# Concurrent AQI/traffic cell lookups (the AQI lookup is a network call)
+CELL_WORKERS = 8
+
+
+def _cells(lats, lngs, cell_deg):
+    """
+    Distinct grid cells of the points: (cell index per point, cell centre lats, lngs).
+    """
+    keys = np.column_stack([np.floor(lats / cell_deg), np.floor(lngs / cell_deg)]).astype(np.int64)
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    return inverse.ravel(), (unique[:, 0] + 0.5) * cell_deg, (unique[:, 1] + 0.5) * cell_deg
+
+
+def _travel_batch(kind, lats, lngs):
+    """
+    Road travel from every point to every facility of a kind: (facility names,
+    km, minutes) with facilities x points arrays, or None if unavailable.
+    """
+    try:
+        from services.accessibility_service import get_accessibility_index
+        index = get_accessibility_index(kind)
+        km, minutes = index.travel_matrix(lats, lngs)
+    except Exception as e:
+        print(f"Accessibility index unavailable for {kind}: {e}")
+        return None
+    return [f['name'] for f in index.facilities], km, minutes
+
+
+def _nearest(travel, p):
+    """
+    Nearest facility of point p by travel time, or None.
+    """
+    if travel is None:
+        return None
+    names, km, minutes = travel
+    i = int(minutes[:, p].argmin())
+    if not np.isfinite(minutes[i, p]):
+        return None
+    return {
+        'name': names[i],
+        'distance_km': round(float(km[i, p]), 2),
+        'travel_time_min': round(float(minutes[i, p]), 1)
+    }
+
+
+def _facility_travel(travel, rows, names, p):
+    """
+    {name: distance/time} from point p to the named facilities (None where unknown).
+    """
+    result = {}
+    for name in names:
+        i = rows.get(name) if travel is not None else None
+        if i is None or not np.isfinite(travel[2][i, p]):
+            result[name] = {'distance_km': None, 'travel_time_min': None}
+        else:
+            result[name] = {
+                'distance_km': round(float(travel[1][i, p]), 2),
+                'travel_time_min': round(float(travel[2][i, p]), 1)
+            }
+    return result
+
+
+def get_area_metrics_batch(lats, lngs, cell_deg=BATCH_CELL_DEG, compact=False):
+    """
+    Area metrics for many points.
+
+    Args:
+        lats: Sequence of latitudes
+        lngs: Sequence of longitudes
+        cell_deg: Grid cell size (degrees) sharing AQI/traffic results
+        compact: Return shared ward/cell tables with per-point references instead of
+            repeating the shared results in every point; travel to the ward's facilities
+            is then in each point's facility_travel
+
+    Returns:
+        dict: Per-point metrics plus lookup counts
+    """
+    start = time.perf_counter()
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+
+    labels, localities = reverse_geocode_batch(lats, lngs)
+
+    # Ward-level services once per distinct (locality, ward), without travel:
+    # distances are measured per point below
+    ward_keys = {label: (info['locality'], info['ward']) for label, info in localities.items()}
+    wards = {}
+    for locality, ward in set(ward_keys.values()):
+        wards[f'{ward}|{locality}'] = {
+            'healthcare': get_healthcare_by_location(locality, ward, with_travel=False),
+            'education': get_education_by_location(locality, ward, with_travel=False),
+            'urban_development': get_urban_dev_by_location(locality, ward)
+        }
+
+    # AQI and traffic once per distinct grid cell, at the cell centre
+    cell_index, cell_lat, cell_lng = _cells(lats, lngs, cell_deg)
+    cell_labels, cell_localities = reverse_geocode_batch(cell_lat, cell_lng)
+
+    def cell_metrics(c):
+        locality = cell_localities[int(cell_labels[c])]['locality']
+        locality = None if locality == 'Unknown' else locality
+        return {
+            'latitude': round(float(cell_lat[c]), 5),
+            'longitude': round(float(cell_lng[c]), 5),
+            'aqi': get_aqi_by_location(float(cell_lat[c]), float(cell_lng[c]), locality),
+            'traffic': get_traffic_by_location(float(cell_lat[c]), float(cell_lng[c]), locality)
+        }
+
+    with ThreadPoolExecutor(max_workers=CELL_WORKERS) as pool:
+        cells = list(pool.map(cell_metrics, range(len(cell_lat))))
+
+    hospital_travel = _travel_batch('hospitals', lats, lngs)
+    school_travel = _travel_batch('schools', lats, lngs)
+    hospital_rows = {name: i for i, name in enumerate(hospital_travel[0])} if hospital_travel else {}
+    school_rows = {name: i for i, name in enumerate(school_travel[0])} if school_travel else {}
+
+    points = []
+    for p in range(len(lats)):
+        info = localities[int(labels[p])]
+        locality, ward = ward_keys[int(labels[p])]
+        ward_key = f'{ward}|{locality}'
+        shared = wards[ward_key]
+        nearest_hospital = _nearest(hospital_travel, p)
+        nearest_school = _nearest(school_travel, p)
+        hospitals = _facility_travel(hospital_travel, hospital_rows,
+                                     [f['name'] for f in shared['healthcare']['nearest_facilities']], p)
+        schools = _facility_travel(school_travel, school_rows,
+                                   [f['name'] for f in shared['education']['nearest_facilities']], p)
+        point = {
+            'latitude': float(lats[p]),
+            'longitude': float(lngs[p]),
+            'locality': info,
+            'nearest_hospital': nearest_hospital,
+            'nearest_school': nearest_school
+        }
+        if compact:
+            point['ward_key'] = ward_key
+            point['cell'] = int(cell_index[p])
+            point['facility_travel'] = {'hospitals': hospitals, 'schools': schools}
+        else:
+            cell = cells[cell_index[p]]
+            point['aqi'] = cell['aqi']
+            point['traffic'] = cell['traffic']
+            point['healthcare'] = dict(
+                shared['healthcare'],
+                nearest_hospital=nearest_hospital,
+                nearest_facilities=[dict(f, **hospitals[f['name']]) for f in shared['healthcare']['nearest_facilities']]
+            )
+            point['education'] = dict(
+                shared['education'],
+                nearest_school=nearest_school,
+                nearest_facilities=[dict(f, **schools[f['name']]) for f in shared['education']['nearest_facilities']]
+            )
+            point['urban_development'] = shared['urban_development']
+        points.append(point)
+
+    result = {
+        'count': len(points),
+        'unique_wards': len(wards),
+        'unique_cells': len(cells),
+        'service_calls': 3 * len(wards) + 2 * len(cells),
+        'points': points
+    }
+    if compact:
+        result['wards'] = wards
+        result['cells'] = cells
+    result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
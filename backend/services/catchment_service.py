@@ -0,0 +1,305 @@
+"""
+Catchment Service - Two-step floating catchment area (2SFCA) healthcare access index.
+
+Supply is hospital beds, demand is the population of each grid cell and the
+catchments are travel-time bands over the road network (or straight-line
+distance when the road graph is unavailable).
+"""
+import time
+from datetime import datetime
+
+import numpy as np
+
+from services.demand_service import DEFAULT_POPULATION_DENSITY
+from utils.geocoding import AHMEDABAD_LOCATIONS
+from utils.road_graph import EARTH_RADIUS_KM, _haversine_km
+
+# Travel-time bands (upper bound in minutes, weight) - enhanced 2SFCA step decay
+CATCHMENT_BANDS = [(10, 1.0), (20, 0.68), (30, 0.22)]
+
+# Speed used to turn straight-line km into minutes in haversine mode
+HAVERSINE_SPEED_KMH = 25
+
+DEFAULT_CELL_KM = 1.0
+DEFAULT_NEW_BEDS = 200
+
+# Largest load reduction reported for a single new hospital
+MAX_RELIEF = 0.5
+
+# Cells within this distance of a ward centre are reported under that ward
+WARD_RADIUS_KM = 3.0
+
+# Population density per sq km for the mapped wards (mock), DEFAULT_POPULATION_DENSITY elsewhere
+WARD_POPULATION_DENSITY = {
+    'Vastrapur': 11000,
+    'Maninagar': 15000,
+    'Bodakdev': 9500,
+    'Satellite': 12000,
+}
+
+
+def _city_bounds():
+    bounds = [zone['bounds'] for zone in AHMEDABAD_LOCATIONS['zones'].values()]
+    return (min(b['lat_min'] for b in bounds), max(b['lat_max'] for b in bounds),
+            min(b['lng_min'] for b in bounds), max(b['lng_max'] for b in bounds))
+
+
+def _band_weights(minutes):
+    """
+    Catchment weight per travel time; 0 outside the last band.
+    """
+    edges = np.array([b[0] for b in CATCHMENT_BANDS], dtype=float)
+    weights = np.append([b[1] for b in CATCHMENT_BANDS], 0.0)
+    return weights[np.searchsorted(edges, minutes, side='left')]
+
+
+class CatchmentGrid:
+    """
+    Regular grid over the city bounds with a population and ward per cell.
+    """
+
+    def __init__(self, cell_km=DEFAULT_CELL_KM):
+        lat_min, lat_max, lng_min, lng_max = _city_bounds()
+        self.cell_km = cell_km
+        d_lat = np.degrees(cell_km / EARTH_RADIUS_KM)
+        d_lng = d_lat / np.cos(np.radians((lat_min + lat_max) / 2))
+        self.rows = max(int(np.ceil((lat_max - lat_min) / d_lat)), 1)
+        self.cols = max(int(np.ceil((lng_max - lng_min) / d_lng)), 1)
+
+        r, c = np.divmod(np.arange(self.rows * self.cols), self.cols)
+        self.lat = lat_min + (r + 0.5) * d_lat
+        self.lng = lng_min + (c + 0.5) * d_lng
+
+        ward_names = list(AHMEDABAD_LOCATIONS['wards'].keys())
+        centers = AHMEDABAD_LOCATIONS['wards']
+        ward_lat = np.array([centers[w]['center']['lat'] for w in ward_names])
+        ward_lng = np.array([centers[w]['center']['lng'] for w in ward_names])
+        ward_km = _haversine_km(self.lat[None, :], self.lng[None, :], ward_lat[:, None], ward_lng[:, None])
+        nearest = ward_km.argmin(axis=0)
+        in_ward = ward_km[nearest, np.arange(self.size)] <= WARD_RADIUS_KM
+
+        self.ward_names = ward_names
+        self.ward = np.where(in_ward, nearest, -1)
+        density = np.array([WARD_POPULATION_DENSITY.get(w, DEFAULT_POPULATION_DENSITY) for w in ward_names] +
+                           [DEFAULT_POPULATION_DENSITY], dtype=float)
+        self.population = density[self.ward] * cell_km * cell_km
+
+    @property
+    def size(self):
+        return len(self.lat)
+
+
+class HealthcareCatchment:
+    """
+    2SFCA as two sparse products.
+
+    W is the facilities x cells catchment weight matrix. Step 1 gives each
+    facility's supply-to-demand ratio R = beds / (W @ population); step 2 sums
+    the ratios reaching each cell, A = W^T @ R (beds per person). A change in
+    beds only changes the supply vector, so a what-if is two mat-vecs; a new
+    facility adds one row to W.
+    """
+
+    def __init__(self, facilities, grid, mode='network'):
+        import scipy.sparse as sp
+
+        self.grid = grid
+        self.facilities = list(facilities)
+        self.mode = mode
+        self.index = None
+
+        if mode == 'network':
+            from services.accessibility_service import AccessibilityIndex
+            self.index = AccessibilityIndex(self.facilities)
+            minutes = self.index.travel_matrix(grid.lat, grid.lng)[1]
+        elif mode == 'haversine':
+            minutes = self._haversine_minutes(self.facilities)
+        else:
+            raise ValueError("mode must be 'network' or 'haversine'")
+
+        self.W = sp.csr_matrix(_band_weights(minutes))
+        self.beds = np.array([f['beds'] for f in self.facilities], dtype=float)
+
+    def _haversine_minutes(self, facilities):
+        lat = np.array([f['lat'] for f in facilities], dtype=float)
+        lng = np.array([f['lng'] for f in facilities], dtype=float)
+        km = _haversine_km(self.grid.lat[None, :], self.grid.lng[None, :], lat[:, None], lng[:, None])
+        return km / HAVERSINE_SPEED_KMH * 60.0
+
+    def with_facilities(self, facilities):
+        """
+        Copy with extra facilities (dicts with name, lat, lng, beds) appended to W.
+        """
+        import scipy.sparse as sp
+
+        clone = HealthcareCatchment.__new__(HealthcareCatchment)
+        clone.__dict__.update(self.__dict__)
+        if not facilities:
+            return clone
+
+        if self.index is not None:
+            clone.index = self.index.with_facilities(facilities)
+            minutes = clone.index.travel_matrix(self.grid.lat, self.grid.lng)[1][len(self.facilities):]
+        else:
+            minutes = self._haversine_minutes(facilities)
+
+        clone.facilities = self.facilities + list(facilities)
+        clone.W = sp.vstack([self.W, sp.csr_matrix(_band_weights(minutes))]).tocsr()
+        clone.beds = np.concatenate([self.beds, [f['beds'] for f in facilities]])
+        return clone
+
+    def compute(self, beds=None):
+        """
+        Returns (access per cell in beds per 1000 people, facility ratio, facility catchment population).
+        """
+        beds = self.beds if beds is None else beds
+        catchment_population = self.W @ self.grid.population
+        ratio = np.divide(beds, catchment_population, out=np.zeros_like(beds), where=catchment_population > 0)
+        access = self.W.T @ ratio * 1000.0
+        return access, ratio, catchment_population
+
+
+_catchments = {}
+
+
+def get_healthcare_catchment(mode='network', cell_km=DEFAULT_CELL_KM):
+    """
+    Shared HealthcareCatchment for the mock hospitals, built on first use.
+    Falls back to haversine catchments if the road graph cannot be built.
+    """
+    key = (mode, cell_km)
+    if key not in _catchments:
+        from services.accessibility_service import get_facilities
+        grid = CatchmentGrid(cell_km)
+        try:
+            _catchments[key] = HealthcareCatchment(get_facilities('hospitals'), grid, mode)
+        except Exception as e:
+            if mode != 'network':
+                raise
+            print(f"Road graph unavailable, using haversine catchments: {e}")
+            _catchments[key] = HealthcareCatchment(get_facilities('hospitals'), grid, 'haversine')
+    return _catchments[key]
+
+
+def _ward_access(grid, access):
+    """
+    Population-weighted access and population per ward.
+    """
+    inside = grid.ward >= 0
+    wards = grid.ward[inside]
+    population = np.bincount(wards, weights=grid.population[inside], minlength=len(grid.ward_names))
+    weighted = np.bincount(wards, weights=(access * grid.population)[inside], minlength=len(grid.ward_names))
+    mean = np.divide(weighted, population, out=np.zeros_like(weighted), where=population > 0)
+    return mean, population
+
+
+def get_healthcare_access(new_facilities=None, extra_beds=None, mode='network', cell_km=DEFAULT_CELL_KM,
+                          include_cells=True):
+    """
+    2SFCA healthcare access per ward and per grid cell, optionally with a what-if.
+
+    Args:
+        new_facilities: Optional list of {'name', 'lat', 'lng', 'beds'} hospitals to add
+        extra_beds: Optional {hospital name: beds to add} for existing hospitals
+        mode: 'network' (road travel time) or 'haversine' (straight-line distance)
+        cell_km: Grid cell size in km
+        include_cells: Include the per-cell table
+
+    Returns:
+        dict: Access (beds per 1000 people) per ward and cell, current and what-if
+    """
+    start = time.perf_counter()
+    catchment = get_healthcare_catchment(mode, cell_km)
+    grid = catchment.grid
+
+    access, ratio, catchment_population = catchment.compute()
+    ward_mean, ward_population = _ward_access(grid, access)
+
+    result = {
+        'mode': catchment.mode,
+        'bands_min': [b[0] for b in CATCHMENT_BANDS],
+        'grid': {'rows': grid.rows, 'cols': grid.cols, 'cell_km': grid.cell_km},
+        'city_access': round(float(np.average(access, weights=grid.population)), 4),
+        'facilities': [
+            {
+                'name': f['name'],
+                'beds': int(catchment.beds[i]),
+                'catchment_population': int(catchment_population[i]),
+                'beds_per_1000': round(float(ratio[i] * 1000.0), 4)
+            }
+            for i, f in enumerate(catchment.facilities)
+        ],
+        'wards': {
+            name: {'access': round(float(ward_mean[w]), 4), 'population': int(ward_population[w])}
+            for w, name in enumerate(grid.ward_names)
+        }
+    }
+
+    what_if = None
+    if new_facilities or extra_beds:
+        what_if = catchment.with_facilities(new_facilities or [])
+        beds = what_if.beds.copy()
+        names = [f['name'] for f in what_if.facilities]
+        for name, added in (extra_beds or {}).items():
+            if name in names:
+                beds[names.index(name)] += added
+        after, _, _ = what_if.compute(beds)
+        after_mean, _ = _ward_access(grid, after)
+        result['what_if'] = {
+            'added': [f['name'] for f in new_facilities or []],
+            'extra_beds': extra_beds or {},
+            'city_access': round(float(np.average(after, weights=grid.population)), 4),
+            'wards': {
+                name: {
+                    'access': round(float(after_mean[w]), 4),
+                    'change_percent': round(float((after_mean[w] / ward_mean[w] - 1) * 100), 2)
+                    if ward_mean[w] > 0 else None
+                }
+                for w, name in enumerate(grid.ward_names)
+            }
+        }
+
+    if include_cells:
+        cells = []
+        for c in np.flatnonzero(grid.population > 0):
+            cell = {
+                'cell': int(c),
+                'lat': round(float(grid.lat[c]), 5),
+                'lng': round(float(grid.lng[c]), 5),
+                'ward': grid.ward_names[grid.ward[c]] if grid.ward[c] >= 0 else None,
+                'access': round(float(access[c]), 4)
+            }
+            if what_if is not None:
+                cell['what_if_access'] = round(float(after[c]), 4)
+            cells.append(cell)
+        result['cells'] = cells
+
+    result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    result['last_updated'] = datetime.now().isoformat()
+    return result
+
+
+def hospital_impact(lat, lng, beds=DEFAULT_NEW_BEDS, ward=None):
+    """
+    Relative change in healthcare load (negative = relief) from a new hospital, as the
+    change in 2SFCA access of the ward (or the cells around the point).
+    """
+    catchment = get_healthcare_catchment()
+    grid = catchment.grid
+    before, _, _ = catchment.compute()
+    after, _, _ = catchment.with_facilities([{'name': 'Proposed hospital', 'lat': lat, 'lng': lng, 'beds': beds}]).compute()
+
+    if ward in grid.ward_names:
+        cells = grid.ward == grid.ward_names.index(ward)
+    else:
+        cells = _haversine_km(grid.lat, grid.lng, lat, lng) <= WARD_RADIUS_KM
+    weights = grid.population[cells]
+    if not weights.sum():
+        return 0.0
+    before_mean = np.average(before[cells], weights=weights)
+    after_mean = np.average(after[cells], weights=weights)
+    if after_mean <= 0:
+        return 0.0
+    # Load scales with demand per bed, i.e. inversely with access; a ward with no
+    # access before is capped at MAX_RELIEF
+    return float(max(before_mean / after_mean - 1, -MAX_RELIEF))
@@ -1,43 +1,47 @@
 """
 Education Service - Handles school infrastructure and capacity data.
 """
-import random
 from datetime import datetime
+from services.accessibility_service import ward_origin, facility_travel
 
 
 # Mock education data for Ahmedabad wards
 MOCK_EDUCATION_DATA = {
     'Vastrapur': {
         'schools': [
-            {'name': 'Ahmedabad International School', 'capacity': 800, 'enrollment': 750, 'type': 'private'},
-            {'name': 'Vastrapur Public School', 'capacity': 600, 'enrollment': 580, 'type': 'public'},
-            {'name': 'SG Highway Primary School', 'capacity': 400, 'enrollment': 420, 'type': 'public'},
+            {'name': 'Ahmedabad International School', 'lat': 23.0416, 'lng': 72.5186, 'capacity': 800, 'enrollment': 750, 'type': 'private'},
+            {'name': 'Vastrapur Public School', 'lat': 23.0378, 'lng': 72.5301, 'capacity': 600, 'enrollment': 580, 'type': 'public'},
+            {'name': 'SG Highway Primary School', 'lat': 23.0455, 'lng': 72.5089, 'capacity': 400, 'enrollment': 420, 'type': 'public'},
         ],
         'capacity_stress': 92
     },
     'Maninagar': {
         'schools': [
-            {'name': 'Maninagar High School', 'capacity': 500, 'enrollment': 480, 'type': 'public'},
-            {'name': 'Kankaria Secondary School', 'capacity': 450, 'enrollment': 470, 'type': 'public'},
+            {'name': 'Maninagar High School', 'lat': 22.9995, 'lng': 72.6045, 'capacity': 500, 'enrollment': 480, 'type': 'public'},
+            {'name': 'Kankaria Secondary School', 'lat': 23.0062, 'lng': 72.6001, 'capacity': 450, 'enrollment': 470, 'type': 'public'},
         ],
         'capacity_stress': 88
     },
     'default': {
         'schools': [
-            {'name': 'Local Public School', 'capacity': 400, 'enrollment': 380, 'type': 'public'},
+            {'name': 'Local Public School', 'lat': 23.0225, 'lng': 72.5714, 'capacity': 400, 'enrollment': 380, 'type': 'public'},
         ],
         'capacity_stress': 85
     }
 }
 
 
-def get_education_by_location(locality, ward):
+def get_education_by_location(locality, ward, lat=None, lng=None, with_travel=True):
     """
     Get education infrastructure data for a location.
     
     Args:
         locality: Locality name
         ward: Ward name
+        lat: Optional latitude for travel distances (defaults to the ward centre)
+        lng: Optional longitude
+        with_travel: Include road travel to the schools and the nearest school
+            (False for callers that measure travel themselves)
     
     Returns:
         dict: Education capacity and enrollment data
@@ -47,13 +51,45 @@ def get_education_by_location(locality, ward):
     total_capacity = sum(s['capacity'] for s in education_data['schools'])
     total_enrollment = sum(s['enrollment'] for s in education_data['schools'])
     enrollment_rate = total_enrollment / total_capacity if total_capacity > 0 else 0
+
+    # Capacity-constrained assignment of the ward's students to its schools
+    try:
+        from services.school_assignment_service import get_school_assignment
+        school_load = get_school_assignment(ward)['schools']
+    except Exception as e:
+        print(f"School assignment unavailable: {e}")
+        school_load = None
+
+    nearest_facilities = [
+        {
+            'name': school['name'],
+            'seats_available': max(school['capacity'] - school['enrollment'], 0)
+        }
+        for school in education_data['schools']
+    ]
     
-    return {
+    result = {
         'schools': education_data['schools'],
         'capacity_stress': education_data['capacity_stress'],
         'enrollment_rate': round(enrollment_rate, 2),
         'total_capacity': total_capacity,
         'total_enrollment': total_enrollment,
         'overcrowded_schools': [s for s in education_data['schools'] if s['enrollment'] > s['capacity']],
+        'nearest_facilities': nearest_facilities,
+        'school_load': school_load,
         'last_updated': datetime.now().isoformat()
     }
+    
+    if with_travel:
+        if lat is None or lng is None:
+            lat, lng = ward_origin(ward)
+        travel, result['nearest_school'] = facility_travel('schools', education_data['schools'], lat, lng)
+        for facility in nearest_facilities:
+            to_facility = travel.get(facility['name'], {})
+            facility.update(
+                distance_km=to_facility.get('distance_km'),
+                travel_time_min=to_facility.get('travel_time_min'),
+                method=to_facility.get('method')
+            )
+    
+    return result
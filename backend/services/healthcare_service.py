@@ -1,60 +1,62 @@
 """
 Healthcare Service - Handles healthcare capacity and facility data.
 """
-import random
 from datetime import datetime
+from services.accessibility_service import ward_origin, facility_travel
 
 
 # Mock healthcare data for Ahmedabad wards
 MOCK_HEALTHCARE_DATA = {
     'Vastrapur': {
         'hospitals': [
-            {'name': 'Apollo Hospital', 'beds': 350, 'utilization': 82, 'type': 'private'},
-            {'name': 'Civil Hospital Annex', 'beds': 200, 'utilization': 75, 'type': 'public'},
+            {'name': 'Apollo Hospital', 'lat': 23.0366, 'lng': 72.5283, 'beds': 350, 'utilization': 82, 'type': 'private'},
+            {'name': 'Civil Hospital Annex', 'lat': 23.0334, 'lng': 72.5247, 'beds': 200, 'utilization': 75, 'type': 'public'},
         ],
         'capacity_utilization': 78
     },
     'Maninagar': {
         'hospitals': [
-            {'name': 'Shalby Hospital', 'beds': 300, 'utilization': 88, 'type': 'private'},
-            {'name': 'Kankaria General Hospital', 'beds': 150, 'utilization': 92, 'type': 'public'},
+            {'name': 'Shalby Hospital', 'lat': 22.9962, 'lng': 72.6036, 'beds': 300, 'utilization': 88, 'type': 'private'},
+            {'name': 'Kankaria General Hospital', 'lat': 23.0058, 'lng': 72.6012, 'beds': 150, 'utilization': 92, 'type': 'public'},
         ],
         'capacity_utilization': 85
     },
     'default': {
         'hospitals': [
-            {'name': 'General Hospital', 'beds': 250, 'utilization': 80, 'type': 'public'},
+            {'name': 'General Hospital', 'lat': 23.0225, 'lng': 72.5714, 'beds': 250, 'utilization': 80, 'type': 'public'},
         ],
         'capacity_utilization': 80
     }
 }
 
 
-def get_healthcare_by_location(locality, ward):
+def get_healthcare_by_location(locality, ward, lat=None, lng=None, with_travel=True):
     """
     Get healthcare capacity data for a location.
     
     Args:
         locality: Locality name
         ward: Ward name
+        lat: Optional latitude for travel distances (defaults to the ward centre)
+        lng: Optional longitude
+        with_travel: Include road travel to the facilities and the nearest hospital
+            (False for callers that measure travel themselves)
     
     Returns:
         dict: Healthcare capacity and facility data
     """
     healthcare_data = MOCK_HEALTHCARE_DATA.get(ward, MOCK_HEALTHCARE_DATA['default'])
-    
-    # Add nearest facilities (simplified)
+
     nearest_facilities = [
         {
             'name': hospital['name'],
-            'distance_km': round(random.uniform(1.0, 8.0), 1),
             'beds_available': hospital['beds'] - int(hospital['beds'] * hospital['utilization'] / 100),
             'utilization_percent': hospital['utilization']
         }
         for hospital in healthcare_data['hospitals']
     ]
     
-    return {
+    result = {
         'hospitals': healthcare_data['hospitals'],
         'capacity_utilization': healthcare_data['capacity_utilization'],
         'nearest_facilities': nearest_facilities,
@@ -63,3 +65,19 @@ def get_healthcare_by_location(locality, ward):
                              for h in healthcare_data['hospitals']),
         'last_updated': datetime.now().isoformat()
     }
+    
+    if with_travel:
+        if lat is None or lng is None:
+            lat, lng = ward_origin(ward)
+        travel, result['nearest_hospital'] = facility_travel('hospitals', healthcare_data['hospitals'], lat, lng)
+        
+        # Road-network distance to the ward's facilities
+        for facility in nearest_facilities:
+            to_facility = travel.get(facility['name'], {})
+            facility.update(
+                distance_km=to_facility.get('distance_km'),
+                travel_time_min=to_facility.get('travel_time_min'),
+                method=to_facility.get('method')
+            )
+    
+    return result
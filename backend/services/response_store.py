@@ -0,0 +1,248 @@
+"""
+Response Store - Indexed SQLite storage for AI responses and proxied predictions.
+
+Records live in one table with indexes on (user_id, created_at) and
+(kind, created_at), so listing is an index range scan whose cost depends on
+the page size, not on the history. Payloads are stored as zlib-compressed
+JSON. Pages are cursor-based: the cursor encodes the (created_at, id) of the
+last row returned.
+"""
+import glob
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+from django.conf import settings
+
+from utils.sqlite_store import SQLiteStore, encode_cursor, decode_cursor, compress, decompress
+
+KIND_AI_RESPONSE = 'ai_response'
+KIND_PREDICTION = 'prediction'
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    scenario TEXT,
+    created_at TEXT NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_user_created ON responses (user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_responses_kind_created ON responses (kind, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_responses_created ON responses (created_at, id);
+"""
+
+
+class ResponseStore(SQLiteStore):
+    """
+    AI responses and predictions, newest first per user or kind.
+    """
+
+    schema = SCHEMA
+
+    def __init__(self, path=None, search_index=None):
+        super().__init__(path or settings.AI_RESPONSES_DB)
+        self.search_index = search_index
+
+    def put_many(self, records, replace=False):
+        """
+        Inserts records (dicts with id, kind, user_id, created_at and the payload)
+        in one transaction. Returns the number of rows written.
+        """
+        verb = 'INSERT OR REPLACE' if replace else 'INSERT OR IGNORE'
+        rows = [
+            (r['id'], r['kind'], r['user_id'], r.get('scenario'), r['created_at'], compress(r['payload']))
+            for r in records
+        ]
+        conn = self._connection()
+        with self._write_lock, conn:
+            cursor = conn.executemany(
+                f'{verb} INTO responses (id, kind, user_id, scenario, created_at, payload) VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+        if self.search_index is not None:
+            try:
+                self.search_index.index_responses(records)
+            except Exception as e:
+                print(f"Search indexing of {len(records)} responses failed: {e}")
+        return cursor.rowcount
+
+    def put(self, record_id, kind, user_id, payload, scenario=None, created_at=None, replace=True):
+        created_at = created_at or datetime.now().isoformat()
+        self.put_many([{
+            'id': record_id,
+            'kind': kind,
+            'user_id': user_id,
+            'scenario': scenario,
+            'created_at': created_at,
+            'payload': payload
+        }], replace=replace)
+        return record_id
+
+    def get(self, record_id):
+        row = self._connection().execute('SELECT payload FROM responses WHERE id = ?', (record_id,)).fetchone()
+        return decompress(row[0]) if row else None
+
+    def get_many(self, record_ids):
+        """
+        Payloads for several ids, in the given order (None for missing ids).
+        """
+        record_ids = list(record_ids)
+        if not record_ids:
+            return []
+        placeholders = ','.join('?' * len(record_ids))
+        rows = self._connection().execute(
+            f'SELECT id, payload FROM responses WHERE id IN ({placeholders})', record_ids
+        ).fetchall()
+        found = {record_id: decompress(blob) for record_id, blob in rows}
+        return [found.get(record_id) for record_id in record_ids]
+
+    def list(self, user_id=None, kind=None, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """
+        Newest-first page of payloads. Returns (payloads, next cursor or None).
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        clauses, params = [], []
+        if user_id:
+            clauses.append('user_id = ?')
+            params.append(user_id)
+        if kind:
+            clauses.append('kind = ?')
+            params.append(kind)
+        if cursor:
+            created_at, record_id = decode_cursor(cursor)
+            clauses.append('(created_at, id) < (?, ?)')
+            params += [created_at, record_id]
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self._connection().execute(
+            f'SELECT id, created_at, payload FROM responses {where} '
+            f'ORDER BY created_at DESC, id DESC LIMIT ?',
+            params + [limit + 1]
+        ).fetchall()
+
+        next_cursor = encode_cursor(rows[limit - 1][1], rows[limit - 1][0]) if len(rows) > limit else None
+        return [decompress(blob) for _, _, blob in rows[:limit]], next_cursor
+
+    def iter_records(self, batch_size=1000):
+        """
+        Every stored record (id, kind, user_id, scenario, created_at, payload), in id order.
+        """
+        last_id = ''
+        while True:
+            rows = self._connection().execute(
+                'SELECT id, kind, user_id, scenario, created_at, payload FROM responses WHERE id > ? '
+                'ORDER BY id LIMIT ?',
+                (last_id, batch_size)
+            ).fetchall()
+            for row in rows:
+                yield {
+                    'id': row[0],
+                    'kind': row[1],
+                    'user_id': row[2],
+                    'scenario': row[3],
+                    'created_at': row[4],
+                    'payload': decompress(row[5])
+                }
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+
+    def import_json_dir(self, directory):
+        """
+        One-time import of the JSON files of the old ai_responses_storage folder.
+        Existing ids are left untouched, so the import can be re-run.
+
+        Returns:
+            dict: Files imported, skipped (already present) and failed
+        """
+        records, failed = [], 0
+        for path in sorted(glob.glob(os.path.join(str(directory), '*.json'))):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                records.append(record_from_file(os.path.splitext(os.path.basename(path))[0], data))
+            except Exception as e:
+                print(f"Skipping {path}: {e}")
+                failed += 1
+
+        written = self.put_many(records) if records else 0
+        return {'imported': written, 'skipped': len(records) - written, 'failed': failed}
+
+
+def new_record_id(prefix):
+    """
+    Collision-free record id, e.g. predict_3f2b... (uuid4 hex).
+    """
+    return f"{prefix}_{uuid.uuid4().hex}"
+
+
+def record_from_file(stem, data):
+    """
+    Store record for one legacy JSON file: stored AI responses carry their own id,
+    proxied predictions are named predict_<timestamp>_<user>.json.
+    """
+    if 'id' in data and 'response' in data and 'scenario' in data:
+        return {
+            'id': data['id'],
+            'kind': KIND_AI_RESPONSE,
+            'user_id': str(data.get('user_id', 'anonymous')),
+            'scenario': data.get('scenario'),
+            'created_at': data.get('created_at') or datetime.now().isoformat(),
+            'payload': data
+        }
+    request = data.get('request') or {}
+    return {
+        'id': stem,
+        'kind': KIND_PREDICTION,
+        'user_id': str(data.get('user', 'anonymous')),
+        'scenario': request.get('scenario') if isinstance(request, dict) else None,
+        'created_at': data.get('timestamp') or datetime.now().isoformat(),
+        'payload': dict(data, id=stem)
+    }
+
+
+_store = None
+_store_lock = threading.RLock()
+
+
+def get_response_store():
+    """
+    Shared ResponseStore, indexed for search as it writes. A newly created database
+    imports the legacy JSON folder once.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            from services.search_service import get_search_index
+            _store = ResponseStore(search_index=get_search_index())
+            if _store.created and os.path.isdir(settings.AI_RESPONSES_DIR):
+                result = _store.import_json_dir(settings.AI_RESPONSES_DIR)
+                print(f"Imported legacy AI responses: {result}")
+    return _store
+
+
+_writer = None
+
+
+def get_prediction_writer():
+    """
+    Shared write-behind queue in front of the response store (settings
+    PREDICTION_QUEUE_SIZE and PREDICTION_QUEUE_POLICY).
+    """
+    global _writer
+    with _store_lock:
+        if _writer is None:
+            from services.write_behind import WriteBehindQueue
+            _writer = WriteBehindQueue(
+                get_response_store(),
+                max_size=settings.PREDICTION_QUEUE_SIZE,
+                policy=settings.PREDICTION_QUEUE_POLICY
+            )
+    return _writer
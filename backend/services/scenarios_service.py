@@ -1,14 +1,196 @@
 """
 Scenarios Service - Handles saving, retrieving, and comparing simulation scenarios.
-Uses in-memory storage (to be replaced with PostgreSQL later).
+Scenarios are stored in SQLite (settings.SCENARIOS_DB), shared by all worker processes.
 """
+import json
+import threading
 import uuid
 from datetime import datetime
 from typing import List, Dict, Optional
 
+import numpy as np
+from django.conf import settings
 
-# In-memory scenario storage (replace with PostgreSQL later)
-SCENARIOS_STORAGE: Dict[str, Dict] = {}
+from utils.sqlite_store import SQLiteStore, encode_cursor, decode_cursor, compress, decompress
+
+DEFAULT_LIST_LIMIT = 50
+MAX_LIST_LIMIT = 500
+
+MAX_COMPARE_SCENARIOS = 500
+
+# Compared impact metrics; -1 = lower is better (a decrease is an improvement)
+COMPARE_METRICS = ['traffic', 'aqi', 'healthcare', 'education', 'urban_development']
+METRIC_DIRECTIONS = {
+    'traffic': -1,
+    'aqi': -1,
+    'healthcare': -1,
+    'education': -1,
+    'urban_development': 1
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    action_type TEXT,
+    location TEXT,
+    tags TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    simulation_data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scenarios_created ON scenarios (created_at, id);
+CREATE TABLE IF NOT EXISTS scenario_tags (
+    tag TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    scenario_id TEXT NOT NULL,
+    PRIMARY KEY (tag, created_at, scenario_id)
+) WITHOUT ROWID;
+"""
+
+SCENARIO_COLUMNS = 'id, name, description, tags, created_at, updated_at, simulation_data'
+SUMMARY_COLUMNS = 's.id, s.name, s.description, s.created_at, s.tags, s.action_type, s.location'
+
+
+class ScenarioRepository(SQLiteStore):
+    """
+    Durable scenario storage.
+
+    scenario_tags is the tag -> scenario inverted index, clustered by
+    (tag, created_at, id), so a tag listing is one range scan already in
+    newest-first order; untagged listings use the created_at index. Listing
+    reads only the summary columns; the simulation data is a compressed blob
+    read by get / get_many.
+    """
+
+    schema = SCHEMA
+
+    def __init__(self, path=None, search_index=None):
+        super().__init__(path or settings.SCENARIOS_DB)
+        self.search_index = search_index
+
+    def add(self, scenario: Dict) -> None:
+        scenario_data = scenario['simulation_data'].get('scenario', {})
+        tags = list(dict.fromkeys(str(t) for t in scenario['tags']))
+        conn = self._connection()
+        with self._write_lock, conn:
+            conn.execute(
+                'INSERT INTO scenarios (id, name, description, action_type, location, tags, created_at, updated_at, '
+                'simulation_data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (scenario['id'], scenario['name'], scenario['description'], scenario_data.get('action_type'),
+                 scenario_data.get('location'), json.dumps(tags), scenario['created_at'], scenario['updated_at'],
+                 compress(scenario['simulation_data']))
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO scenario_tags (tag, created_at, scenario_id) VALUES (?, ?, ?)',
+                [(tag, scenario['created_at'], scenario['id']) for tag in tags]
+            )
+        if self.search_index is not None:
+            try:
+                self.search_index.index_scenarios([scenario])
+            except Exception as e:
+                print(f"Search indexing of scenario {scenario['id']} failed: {e}")
+
+    def list(self, tag: Optional[str] = None, limit: int = DEFAULT_LIST_LIMIT,
+             cursor: Optional[str] = None):
+        """
+        Newest-first page of scenario summaries. Returns (summaries, next cursor or None).
+        """
+        limit = max(1, min(int(limit), MAX_LIST_LIMIT))
+        after = decode_cursor(cursor) if cursor else None
+
+        if tag:
+            sql = (f'SELECT {SUMMARY_COLUMNS} FROM scenario_tags t JOIN scenarios s ON s.id = t.scenario_id '
+                   f'WHERE t.tag = ?')
+            params = [tag]
+            if after:
+                sql += ' AND (t.created_at, t.scenario_id) < (?, ?)'
+                params += after
+            sql += ' ORDER BY t.created_at DESC, t.scenario_id DESC LIMIT ?'
+        else:
+            sql = f'SELECT {SUMMARY_COLUMNS} FROM scenarios s'
+            params = []
+            if after:
+                sql += ' WHERE (s.created_at, s.id) < (?, ?)'
+                params += after
+            sql += ' ORDER BY s.created_at DESC, s.id DESC LIMIT ?'
+
+        rows = self._connection().execute(sql, params + [limit + 1]).fetchall()
+        next_cursor = encode_cursor(rows[limit - 1][3], rows[limit - 1][0]) if len(rows) > limit else None
+        return [
+            {
+                'id': row[0],
+                'name': row[1],
+                'description': row[2],
+                'created_at': row[3],
+                'tags': json.loads(row[4]),
+                'action_type': row[5],
+                'location': row[6]
+            }
+            for row in rows[:limit]
+        ], next_cursor
+
+    def get_many(self, scenario_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Full scenarios for several ids in one query, keyed by id (missing ids are absent).
+        """
+        scenario_ids = list(dict.fromkeys(scenario_ids))
+        if not scenario_ids:
+            return {}
+        placeholders = ','.join('?' * len(scenario_ids))
+        rows = self._connection().execute(
+            f'SELECT {SCENARIO_COLUMNS} FROM scenarios WHERE id IN ({placeholders})',
+            scenario_ids
+        ).fetchall()
+        return {row[0]: _scenario_from_row(row) for row in rows}
+
+    def get(self, scenario_id: str) -> Optional[Dict]:
+        return self.get_many([scenario_id]).get(scenario_id)
+
+    def iter_scenarios(self, batch_size: int = 500):
+        """
+        Every stored scenario, in id order.
+        """
+        last_id = ''
+        while True:
+            rows = self._connection().execute(
+                f'SELECT {SCENARIO_COLUMNS} FROM scenarios WHERE id > ? ORDER BY id LIMIT ?',
+                (last_id, batch_size)
+            ).fetchall()
+            for row in rows:
+                yield _scenario_from_row(row)
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1][0]
+
+
+def _scenario_from_row(row) -> Dict:
+    return {
+        'id': row[0],
+        'name': row[1],
+        'description': row[2],
+        'simulation_data': decompress(row[6]),
+        'tags': json.loads(row[3]),
+        'created_at': row[4],
+        'updated_at': row[5]
+    }
+
+
+_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_scenario_repository() -> ScenarioRepository:
+    """
+    Shared ScenarioRepository, indexed for search as it writes.
+    """
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            from services.search_service import get_search_index
+            _repository = ScenarioRepository(search_index=get_search_index())
+    return _repository
 
 
 def save_scenario(name: str, description: str, simulation_data: Dict, tags: List[str] = None) -> Dict:
@@ -36,7 +218,7 @@ def save_scenario(name: str, description: str, simulation_data: Dict, tags: List
         'updated_at': datetime.now().isoformat()
     }
     
-    SCENARIOS_STORAGE[scenario_id] = scenario
+    get_scenario_repository().add(scenario)
     
     return {
         'scenario_id': scenario_id,
@@ -46,46 +228,24 @@ def save_scenario(name: str, description: str, simulation_data: Dict, tags: List
     }
 
 
-def list_scenarios(tag: Optional[str] = None, limit: int = 50) -> Dict:
+def list_scenarios(tag: Optional[str] = None, limit: int = DEFAULT_LIST_LIMIT, cursor: Optional[str] = None) -> Dict:
     """
-    List all saved scenarios with optional filtering.
+    List saved scenarios, newest first, with optional filtering.
     
     Args:
         tag: Optional tag to filter by
         limit: Maximum number of scenarios to return
+        cursor: Optional next_cursor from the previous page
     
     Returns:
-        dict: List of scenarios with metadata
-    """
-    scenarios = list(SCENARIOS_STORAGE.values())
-    
-    # Filter by tag if provided
-    if tag:
-        scenarios = [s for s in scenarios if tag in s.get('tags', [])]
-    
-    # Sort by created_at (newest first)
-    scenarios.sort(key=lambda x: x['created_at'], reverse=True)
-    
-    # Limit results
-    scenarios = scenarios[:limit]
-    
-    # Prepare response (exclude full simulation_data)
-    scenarios_list = [
-        {
-            'id': s['id'],
-            'name': s['name'],
-            'description': s['description'],
-            'created_at': s['created_at'],
-            'tags': s['tags'],
-            'action_type': s['simulation_data'].get('scenario', {}).get('action_type'),
-            'location': s['simulation_data'].get('scenario', {}).get('location')
-        }
-        for s in scenarios
-    ]
+        dict: List of scenarios with metadata (without simulation_data)
+    """
+    scenarios_list, next_cursor = get_scenario_repository().list(tag=tag, limit=limit, cursor=cursor)
     
     return {
         'scenarios': scenarios_list,
-        'total': len(scenarios_list)
+        'total': len(scenarios_list),
+        'next_cursor': next_cursor
     }
 
 
@@ -99,76 +259,102 @@ def get_scenario(scenario_id: str) -> Optional[Dict]:
     Returns:
         dict: Full scenario data or None if not found
     """
-    return SCENARIOS_STORAGE.get(scenario_id)
+    return get_scenario_repository().get(scenario_id)
+
+
+def get_scenarios(scenario_ids: List[str]) -> List[Dict]:
+    """
+    Get several scenarios in one query, in the order given (missing ids skipped).
+    """
+    found = get_scenario_repository().get_many(scenario_ids)
+    return [found[sid] for sid in scenario_ids if sid in found]
 
 
-def compare_scenarios(scenario_ids: List[str]) -> Dict:
+def _impact_matrix(scenarios: List[Dict], field: str) -> np.ndarray:
+    """
+    Scenarios x COMPARE_METRICS matrix of one impact field (NaN where missing).
     """
-    Compare multiple scenarios side-by-side.
+    values = np.full((len(scenarios), len(COMPARE_METRICS)), np.nan)
+    for i, scenario in enumerate(scenarios):
+        impacts = scenario['simulation_data'].get('impacts', {})
+        for j, metric in enumerate(COMPARE_METRICS):
+            value = impacts.get(metric, {}).get(field)
+            if isinstance(value, (int, float)):
+                values[i, j] = value
+    return values
+
+
+def _column(values: np.ndarray, decimals: int = 4) -> List:
+    """
+    JSON-safe rounded list (NaN -> None).
+    """
+    rounded = np.round(values, decimals).astype(object)
+    rounded[np.isnan(values)] = None
+    return rounded.tolist()
+
+
+def compare_scenarios(scenario_ids: List[str], weights: Optional[Dict[str, float]] = None) -> Dict:
+    """
+    Compare multiple scenarios: raw values, pairwise differences, normalized
+    scores, Pareto front and weighted ranking.
+    
+    Impact metrics are packed into scenarios x metrics matrices. The benefit of a
+    scenario on a metric is its change_percent signed so that higher is better
+    (METRIC_DIRECTIONS); scores min-max normalize the benefit per metric to 0-1.
+    A scenario is Pareto-optimal when no other scenario is at least as good on
+    every metric and better on one.
     
     Args:
         scenario_ids: List of scenario IDs to compare
+        weights: Optional {metric: weight} for the ranking (default: equal weights).
+            Weights must be finite and non-negative; all zero means equal weights.
     
     Returns:
-        dict: Comparison data
+        dict: Columnar comparison data
+    
+    Raises:
+        ValueError: If a weight is negative, infinite or NaN
     """
-    scenarios = [get_scenario(sid) for sid in scenario_ids if get_scenario(sid)]
+    scenarios = get_scenarios(scenario_ids)
     
     if len(scenarios) < 2:
         return {'error': 'Not enough valid scenarios to compare'}
     
-    # Extract impact data from each scenario
-    comparisons = {}
+    current = _impact_matrix(scenarios, 'current')
+    projected = _impact_matrix(scenarios, 'projected')
+    change = _impact_matrix(scenarios, 'change_percent')
     
-    # Compare traffic impacts
-    traffic_data = []
-    aqi_data = []
-    healthcare_data = []
-    education_data = []
-    urban_dev_data = []
+    # Benefit: higher is better; missing values count as worst
+    direction = np.array([METRIC_DIRECTIONS[m] for m in COMPARE_METRICS], dtype=float)
+    benefit = np.where(np.isnan(change), -np.inf, change * direction)
     
-    for scenario in scenarios:
-        impacts = scenario['simulation_data'].get('impacts', {})
-        
-        traffic_data.append({
-            'scenario_id': scenario['id'],
-            'scenario_name': scenario['name'],
-            'current': impacts.get('traffic', {}).get('current'),
-            'projected': impacts.get('traffic', {}).get('projected'),
-            'change_percent': impacts.get('traffic', {}).get('change_percent')
-        })
-        
-        aqi_data.append({
-            'scenario_id': scenario['id'],
-            'scenario_name': scenario['name'],
-            'current': impacts.get('aqi', {}).get('current'),
-            'projected': impacts.get('aqi', {}).get('projected'),
-            'change_percent': impacts.get('aqi', {}).get('change_percent')
-        })
-        
-        healthcare_data.append({
-            'scenario_id': scenario['id'],
-            'scenario_name': scenario['name'],
-            'current': impacts.get('healthcare', {}).get('current'),
-            'projected': impacts.get('healthcare', {}).get('projected'),
-            'change_percent': impacts.get('healthcare', {}).get('change_percent')
-        })
-        
-        education_data.append({
-            'scenario_id': scenario['id'],
-            'scenario_name': scenario['name'],
-            'current': impacts.get('education', {}).get('current'),
-            'projected': impacts.get('education', {}).get('projected'),
-            'change_percent': impacts.get('education', {}).get('change_percent')
-        })
-        
-        urban_dev_data.append({
-            'scenario_id': scenario['id'],
-            'scenario_name': scenario['name'],
-            'current': impacts.get('urban_development', {}).get('current'),
-            'projected': impacts.get('urban_development', {}).get('projected'),
-            'change_percent': impacts.get('urban_development', {}).get('change_percent')
-        })
+    finite = np.isfinite(benefit)
+    low = np.where(finite, benefit, np.inf).min(axis=0)
+    high = np.where(finite, benefit, -np.inf).max(axis=0)
+    spread = high - low
+    with np.errstate(invalid='ignore', divide='ignore'):
+        scores = np.where(spread > 0, (benefit - low) / spread, 1.0)
+    scores = np.where(finite, scores, 0.0)
+    
+    # dominates[a, b]: a is at least as good as b everywhere and better somewhere
+    at_least = (benefit[:, None, :] >= benefit[None, :, :]).all(axis=2)
+    better = (benefit[:, None, :] > benefit[None, :, :]).any(axis=2)
+    dominates = at_least & better
+    dominated_by = dominates.sum(axis=0)
+    
+    w = np.array([float((weights or {}).get(m, 1.0)) for m in COMPARE_METRICS])
+    if not (np.isfinite(w).all() and (w >= 0).all()):
+        raise ValueError('weights must be finite and non-negative')
+    w = w / w.sum() if w.sum() > 0 else np.full(len(w), 1.0 / len(w))
+    weighted = scores @ w
+    order = np.argsort(-weighted, kind='stable')
+    rank = np.empty(len(order), dtype=int)
+    rank[order] = np.arange(1, len(order) + 1)
+    
+    # pairwise[m][a][b] = change_percent of a minus b on metric m
+    pairwise = change.T[:, :, None] - change.T[:, None, :]
+    ids = [s['id'] for s in scenarios]
+    names = [s['name'] for s in scenarios]
     
     return {
         'scenarios': [
@@ -180,12 +366,38 @@ def compare_scenarios(scenario_ids: List[str]) -> Dict:
             }
             for s in scenarios
         ],
+        'metrics': COMPARE_METRICS,
+        'columns': {
+            'scenario_id': ids,
+            'scenario_name': names,
+            'weighted_score': _column(weighted),
+            'rank': rank.tolist(),
+            'pareto_optimal': (dominated_by == 0).tolist(),
+            'dominated_by': dominated_by.tolist()
+        },
+        'values': {
+            'current': _column(current),
+            'projected': _column(projected),
+            'change_percent': _column(change)
+        },
+        'scores': _column(scores),
+        'pairwise_change_diff': {m: _column(pairwise[j]) for j, m in enumerate(COMPARE_METRICS)},
+        'weights': dict(zip(COMPARE_METRICS, np.round(w, 4).tolist())),
+        'ranking': [ids[i] for i in order],
+        'pareto_front': [ids[i] for i in np.flatnonzero(dominated_by == 0)],
+        # Side-by-side values per metric, as before
         'comparison': {
-            'traffic': traffic_data,
-            'aqi': aqi_data,
-            'healthcare': healthcare_data,
-            'education': education_data,
-            'urban_development': urban_dev_data
+            m: [
+                {
+                    'scenario_id': ids[i],
+                    'scenario_name': names[i],
+                    'current': _column(current[i, j:j + 1])[0],
+                    'projected': _column(projected[i, j:j + 1])[0],
+                    'change_percent': _column(change[i, j:j + 1])[0]
+                }
+                for i in range(len(scenarios))
+            ]
+            for j, m in enumerate(COMPARE_METRICS)
         },
         'compared_at': datetime.now().isoformat()
     }
@@ -0,0 +1,327 @@
+"""
+School Assignment Service - Capacity-constrained assignment of students to schools.
+
+Students per grid cell are assigned to schools by travel time under school
+capacity limits (a transportation problem). Students that do not fit go to an
+overflow column, charged to their nearest school as excess demand.
+"""
+import time
+from datetime import datetime
+
+import numpy as np
+
+from services.catchment_service import CatchmentGrid, WARD_RADIUS_KM, HAVERSINE_SPEED_KMH
+from utils.road_graph import _haversine_km
+
+# Students are not assigned to schools further than this (minutes)
+MAX_TRAVEL_MIN = 30
+
+# Cost of leaving a student unassigned; must exceed MAX_TRAVEL_MIN
+OVERFLOW_COST_MIN = 120
+
+DEFAULT_NEW_CAPACITY = 600
+MAX_CANCEL_ITERATIONS = 5000
+EPS = 1e-9
+
+
+def _negative_cycle(weight):
+    """
+    Bellman-Ford negative-cycle search on a small dense graph (inf = no edge).
+    Returns the cycle as a node list in edge order, or None.
+    """
+    n = len(weight)
+    dist = np.zeros(n)
+    pred = np.full(n, -1)
+    edges = [(u, v, weight[u, v]) for u in range(n) for v in range(n) if np.isfinite(weight[u, v])]
+
+    last = -1
+    for _ in range(n):
+        last = -1
+        for u, v, w in edges:
+            if dist[u] + w < dist[v] - EPS:
+                dist[v] = dist[u] + w
+                pred[v] = u
+                last = v
+        if last < 0:
+            return None
+
+    # Walk back n steps to land inside the cycle, then collect it
+    v = last
+    for _ in range(n):
+        v = pred[v]
+    cycle = [v]
+    u = pred[v]
+    while u != v:
+        cycle.append(u)
+        u = pred[u]
+    cycle.reverse()
+    return cycle
+
+
+class SchoolAssignment:
+    """
+    Min-cost transportation of students (cells) to schools under capacity.
+
+    Solved by negative-cycle cancelling on the school-contracted residual
+    graph: cell-to-school arcs are uncapacitated, so every residual move is
+    "shift students of one cell from school s to school t" and collapses to a
+    school x school graph whose arc s->t costs the cheapest such shift. A slack
+    node links schools with spare seats (t -> slack) back to every school
+    (slack -> s), and the overflow column has unlimited seats. Bellman-Ford
+    finds a negative cycle, the bottleneck flow is pushed round it, and the
+    solution is optimal once no negative cycle remains.
+
+    A greedy cheapest-first assignment seeds a cold solve; with_school keeps
+    the current flows and only cancels the cycles the new school opens up.
+    """
+
+    def __init__(self, schools, demand, cost, flow=None):
+        self.schools = list(schools)
+        self.demand = np.asarray(demand, dtype=float)
+        self.capacity = np.append([s['capacity'] for s in self.schools], np.inf).astype(float)
+        # Last column is overflow
+        self.cost = np.column_stack([np.where(cost <= MAX_TRAVEL_MIN, cost, np.inf),
+                                     np.full(len(self.demand), OVERFLOW_COST_MIN)])
+        self.iterations = 0
+        self.flow = self._greedy() if flow is None else flow
+        self.solve()
+
+    def _greedy(self):
+        flow = np.zeros_like(self.cost)
+        remaining = self.demand.copy()
+        spare = self.capacity.copy()
+        cells, columns = np.unravel_index(np.argsort(self.cost, axis=None, kind='stable'), self.cost.shape)
+        for c, s in zip(cells, columns):
+            if remaining[c] <= EPS or spare[s] <= EPS or not np.isfinite(self.cost[c, s]):
+                continue
+            amount = min(remaining[c], spare[s])
+            flow[c, s] += amount
+            remaining[c] -= amount
+            spare[s] -= amount
+        return flow
+
+    @property
+    def load(self):
+        return self.flow.sum(axis=0)
+
+    def _residual(self):
+        """
+        Contracted residual graph: schools + overflow, then the slack node.
+        Returns (weights, cell per shift arc, arc capacity).
+        """
+        n = self.cost.shape[1]
+        slack = n
+        weight = np.full((n + 1, n + 1), np.inf)
+        cell = np.full((n + 1, n + 1), -1)
+        arc_capacity = np.zeros((n + 1, n + 1))
+
+        for s in range(n):
+            rows = np.flatnonzero(self.flow[:, s] > EPS)
+            if not len(rows):
+                continue
+            shift = self.cost[rows] - self.cost[rows, s][:, None]
+            best = shift.argmin(axis=0)
+            weight[s, :n] = shift[best, np.arange(n)]
+            cell[s, :n] = rows[best]
+            arc_capacity[s, :n] = self.flow[rows[best], s]
+        np.fill_diagonal(weight, np.inf)
+
+        spare = self.capacity - self.load
+        has_room = spare > EPS
+        weight[:n, slack][has_room] = 0.0
+        arc_capacity[:n, slack] = spare
+        weight[slack, :n] = 0.0
+        arc_capacity[slack, :n] = np.inf
+        return weight, cell, arc_capacity
+
+    def solve(self, max_iter=MAX_CANCEL_ITERATIONS):
+        """
+        Cancels negative cycles until none remain. Returns the number of cancels.
+        """
+        cancels = 0
+        while cancels < max_iter:
+            weight, cell, arc_capacity = self._residual()
+            cycle = _negative_cycle(weight)
+            if cycle is None:
+                break
+            arcs = list(zip(cycle, cycle[1:] + cycle[:1]))
+            amount = min(arc_capacity[u, v] for u, v in arcs)
+            if not np.isfinite(amount) or amount <= EPS:
+                break
+            n = self.cost.shape[1]
+            for u, v in arcs:
+                if u < n and v < n:
+                    c = cell[u, v]
+                    self.flow[c, u] -= amount
+                    self.flow[c, v] += amount
+            cancels += 1
+        self.iterations += cancels
+        return cancels
+
+    def with_school(self, school, cost_column):
+        """
+        Copy with one more school (capacity, travel-time column), re-solved from the current flows.
+        """
+        clone = SchoolAssignment.__new__(SchoolAssignment)
+        clone.schools = self.schools + [school]
+        clone.demand = self.demand
+        clone.capacity = np.concatenate([self.capacity[:-1], [school['capacity']], [np.inf]]).astype(float)
+        column = np.where(np.asarray(cost_column) <= MAX_TRAVEL_MIN, cost_column, np.inf)
+        clone.cost = np.column_stack([self.cost[:, :-1], column, self.cost[:, -1]])
+        clone.flow = np.column_stack([self.flow[:, :-1], np.zeros(len(self.demand)), self.flow[:, -1]])
+        clone.iterations = 0
+        clone.solve()
+        return clone
+
+    def total_cost(self):
+        used = self.flow > EPS
+        return float((self.flow[used] * self.cost[used]).sum())
+
+    def summary(self):
+        """
+        Per-school assigned students, utilisation and excess demand (overflow charged to the
+        overflowing cells' nearest school).
+        """
+        schools_cost = self.cost[:, :-1]
+        load = self.load
+        overflow = self.flow[:, -1]
+        excess = np.zeros(len(self.schools))
+        reachable = np.isfinite(schools_cost).any(axis=1) & (overflow > EPS)
+        if reachable.any():
+            np.add.at(excess, schools_cost[reachable].argmin(axis=1), overflow[reachable])
+
+        result = []
+        for i, school in enumerate(self.schools):
+            assigned = load[i]
+            pressure = (assigned + excess[i]) / school['capacity'] * 100 if school['capacity'] else 0.0
+            travel = self.cost[:, i]
+            served = self.flow[:, i] > EPS
+            result.append({
+                'name': school['name'],
+                'capacity': int(school['capacity']),
+                'assigned_students': int(round(assigned)),
+                'utilization_percent': round(float(assigned / school['capacity'] * 100), 1) if school['capacity'] else 0.0,
+                'excess_demand': int(round(excess[i])),
+                'demand_pressure_percent': round(float(pressure), 1),
+                'overcrowded': bool(pressure > 100 + EPS),
+                'mean_travel_min': round(float(np.average(travel[served], weights=self.flow[served, i])), 1)
+                if served.any() else None
+            })
+        return result
+
+
+def _ward_cells(grid, ward):
+    if ward in grid.ward_names and (grid.ward == grid.ward_names.index(ward)).any():
+        return np.flatnonzero(grid.ward == grid.ward_names.index(ward))
+    from services.accessibility_service import ward_origin
+    lat, lng = ward_origin(ward)
+    return np.flatnonzero(_haversine_km(grid.lat, grid.lng, lat, lng) <= WARD_RADIUS_KM)
+
+
+def _travel_minutes(schools, lat, lng):
+    """
+    Cells x schools travel time over the road network, haversine if unavailable.
+    """
+    try:
+        from services.accessibility_service import get_accessibility_index
+        index = get_accessibility_index('schools')
+        names = [f['name'] for f in index.facilities]
+        missing = [s for s in schools if s['name'] not in names]
+        if missing:
+            index = index.with_facilities(missing)
+            names += [s['name'] for s in missing]
+        minutes = index.travel_matrix(lat, lng)[1]
+        return minutes[[names.index(s['name']) for s in schools]].T
+    except Exception as e:
+        print(f"Road graph unavailable, using straight-line travel times: {e}")
+        school_lat = np.array([s['lat'] for s in schools], dtype=float)
+        school_lng = np.array([s['lng'] for s in schools], dtype=float)
+        km = _haversine_km(np.asarray(lat)[:, None], np.asarray(lng)[:, None], school_lat[None, :], school_lng[None, :])
+        return km / HAVERSINE_SPEED_KMH * 60.0
+
+
+_assignments = {}
+_grid = None
+
+
+def get_ward_assignment(ward):
+    """
+    Solved assignment for one ward: its schools and students (the ward's
+    enrollment spread over its cells by population). Cached per ward.
+    """
+    global _grid
+    from services.education_service import MOCK_EDUCATION_DATA
+
+    if ward not in _assignments:
+        if _grid is None:
+            _grid = CatchmentGrid()
+        schools = MOCK_EDUCATION_DATA.get(ward, MOCK_EDUCATION_DATA['default'])['schools']
+        cells = _ward_cells(_grid, ward)
+        population = _grid.population[cells]
+        enrollment = sum(s['enrollment'] for s in schools)
+        demand = enrollment * population / population.sum() if population.sum() else np.zeros(len(cells))
+        cost = _travel_minutes(schools, _grid.lat[cells], _grid.lng[cells])
+        assignment = SchoolAssignment(schools, demand, cost)
+        assignment.cells = cells
+        _assignments[ward] = assignment
+    return _assignments[ward]
+
+
+def get_school_assignment(ward, new_schools=None):
+    """
+    Student assignment and per-school load for a ward, optionally with new schools.
+
+    Args:
+        ward: Ward name
+        new_schools: Optional list of {'name', 'lat', 'lng', 'capacity'} schools to add
+
+    Returns:
+        dict: Per-school utilisation and overcrowding, current and what-if
+    """
+    start = time.perf_counter()
+    base = get_ward_assignment(ward)
+    result = {
+        'ward': ward,
+        'students': int(round(base.demand.sum())),
+        'unassigned_students': int(round(base.flow[:, -1].sum())),
+        'mean_travel_min': round(float(base.total_cost() / base.demand.sum()), 2) if base.demand.sum() else 0.0,
+        'schools': base.summary()
+    }
+
+    if new_schools:
+        assignment = base
+        cancels = 0
+        for school in new_schools:
+            column = _travel_minutes([school], _grid.lat[base.cells], _grid.lng[base.cells])[:, 0]
+            assignment = assignment.with_school(school, column)
+            cancels += assignment.iterations
+        result['what_if'] = {
+            'added': [s['name'] for s in new_schools],
+            'unassigned_students': int(round(assignment.flow[:, -1].sum())),
+            'mean_travel_min': round(float(assignment.total_cost() / assignment.demand.sum()), 2)
+            if assignment.demand.sum() else 0.0,
+            'schools': assignment.summary(),
+            'cycles_cancelled': cancels
+        }
+
+    result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    result['last_updated'] = datetime.now().isoformat()
+    return result
+
+
+def school_impact(ward, lat, lng, capacity=DEFAULT_NEW_CAPACITY):
+    """
+    Relative change in the ward's capacity stress (mean demand pressure across its
+    existing schools) when a school is added at (lat, lng).
+    """
+    base = get_ward_assignment(ward)
+    school = {'name': 'Proposed school', 'lat': lat, 'lng': lng, 'capacity': capacity}
+    column = _travel_minutes([school], _grid.lat[base.cells], _grid.lng[base.cells])[:, 0]
+    after = base.with_school(school, column)
+
+    existing = len(base.schools)
+    before_pressure = np.mean([s['demand_pressure_percent'] for s in base.summary()])
+    after_pressure = np.mean([s['demand_pressure_percent'] for s in after.summary()[:existing]])
+    if before_pressure <= 0:
+        return 0.0
+    return float(after_pressure / before_pressure - 1)
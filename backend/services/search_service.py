@@ -0,0 +1,399 @@
+"""
+Search Service - Full-text search over saved scenarios, AI responses and predictions.
+
+Documents live in an SQLite FTS5 index (settings.SEARCH_DB) next to a plain
+table of filter columns (source, user, action type, date). The scenario
+repository and the response store index their records as they write them,
+so search results never lag behind the stores. Queries are ranked with BM25.
+"""
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+from utils.sqlite_store import SQLiteStore
+
+SOURCE_SCENARIO = 'scenario'
+SOURCE_AI_RESPONSE = 'ai_response'
+SOURCE_PREDICTION = 'prediction'
+SOURCES = (SOURCE_SCENARIO, SOURCE_AI_RESPONSE, SOURCE_PREDICTION)
+
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Matches ranked per query (the most recently indexed), bounding query cost for common words
+MAX_RANKED_MATCHES = 2000
+
+# Documents per indexing transaction
+INDEX_BATCH_SIZE = 1000
+
+# Indexed text per document is capped (LLM responses can be long)
+MAX_TEXT_CHARS = 20000
+
+# Column weights for bm25(), in FTS column order
+COLUMN_WEIGHTS = (4.0, 2.0, 3.0, 1.0, 1.0, 3.0, 0.5)
+
+# Words dropped from free-text queries ("all metro scenarios near Maninagar")
+STOPWORDS = {
+    'a', 'an', 'and', 'all', 'any', 'around', 'at', 'by', 'for', 'from', 'in', 'near', 'of',
+    'on', 'or', 'show', 'the', 'to', 'with'
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_docs (
+    rowid INTEGER PRIMARY KEY,
+    doc_id TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    user_id TEXT,
+    action_type TEXT,
+    locality TEXT,
+    title TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_search_docs_source ON search_docs (source, created_at);
+CREATE INDEX IF NOT EXISTS idx_search_docs_user ON search_docs (user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_search_docs_action ON search_docs (action_type, created_at);
+CREATE INDEX IF NOT EXISTS idx_search_docs_created ON search_docs (created_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+    title, description, tags, body, reasoning, locality, kind,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+
+def _text(value, limit: int = MAX_TEXT_CHARS) -> str:
+    """
+    All strings in a nested dict/list joined into one text, capped at limit characters.
+    """
+    parts, size, stack = [], 0, [value]
+    while stack and size < limit:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            size += len(item) + 1
+        elif isinstance(item, dict):
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, (list, tuple)):
+            stack.extend(reversed(item))
+    return ' '.join(parts)[:limit]
+
+
+def _place(lat, lng) -> Dict:
+    """
+    Zone, ward and locality of a coordinate from the spatial index ({} if unknown).
+    """
+    try:
+        from utils.geo_index import get_geo_index
+        index = get_geo_index()
+        place = index.describe(int(index.lookup(float(lat), float(lng))))
+    except (TypeError, ValueError):
+        return {}
+    except Exception as e:
+        print(f"Locality lookup unavailable for search index: {e}")
+        return {}
+    return place if place['locality'] != 'Unknown' else {}
+
+
+def scenario_document(scenario: Dict) -> Dict:
+    """
+    Search document for a saved scenario (as stored by the scenario repository).
+    Scenarios have no owner, so a user filter only matches responses.
+    """
+    simulation = scenario.get('simulation_data') or {}
+    details = simulation.get('scenario') or {}
+    places = [details.get('location'), details.get('ward'), details.get('zone')]
+    return {
+        'doc_id': scenario['id'],
+        'source': SOURCE_SCENARIO,
+        'user_id': None,
+        'action_type': details.get('action_type'),
+        'locality': details.get('location'),
+        'created_at': scenario['created_at'],
+        'title': scenario.get('name') or '',
+        'description': scenario.get('description') or '',
+        'tags': ' '.join(str(t) for t in scenario.get('tags') or []),
+        'body': _text([details.get('description'), simulation.get('query')]),
+        'reasoning': _text([simulation.get('summary'), simulation.get('explanation')]),
+        'place': ' '.join(str(p) for p in places if p),
+        'kind': 'scenario simulation'
+    }
+
+
+def response_document(record: Dict) -> Dict:
+    """
+    Search document for a response store record (AI response or proxied prediction).
+    """
+    from utils.helpers import parse_what_if_query
+
+    payload = record['payload']
+    request = payload.get('request') if isinstance(payload.get('request'), dict) else {}
+    scenario = record.get('scenario') or payload.get('scenario') or request.get('scenario') or ''
+    if not isinstance(scenario, str):
+        scenario = _text(scenario)
+
+    location = payload.get('location') if isinstance(payload.get('location'), dict) else {}
+    lat = location.get('lat', request.get('lat'))
+    lng = location.get('lng', location.get('lon', request.get('lon', request.get('lng'))))
+    place = _place(lat, lng) if lat is not None and lng is not None else {}
+
+    is_prediction = record['kind'] == SOURCE_PREDICTION
+    return {
+        'doc_id': record['id'],
+        'source': SOURCE_PREDICTION if is_prediction else SOURCE_AI_RESPONSE,
+        'user_id': record.get('user_id'),
+        'action_type': parse_what_if_query(scenario)['action_type'] if scenario else None,
+        'locality': place.get('locality'),
+        'created_at': record['created_at'],
+        'title': scenario,
+        'description': '',
+        'tags': '',
+        'body': _text(request) if is_prediction else '',
+        'reasoning': _text(payload.get('response')),
+        'place': ' '.join(place[k] for k in ('locality', 'ward', 'zone') if k in place),
+        'kind': 'prediction' if is_prediction else 'ai response'
+    }
+
+
+def match_expression(query: str, match_all: bool = True) -> str:
+    """
+    FTS5 MATCH expression for a free-text query: words are quoted (so FTS
+    syntax in user input is inert), stopwords dropped and the rest joined
+    with AND (every word must match) or OR (any word, ranked by BM25).
+    Raises ValueError when no searchable word is left.
+    """
+    words = [w for w in re.findall(r'\w+', query.lower()) if w not in STOPWORDS]
+    if not words:
+        raise ValueError('Query has no searchable words')
+    return (' AND ' if match_all else ' OR ').join(f'"{w}"' for w in dict.fromkeys(words))
+
+
+def _date_bound(value: Optional[str], end: bool) -> Optional[str]:
+    """
+    ISO bound for created_at comparisons; a bare date as upper bound covers the whole day.
+    Raises ValueError for a malformed date.
+    """
+    if not value:
+        return None
+    datetime.fromisoformat(value)
+    if end and len(value) == 10:
+        return value + 'T23:59:59.999999'
+    return value
+
+
+class SearchIndex(SQLiteStore):
+    """
+    FTS5 inverted index of scenarios and stored responses.
+
+    search_docs holds the filter columns keyed by the FTS rowid; re-indexing
+    a document id replaces its FTS row, so indexing is idempotent and
+    repeated writes of the same record are harmless.
+    """
+
+    schema = SCHEMA
+
+    def __init__(self, path=None):
+        super().__init__(path or settings.SEARCH_DB)
+
+    def index_documents(self, documents: Iterable[Dict]) -> int:
+        """
+        Adds or replaces documents, INDEX_BATCH_SIZE per transaction. Returns the number indexed.
+        """
+        conn = self._connection()
+        count = 0
+        batch = []
+        for document in documents:
+            batch.append(document)
+            if len(batch) >= INDEX_BATCH_SIZE:
+                count += self._write(conn, batch)
+                batch = []
+        if batch:
+            count += self._write(conn, batch)
+        return count
+
+    def _write(self, conn, documents: List[Dict]) -> int:
+        with self._write_lock, conn:
+            for d in documents:
+                rowid = conn.execute(
+                    'INSERT INTO search_docs (doc_id, source, user_id, action_type, locality, title, created_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (doc_id) DO UPDATE SET source = excluded.source, '
+                    'user_id = excluded.user_id, action_type = excluded.action_type, locality = excluded.locality, '
+                    'title = excluded.title, created_at = excluded.created_at RETURNING rowid',
+                    (d['doc_id'], d['source'], d['user_id'], d['action_type'], d['locality'], d['title'],
+                     d['created_at'])
+                ).fetchone()[0]
+                conn.execute('DELETE FROM search_fts WHERE rowid = ?', (rowid,))
+                conn.execute(
+                    'INSERT INTO search_fts (rowid, title, description, tags, body, reasoning, locality, kind) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (rowid, d['title'], d['description'], d['tags'], d['body'], d['reasoning'], d['place'],
+                     d['kind'])
+                )
+        return len(documents)
+
+    def index_scenarios(self, scenarios: Iterable[Dict]) -> int:
+        return self.index_documents(scenario_document(s) for s in scenarios)
+
+    def index_responses(self, records: Iterable[Dict]) -> int:
+        return self.index_documents(response_document(r) for r in records)
+
+    def clear(self) -> None:
+        conn = self._connection()
+        with self._write_lock, conn:
+            conn.execute('DELETE FROM search_fts')
+            conn.execute('DELETE FROM search_docs')
+
+    def search(self, query: str, user_id: Optional[str] = None, source: Optional[str] = None,
+               action_type: Optional[str] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None, match_all: bool = True,
+               limit: int = DEFAULT_SEARCH_LIMIT, offset: int = 0):
+        """
+        Best-first page of matching documents. Returns (results, whether more results
+        exist, whether ranking was truncated to the MAX_RANKED_MATCHES newest matches).
+        Raises ValueError for an empty query or malformed filter.
+        """
+        limit = max(1, min(int(limit), MAX_SEARCH_LIMIT))
+        offset = max(0, int(offset))
+        if source and source not in SOURCES:
+            raise ValueError(f"source must be one of: {', '.join(SOURCES)}")
+
+        filters, filter_params = [], []
+        for column, value in (('user_id', user_id), ('source', source), ('action_type', action_type)):
+            if value:
+                filters.append(f'd.{column} = ?')
+                filter_params.append(value)
+        start, end = _date_bound(date_from, end=False), _date_bound(date_to, end=True)
+        if start:
+            filters.append('d.created_at >= ?')
+            filter_params.append(start)
+        if end:
+            filters.append('d.created_at <= ?')
+            filter_params.append(end)
+
+        conn = self._connection()
+        clauses = ['search_fts MATCH ?'] + filters
+        params = [match_expression(query, match_all)] + filter_params
+
+        # BM25 costs one scoring pass per matching row, so at most MAX_RANKED_MATCHES
+        # rows are ranked. The filters narrow first: when they leave no more documents
+        # than that (counted on the search_docs indexes) every match is ranked; otherwise
+        # only the most recently indexed matches are, and the result is truncated.
+        # CROSS JOIN keeps the FTS match as the outer loop (filters are checked per match).
+        truncated = False
+        narrow = bool(filters) and conn.execute(
+            f"SELECT count(*) FROM (SELECT 1 FROM search_docs d WHERE {' AND '.join(filters)} LIMIT ?)",
+            filter_params + [MAX_RANKED_MATCHES + 1]
+        ).fetchone()[0] <= MAX_RANKED_MATCHES
+        if not narrow:
+            floor = conn.execute(
+                f"SELECT search_fts.rowid FROM search_fts CROSS JOIN search_docs d ON d.rowid = search_fts.rowid "
+                f"WHERE {' AND '.join(clauses)} ORDER BY search_fts.rowid DESC LIMIT 1 OFFSET ?",
+                params + [MAX_RANKED_MATCHES]
+            ).fetchone()
+            if floor:
+                truncated = True
+                clauses.append('search_fts.rowid > ?')
+                params.append(floor[0])
+
+        weights = ', '.join(str(w) for w in COLUMN_WEIGHTS)
+        rows = conn.execute(
+            f"SELECT d.doc_id, d.source, d.title, d.user_id, d.action_type, d.locality, d.created_at, "
+            f"snippet(search_fts, -1, '<b>', '</b>', '...', 16), bm25(search_fts, {weights}) AS score "
+            f"FROM search_fts CROSS JOIN search_docs d ON d.rowid = search_fts.rowid "
+            f"WHERE {' AND '.join(clauses)} ORDER BY score LIMIT ? OFFSET ?",
+            params + [limit + 1, offset]
+        ).fetchall()
+
+        return [
+            {
+                'id': row[0],
+                'source': row[1],
+                'title': row[2],
+                'user_id': row[3],
+                'action_type': row[4],
+                'locality': row[5],
+                'created_at': row[6],
+                'snippet': row[7],
+                'score': round(-row[8], 4)
+            }
+            for row in rows[:limit]
+        ], len(rows) > limit, truncated
+
+
+def rebuild_search_index(index: Optional[SearchIndex] = None) -> Dict:
+    """
+    Re-indexes every stored scenario and response from scratch.
+
+    Returns:
+        dict: Documents indexed per source
+    """
+    from services.response_store import ResponseStore
+    from services.scenarios_service import ScenarioRepository
+
+    index = index or get_search_index()
+    index.clear()
+    result = {'scenarios': 0, 'responses': 0}
+    if os.path.exists(settings.SCENARIOS_DB):
+        result['scenarios'] = index.index_scenarios(ScenarioRepository().iter_scenarios())
+    if os.path.exists(settings.AI_RESPONSES_DB):
+        result['responses'] = index.index_responses(ResponseStore().iter_records())
+    return result
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """
+    Shared SearchIndex. A newly created index is filled from the existing stores once.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex()
+            if _index.created:
+                result = rebuild_search_index(_index)
+                print(f"Built search index: {result}")
+    return _index
+
+
+def search(query: str, user_id: Optional[str] = None, source: Optional[str] = None,
+           action_type: Optional[str] = None, date_from: Optional[str] = None,
+           date_to: Optional[str] = None, match_all: bool = True,
+           limit: int = DEFAULT_SEARCH_LIMIT, offset: int = 0) -> Dict:
+    """
+    Ranked full-text search over scenarios, AI responses and predictions.
+
+    Args:
+        query: Free-text query, e.g. "metro Maninagar"
+        user_id: Only documents of this user
+        source: 'scenario', 'ai_response' or 'prediction'
+        action_type: Only this action type (bridge, road, hospital, school, ...)
+        date_from: ISO date/datetime lower bound on created_at
+        date_to: ISO date/datetime upper bound on created_at (a date includes the whole day)
+        match_all: Require every query word (False: any word)
+        limit: Page size
+        offset: Results to skip
+
+    Returns:
+        dict: Ranked results with snippets, the next offset (None on the last page)
+        and truncated, True when the query matched more than MAX_RANKED_MATCHES
+        documents after filtering and only the most recently indexed were ranked
+    """
+    start = time.perf_counter()
+    results, more, truncated = get_search_index().search(
+        query, user_id=user_id, source=source, action_type=action_type, date_from=date_from,
+        date_to=date_to, match_all=match_all, limit=limit, offset=offset
+    )
+    return {
+        'query': query,
+        'results': results,
+        'total': len(results),
+        'next_offset': max(0, int(offset)) + len(results) if more else None,
+        'truncated': truncated,
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 2)
+    }
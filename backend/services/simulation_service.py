@@ -8,6 +8,9 @@ from utils.helpers import parse_what_if_query, generate_trend_data
 from services.aqi_service import get_current_aqi
 from services.traffic_service import MOCK_TRAFFIC_DATA
 from services.forecast_service import get_area_forecast
+from services.accessibility_service import ward_origin
+from services.catchment_service import hospital_impact
+from services.school_assignment_service import school_impact
 
 
 # Impact multipliers for different action types
@@ -50,6 +53,28 @@ ACTION_IMPACTS = {
 }
 
 
+def _action_impacts(action_type, ward):
+    """
+    Impact multipliers for an action. Hospitals and schools replace the flat
+    multiplier with a modelled ward change: the 2SFCA healthcare access, or the
+    capacity stress from re-solving the ward's school assignment.
+    """
+    impacts = ACTION_IMPACTS.get(action_type, ACTION_IMPACTS['infrastructure'])
+    if action_type == 'hospital':
+        try:
+            lat, lng = ward_origin(ward)
+            impacts = dict(impacts, healthcare=round(hospital_impact(lat, lng, ward=ward), 3))
+        except Exception as e:
+            print(f"2SFCA impact unavailable, using default multiplier: {e}")
+    elif action_type == 'school':
+        try:
+            lat, lng = ward_origin(ward)
+            impacts = dict(impacts, education=round(school_impact(ward, lat, lng), 3))
+        except Exception as e:
+            print(f"School assignment impact unavailable, using default multiplier: {e}")
+    return impacts
+
+
 def run_what_if_simulation(query, timeline='6months'):
     """
     Run a what-if simulation based on natural language query.
@@ -83,7 +108,7 @@ def run_what_if_simulation(query, timeline='6months'):
     base_urban_dev = 70
     
     # Get impact multipliers
-    impacts = ACTION_IMPACTS.get(action_type, ACTION_IMPACTS['infrastructure'])
+    impacts = _action_impacts(action_type, ward)
     
     # Calculate projected impacts
     months_map = {'1month': 1, '3months': 3, '6months': 6}
@@ -149,7 +174,7 @@ def run_what_if_simulation(query, timeline='6months'):
     }
 
 
-def explain_simulation(action_type, location, simulation_id=None):
+def explain_simulation(action_type, location, simulation_id=None, ward=None):
     """
     Provide detailed explanation of simulation methodology and results.
     
@@ -157,11 +182,14 @@ def explain_simulation(action_type, location, simulation_id=None):
         action_type: Type of action (bridge, road, hospital, etc.)
         location: Location name
         simulation_id: Optional simulation ID
+        ward: Optional ward (default: derived from the location)
     
     Returns:
         dict: Detailed explanation
     """
-    impacts = ACTION_IMPACTS.get(action_type, ACTION_IMPACTS['infrastructure'])
+    if ward is None:
+        ward = parse_what_if_query(location or '')['ward']
+    impacts = _action_impacts(action_type, ward)
     
     explanations = {
         'bridge': 'Building a new bridge reduces traffic congestion by providing alternative routes, improves air quality through reduced idling, and stimulates urban development.',
@@ -192,6 +220,7 @@ def explain_simulation(action_type, location, simulation_id=None):
         'methodology': methodology,
         'assumptions': assumptions,
         'confidence_score': round(random.uniform(0.75, 0.90), 2),
+        'impacts': impacts,
         'action_type': action_type,
         'location': location,
         'simulation_id': simulation_id,
@@ -0,0 +1,115 @@
+"""
+Write-behind queue - persists records on a background thread with group commit.
+"""
+import atexit
+import queue
+import threading
+import time
+
+POLICY_BLOCK = 'block'
+POLICY_DROP = 'drop'
+
+DEFAULT_MAX_SIZE = 10000
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL_S = 0.05
+DEFAULT_BLOCK_TIMEOUT_S = 1.0
+
+
+class WriteBehindQueue:
+    """
+    Bounded queue drained by one writer thread.
+
+    The writer waits for a record, then gathers whatever else arrives within
+    flush_interval_s (up to batch_size) and writes the batch with one
+    store.put_many call, i.e. one transaction. When the queue is full the
+    policy decides: 'block' waits up to block_timeout_s for room (backpressure)
+    and then writes the record synchronously so nothing is lost; 'drop'
+    discards the record and counts it.
+    """
+
+    def __init__(self, store, max_size=DEFAULT_MAX_SIZE, policy=POLICY_BLOCK, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval_s=DEFAULT_FLUSH_INTERVAL_S, block_timeout_s=DEFAULT_BLOCK_TIMEOUT_S):
+        if policy not in (POLICY_BLOCK, POLICY_DROP):
+            raise ValueError("policy must be 'block' or 'drop'")
+        self.store = store
+        self.policy = policy
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.block_timeout_s = block_timeout_s
+        self._queue = queue.Queue(maxsize=max_size)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'enqueued': 0,
+            'written': 0,
+            'dropped': 0,
+            'sync_writes': 0,
+            'batches': 0,
+            'failed': 0,
+            'last_batch_ms': None,
+            'last_error': None
+        }
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _count(self, key, n=1):
+        with self._stats_lock:
+            self._stats[key] += n
+
+    def put(self, record):
+        """
+        Enqueues a record. Returns True once it is queued (or written), False if dropped.
+        """
+        try:
+            if self.policy == POLICY_BLOCK:
+                self._queue.put(record, timeout=self.block_timeout_s)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            if self.policy == POLICY_DROP:
+                self._count('dropped')
+                return False
+            self._write([record])
+            self._count('sync_writes')
+            return True
+        self._count('enqueued')
+        return True
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval_s
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch):
+        start = time.perf_counter()
+        try:
+            self.store.put_many(batch)
+        except Exception as e:
+            print(f"Write-behind batch of {len(batch)} failed: {e}")
+            with self._stats_lock:
+                self._stats['failed'] += len(batch)
+                self._stats['last_error'] = str(e)
+            return
+        with self._stats_lock:
+            self._stats['written'] += len(batch)
+            self._stats['batches'] += 1
+            self._stats['last_batch_ms'] = round((time.perf_counter() - start) * 1000, 2)
+
+    def flush(self):
+        """
+        Blocks until every queued record has been written.
+        """
+        self._queue.join()
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats, queued=self._queue.qsize(), policy=self.policy)
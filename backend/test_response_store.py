@@ -0,0 +1,83 @@
+"""
+Checks the SQLite response store: cursor pages cover every record exactly
+once (unfiltered, per user and per kind), and get_many ordering.
+
+Run from backend/: python test_response_store.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+django.setup()
+
+from services.response_store import ResponseStore, KIND_AI_RESPONSE, KIND_PREDICTION
+
+N_RECORDS = 57
+
+
+def _pages(list_page, limit, **kwargs):
+    items, cursor, pages = [], None, 0
+    while True:
+        page, cursor = list_page(limit=limit, cursor=cursor, **kwargs)
+        items += page
+        pages += 1
+        if cursor is None:
+            return items, pages
+
+
+class TestResponseStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.store = ResponseStore(os.path.join(self.tmp, 'responses.sqlite3'))
+        self.store.put_many([
+            {
+                'id': f'resp_{i:03d}',
+                'kind': KIND_PREDICTION if i % 3 == 0 else KIND_AI_RESPONSE,
+                'user_id': f'user_{i % 2}',
+                'created_at': f'2026-01-01T00:00:{i // 4:02d}',
+                'payload': {'id': f'resp_{i:03d}', 'n': i}
+            }
+            for i in range(N_RECORDS)
+        ])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_pages_have_no_duplicates_or_gaps(self):
+        for limit in (1, 6, N_RECORDS, N_RECORDS + 1):
+            items, _ = _pages(self.store.list, limit)
+            ids = [p['id'] for p in items]
+            self.assertEqual(sorted(ids), [f'resp_{i:03d}' for i in range(N_RECORDS)])
+
+        for kwargs, expected in (
+            ({'user_id': 'user_1'}, [i for i in range(N_RECORDS) if i % 2 == 1]),
+            ({'kind': KIND_PREDICTION}, [i for i in range(N_RECORDS) if i % 3 == 0]),
+            ({'user_id': 'user_0', 'kind': KIND_AI_RESPONSE}, [i for i in range(N_RECORDS) if i % 2 == 0 and i % 3]),
+        ):
+            items, _ = _pages(self.store.list, 4, **kwargs)
+            ns = [p['n'] for p in items]
+            self.assertEqual(len(ns), len(set(ns)))
+            self.assertEqual(sorted(ns), expected)
+            # Newest first, ties broken by id descending
+            self.assertEqual(ns, sorted(ns, key=lambda n: (n // 4, n), reverse=True))
+        print(f"Response pages cover all {N_RECORDS} records once")
+
+    def test_get_many_order(self):
+        payloads = self.store.get_many(['resp_020', 'missing', 'resp_003', 'resp_020'])
+        self.assertEqual([p and p['n'] for p in payloads], [20, None, 3, 20])
+        self.assertEqual(self.store.get_many([]), [])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self.store.list(cursor='not-a-cursor')
+
+
+if __name__ == '__main__':
+    unittest.main()
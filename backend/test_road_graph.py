@@ -0,0 +1,78 @@
+"""
+Checks that the road graph keeps only drivable ways (OSMnx drive filter) and
+applies the OSMnx oneway rules, on a small synthetic Overpass cache.
+
+Run from backend/: python test_road_graph.py
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+django.setup()
+
+from utils.road_graph import RoadGraph, is_drivable
+
+# One way per tag set, each over its own pair of nodes
+WAYS = {
+    'residential': {'highway': 'residential'},
+    'oneway': {'highway': 'primary', 'oneway': 'yes'},
+    'reversed': {'highway': 'secondary', 'oneway': '-1'},
+    'roundabout': {'highway': 'tertiary', 'junction': 'roundabout'},
+    'footway': {'highway': 'footway'},
+    'steps': {'highway': 'steps'},
+    'cycleway': {'highway': 'cycleway'},
+    'service': {'highway': 'service'},
+    'construction': {'highway': 'construction'},
+    'private': {'highway': 'residential', 'access': 'private'},
+    'no_cars': {'highway': 'residential', 'motor_vehicle': 'no'},
+    'area': {'highway': 'pedestrian', 'area': 'yes'},
+}
+DRIVABLE = {'residential', 'oneway', 'reversed', 'roundabout'}
+
+
+class TestRoadGraph(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        elements, cls.ends = [], {}
+        for i, (name, tags) in enumerate(WAYS.items()):
+            a, b = 2 * i + 1, 2 * i + 2
+            lat = 23.0 + 0.01 * i
+            elements += [
+                {'type': 'node', 'id': a, 'lat': lat, 'lon': 72.5},
+                {'type': 'node', 'id': b, 'lat': lat, 'lon': 72.501},
+                {'type': 'way', 'id': 100 + i, 'nodes': [a, b], 'tags': tags},
+            ]
+            cls.ends[name] = ([lat, lat], [72.5, 72.501])
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with open(os.path.join(cache_dir, 'roads.json'), 'w') as f:
+                json.dump({'elements': elements}, f)
+            cls.graph = RoadGraph(cache_dir)
+
+    def _edge(self, name, forward=True):
+        (a, b), _ = self.graph.nearest_node(*self.ends[name])
+        u, v = (a, b) if forward else (b, a)
+        return self.graph.distance[u, v] > 0
+
+    def test_drive_filter(self):
+        self.assertEqual({name for name, tags in WAYS.items() if is_drivable(tags)}, DRIVABLE)
+        self.assertEqual(self.graph.size, 2 * len(DRIVABLE))
+        print(f"Road graph: {self.graph.size} nodes from {len(DRIVABLE)} of {len(WAYS)} ways")
+
+    def test_oneway_rules(self):
+        self.assertTrue(self._edge('residential') and self._edge('residential', forward=False))
+        self.assertTrue(self._edge('oneway') and not self._edge('oneway', forward=False))
+        self.assertTrue(not self._edge('reversed') and self._edge('reversed', forward=False))
+        self.assertTrue(self._edge('roundabout') and not self._edge('roundabout', forward=False))
+        self.assertEqual(self.graph.distance.nnz, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
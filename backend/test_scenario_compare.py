@@ -0,0 +1,90 @@
+"""
+Checks that scenario comparison rejects non-finite and negative ranking
+weights: the compare view answers 400 and compare_scenarios raises.
+
+Run from backend/: python test_scenario_compare.py
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+django.setup()
+
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+import services.scenarios_service as scenarios_service
+from apps.scenarios.views import compare
+
+INVALID_WEIGHTS = [
+    {'traffic': 'inf'},
+    {'traffic': '-inf'},
+    {'traffic': 'nan'},
+    {'aqi': -1},
+]
+
+
+def _scenario(i, traffic, aqi):
+    return {
+        'id': f'scenario_{i}',
+        'name': f'Scenario {i}',
+        'description': '',
+        'created_at': '2026-01-01T00:00:00',
+        'simulation_data': {'impacts': {
+            'traffic': {'current': 100, 'projected': 100 + traffic, 'change_percent': traffic},
+            'aqi': {'current': 100, 'projected': 100 + aqi, 'change_percent': aqi},
+        }},
+    }
+
+
+SCENARIOS = [_scenario(0, -10, 5), _scenario(1, 5, -10)]
+
+
+class TestScenarioCompareWeights(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(scenarios_service, 'get_scenarios', return_value=SCENARIOS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _post(self, weights):
+        request = APIRequestFactory().post(
+            '/api/scenarios/compare/',
+            {'scenario_ids': [s['id'] for s in SCENARIOS], 'weights': weights},
+            format='json',
+            HTTP_X_USER_ROLE='government',
+        )
+        user = mock.Mock(spec=AnonymousUser, is_authenticated=True)
+        force_authenticate(request, user=user)
+        return compare(request)
+
+    def test_view_rejects_invalid_weights(self):
+        for weights in INVALID_WEIGHTS:
+            response = self._post(weights)
+            self.assertEqual(response.status_code, 400, weights)
+            self.assertIn('error', response.data)
+
+    def test_view_accepts_valid_weights(self):
+        for weights in ({'traffic': 2}, {'traffic': '0.5', 'aqi': 0}, None):
+            response = self._post(weights)
+            self.assertEqual(response.status_code, 200, weights)
+        # All weight on traffic ranks the traffic-reducing scenario first
+        response = self._post({'traffic': 1, 'aqi': 0, 'healthcare': 0, 'education': 0, 'urban_development': 0})
+        self.assertEqual(response.data['ranking'][0], 'scenario_0')
+
+    def test_service_rejects_invalid_weights(self):
+        for weights in INVALID_WEIGHTS:
+            with self.assertRaises(ValueError):
+                scenarios_service.compare_scenarios(
+                    [s['id'] for s in SCENARIOS],
+                    {k: float(v) for k, v in weights.items()},
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Checks the SQLite scenario repository: cursor pages cover every scenario
+exactly once, tag listings, and get_many / get_scenarios ordering.
+
+Run from backend/: python test_scenario_repository.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+django.setup()
+
+import services.scenarios_service as scenarios_service
+from services.scenarios_service import ScenarioRepository
+
+N_RECORDS = 57
+
+
+def _scenario(i):
+    # Every third pair shares a timestamp, so pages must break ties on id
+    created_at = f'2026-01-01T00:00:{i // 3:02d}'
+    return {
+        'id': f'scenario_{i:03d}',
+        'name': f'Scenario {i}',
+        'description': f'Test scenario {i}',
+        'simulation_data': {'scenario': {'action_type': 'metro', 'location': 'Maninagar'}, 'n': i},
+        'tags': ['even' if i % 2 == 0 else 'odd', 'all'],
+        'created_at': created_at,
+        'updated_at': created_at
+    }
+
+
+def _pages(list_page, limit, **kwargs):
+    items, cursor, pages = [], None, 0
+    while True:
+        page, cursor = list_page(limit=limit, cursor=cursor, **kwargs)
+        items += page
+        pages += 1
+        if cursor is None:
+            return items, pages
+
+
+class TestScenarioRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.repo = ScenarioRepository(os.path.join(self.tmp, 'scenarios.sqlite3'))
+        for i in range(N_RECORDS):
+            self.repo.add(_scenario(i))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_pages_have_no_duplicates_or_gaps(self):
+        for limit in (1, 5, 10, N_RECORDS, N_RECORDS + 10):
+            items, pages = _pages(self.repo.list, limit)
+            ids = [s['id'] for s in items]
+            self.assertEqual(len(ids), N_RECORDS)
+            self.assertEqual(len(set(ids)), N_RECORDS)
+            self.assertEqual(pages, max(1, -(-N_RECORDS // limit)))
+            # Newest first, ties broken by id descending
+            expected = sorted(ids, key=lambda sid: (_scenario(int(sid[-3:]))['created_at'], sid), reverse=True)
+            self.assertEqual(ids, expected)
+        print(f"Scenario pages cover all {N_RECORDS} scenarios once")
+
+    def test_tag_listing(self):
+        even, _ = _pages(self.repo.list, 4, tag='even')
+        odd, _ = _pages(self.repo.list, 4, tag='odd')
+        self.assertEqual({s['id'] for s in even}, {f'scenario_{i:03d}' for i in range(0, N_RECORDS, 2)})
+        self.assertEqual({s['id'] for s in odd}, {f'scenario_{i:03d}' for i in range(1, N_RECORDS, 2)})
+        self.assertEqual(len(even), len({s['id'] for s in even}))
+        self.assertEqual(len(_pages(self.repo.list, 7, tag='all')[0]), N_RECORDS)
+        self.assertEqual(self.repo.list(tag='missing'), ([], None))
+        self.assertEqual(even[0]['tags'], ['even', 'all'])
+        print(f"Tag listing: {len(even)} even, {len(odd)} odd")
+
+    def test_get_many_order(self):
+        ids = ['scenario_010', 'missing', 'scenario_002', 'scenario_010', 'scenario_050']
+        found = self.repo.get_many(ids)
+        self.assertEqual(set(found), {'scenario_010', 'scenario_002', 'scenario_050'})
+        self.assertEqual(found['scenario_002']['simulation_data']['n'], 2)
+
+        previous = scenarios_service._repository
+        scenarios_service._repository = self.repo
+        try:
+            ordered = scenarios_service.get_scenarios(ids)
+        finally:
+            scenarios_service._repository = previous
+        self.assertEqual([s['id'] for s in ordered], ['scenario_010', 'scenario_002', 'scenario_010', 'scenario_050'])
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            self.repo.list(cursor='not-a-cursor')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Checks the negative-cycle cancelling school assignment against scipy's linprog
+on random instances, and that with_school (warm start) reaches the same optimum
+as a cold solve.
+
+Run from backend/: python test_school_assignment.py
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+django.setup()
+
+import numpy as np
+from scipy.optimize import linprog
+
+from services.school_assignment_service import SchoolAssignment, MAX_TRAVEL_MIN, OVERFLOW_COST_MIN
+
+INSTANCES = 25
+
+
+def random_instance(rng, n_cells, n_schools):
+    demand = rng.uniform(0, 200, n_cells)
+    cost = rng.uniform(2, MAX_TRAVEL_MIN * 1.3, (n_cells, n_schools))
+    schools = [{'name': f'School {i}', 'capacity': float(rng.uniform(50, 600))} for i in range(n_schools)]
+    return schools, demand, cost
+
+
+def linprog_cost(schools, demand, cost):
+    """
+    Optimal cost of the same transportation problem (schools + unlimited overflow) by LP.
+    """
+    n_cells, n_schools = cost.shape
+    full = np.column_stack([np.where(cost <= MAX_TRAVEL_MIN, cost, np.inf), np.full(n_cells, OVERFLOW_COST_MIN)])
+    arcs = [(c, s) for c in range(n_cells) for s in range(n_schools + 1) if np.isfinite(full[c, s])]
+    c_vec = np.array([full[c, s] for c, s in arcs])
+
+    a_eq = np.zeros((n_cells, len(arcs)))
+    a_ub = np.zeros((n_schools, len(arcs)))
+    for k, (c, s) in enumerate(arcs):
+        a_eq[c, k] = 1
+        if s < n_schools:
+            a_ub[s, k] = 1
+    result = linprog(c_vec, A_ub=a_ub, b_ub=[s['capacity'] for s in schools], A_eq=a_eq, b_eq=demand,
+                     bounds=(0, None), method='highs')
+    assert result.status == 0, result.message
+    return result.fun
+
+
+class TestSchoolAssignment(unittest.TestCase):
+
+    def assertFeasible(self, assignment):
+        flow = assignment.flow
+        self.assertTrue((flow >= -1e-6).all())
+        np.testing.assert_allclose(flow.sum(axis=1), assignment.demand, atol=1e-6)
+        self.assertTrue((flow[:, :-1].sum(axis=0) <= assignment.capacity[:-1] + 1e-6).all())
+        self.assertTrue((flow[~np.isfinite(assignment.cost)] <= 1e-9).all())
+
+    def test_matches_linprog(self):
+        rng = np.random.default_rng(42)
+        for i in range(INSTANCES):
+            schools, demand, cost = random_instance(rng, rng.integers(5, 40), rng.integers(2, 8))
+            assignment = SchoolAssignment(schools, demand, cost)
+            expected = linprog_cost(schools, demand, cost)
+            print(f"Instance {i}: cycle cancelling {assignment.total_cost():.3f}, linprog {expected:.3f}")
+            self.assertFeasible(assignment)
+            self.assertAlmostEqual(assignment.total_cost(), expected, delta=1e-6 * max(1.0, expected))
+
+    def test_with_school_matches_cold_solve(self):
+        rng = np.random.default_rng(7)
+        for _ in range(INSTANCES):
+            schools, demand, cost = random_instance(rng, rng.integers(5, 40), rng.integers(2, 8))
+            new_school = {'name': 'New school', 'capacity': float(rng.uniform(50, 600))}
+            column = rng.uniform(2, MAX_TRAVEL_MIN * 1.3, len(demand))
+
+            warm = SchoolAssignment(schools, demand, cost).with_school(new_school, column)
+            cold = SchoolAssignment(schools + [new_school], demand, np.column_stack([cost, column]))
+            self.assertFeasible(warm)
+            self.assertAlmostEqual(warm.total_cost(), cold.total_cost(), delta=1e-6 * max(1.0, cold.total_cost()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Checks that hospital and school simulations (run and explain) use the modelled ward impacts
+instead of the flat ACTION_IMPACTS multipliers.
+
+Run from backend/: python test_simulation_impacts.py
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django
+django.setup()
+
+import services.simulation_service as simulation_service
+from services.simulation_service import ACTION_IMPACTS, explain_simulation, run_what_if_simulation
+
+
+class TestSimulationImpacts(unittest.TestCase):
+
+    def test_explain_hospital_uses_2sfca(self):
+        result = explain_simulation('hospital', 'Vastrapur')
+        healthcare = result['impacts']['healthcare']
+        print(f"Hospital healthcare impact: {healthcare}")
+        self.assertNotEqual(healthcare, ACTION_IMPACTS['hospital']['healthcare'])
+        self.assertLess(healthcare, 0)
+
+    def test_explain_hospital_with_ward(self):
+        result = explain_simulation('hospital', 'Maninagar', ward='Maninagar')
+        self.assertNotEqual(result['impacts']['healthcare'], ACTION_IMPACTS['hospital']['healthcare'])
+
+    def test_explain_school_uses_assignment(self):
+        result = explain_simulation('school', 'Vastrapur')
+        education = result['impacts']['education']
+        print(f"School education impact: {education}")
+        self.assertNotEqual(education, ACTION_IMPACTS['school']['education'])
+
+    def test_run_and_explain_agree(self):
+        for action, query in (('hospital', 'What if a new hospital is built in Vastrapur?'),
+                              ('school', 'What if a new school is built in Vastrapur?')):
+            run_change = run_what_if_simulation(query)['impacts']
+            explained = explain_simulation(action, 'Vastrapur')['impacts']
+            metric = 'healthcare' if action == 'hospital' else 'education'
+            self.assertAlmostEqual(run_change[metric]['change_percent'], round(explained[metric] * 100, 1))
+
+    def test_hospital_falls_back_when_model_fails(self):
+        for error in (ImportError('No module named scipy'), RuntimeError('solver failed')):
+            with mock.patch.object(simulation_service, 'hospital_impact', side_effect=error):
+                self.assertEqual(explain_simulation('hospital', 'Vastrapur')['impacts'], ACTION_IMPACTS['hospital'])
+                run_change = run_what_if_simulation('What if a new hospital is built in Vastrapur?')['impacts']
+            self.assertAlmostEqual(run_change['healthcare']['change_percent'],
+                                   round(ACTION_IMPACTS['hospital']['healthcare'] * 100, 1))
+
+    def test_school_falls_back_when_solver_fails(self):
+        for error in (ImportError('No module named scipy'), RuntimeError('solver failed')):
+            with mock.patch.object(simulation_service, 'school_impact', side_effect=error):
+                self.assertEqual(explain_simulation('school', 'Vastrapur')['impacts'], ACTION_IMPACTS['school'])
+                run_change = run_what_if_simulation('What if a new school is built in Vastrapur?')['impacts']
+            self.assertAlmostEqual(run_change['education']['change_percent'],
+                                   round(ACTION_IMPACTS['school']['education'] * 100, 1))
+
+    def test_explain_other_actions_unchanged(self):
+        result = explain_simulation('bridge', 'SG Highway')
+        self.assertEqual(result['impacts'], ACTION_IMPACTS['bridge'])
+
+
+if __name__ == '__main__':
+    unittest.main()
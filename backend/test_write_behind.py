@@ -0,0 +1,97 @@
+"""
+Checks the write-behind queue accounting when the store falls behind: the
+'drop' policy counts what it discards, the 'block' policy writes overflow
+synchronously and loses nothing.
+
+Run from backend/: python test_write_behind.py
+"""
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.write_behind import WriteBehindQueue, POLICY_BLOCK, POLICY_DROP
+
+QUEUE_SIZE = 3
+TIMEOUT_S = 5
+
+
+class GatedStore:
+    """
+    Store whose writer-thread batches wait until the gate opens; other
+    threads (synchronous overflow writes) go straight through.
+    """
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+        self.records = []
+        self._lock = threading.Lock()
+
+    def put_many(self, records):
+        if threading.current_thread().name == 'write-behind':
+            self.entered.set()
+            self.gate.wait(TIMEOUT_S)
+        with self._lock:
+            self.records.extend(records)
+        return len(records)
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+
+    def _stalled_queue(self, policy):
+        store = GatedStore()
+        writer = WriteBehindQueue(store, max_size=QUEUE_SIZE, policy=policy, batch_size=1,
+                                  flush_interval_s=0, block_timeout_s=0.01)
+        # First record is taken by the writer thread, which then stalls in the store
+        self.assertTrue(writer.put({'n': 0}))
+        self.assertTrue(store.entered.wait(TIMEOUT_S))
+        return store, writer
+
+    def test_drop_policy_accounting(self):
+        store, writer = self._stalled_queue(POLICY_DROP)
+        accepted = [writer.put({'n': n}) for n in range(1, 9)]
+        self.assertEqual(accepted, [True] * QUEUE_SIZE + [False] * (8 - QUEUE_SIZE))
+
+        stats = writer.stats()
+        self.assertEqual(stats['enqueued'], 1 + QUEUE_SIZE)
+        self.assertEqual(stats['dropped'], 8 - QUEUE_SIZE)
+        self.assertEqual(stats['queued'], QUEUE_SIZE)
+        self.assertEqual(stats['sync_writes'], 0)
+
+        store.gate.set()
+        writer.flush()
+        stats = writer.stats()
+        self.assertEqual(stats['written'], stats['enqueued'])
+        self.assertEqual(sorted(r['n'] for r in store.records), list(range(QUEUE_SIZE + 1)))
+        print(f"Drop policy: {stats['written']} written, {stats['dropped']} dropped")
+
+    def test_block_policy_accounting(self):
+        store, writer = self._stalled_queue(POLICY_BLOCK)
+        accepted = [writer.put({'n': n}) for n in range(1, 9)]
+        self.assertEqual(accepted, [True] * 8)
+
+        stats = writer.stats()
+        self.assertEqual(stats['dropped'], 0)
+        self.assertEqual(stats['enqueued'], 1 + QUEUE_SIZE)
+        self.assertEqual(stats['sync_writes'], 8 - QUEUE_SIZE)
+        # Overflow was written synchronously while the writer thread was stalled
+        self.assertEqual(sorted(r['n'] for r in store.records), list(range(QUEUE_SIZE + 1, 9)))
+
+        store.gate.set()
+        writer.flush()
+        stats = writer.stats()
+        self.assertEqual(stats['written'], 9)
+        self.assertEqual(stats['failed'], 0)
+        self.assertEqual(sorted(r['n'] for r in store.records), list(range(9)))
+        print(f"Block policy: {stats['written']} written, {stats['sync_writes']} synchronously")
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            WriteBehindQueue(GatedStore(), policy='spill')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,292 @@
+"""
+Spatial index for zone/ward lookup, loaded once from a zones or polygon file.
+"""
+import json
+
+import numpy as np
+from django.conf import settings
+
+# City limits; points outside are not geocoded
+CITY_BOUNDS = {'lat_min': 22.8000, 'lat_max': 23.2000, 'lng_min': 72.4000, 'lng_max': 72.7000}
+
+# Lookup raster and bucket grid resolution (degrees)
+RASTER_DEG = 0.001
+BUCKET_DEG = 0.01
+
+# Raster cells that need the exact lookup (on a region boundary)
+BOUNDARY = -2
+OUTSIDE = -1
+
+DEFAULT_REGION = ('West Zone', 'Vastrapur', 'SG Highway')
+
+
+def _bounds_ring(bounds):
+    return np.array([
+        [bounds['lng_min'], bounds['lat_min']], [bounds['lng_max'], bounds['lat_min']],
+        [bounds['lng_max'], bounds['lat_max']], [bounds['lng_min'], bounds['lat_max']]
+    ], dtype=float)
+
+
+def _points_in_ring(x, y, ring):
+    """
+    Even-odd ray casting for many points against one ring of (lng, lat) vertices.
+    """
+    inside = np.zeros(len(x), dtype=bool)
+    xj, yj = ring[-1]
+    for xi, yi in ring:
+        crosses = (yi > y) != (yj > y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_cross = (xj - xi) * (y - yi) / (yj - yi) + xi
+        inside ^= crosses & (x < x_cross)
+        xj, yj = xi, yi
+    return inside
+
+
+class Region:
+    """
+    One polygon (outer ring plus holes) with its zone and, for ward polygons, ward.
+    """
+
+    def __init__(self, rings, zone, ward=None, locality=None, wards=None, center=None):
+        self.rings = [np.asarray(r, dtype=float)[:, :2] for r in rings]
+        self.zone = zone
+        self.ward = ward
+        self.locality = locality
+        self.wards = wards or ([ward] if ward else [])
+        outer = self.rings[0]
+        self.bbox = (outer[:, 1].min(), outer[:, 1].max(), outer[:, 0].min(), outer[:, 0].max())
+        if center is None:
+            center = {'lat': float(outer[:, 1].mean()), 'lng': float(outer[:, 0].mean())}
+        self.center = (center['lat'], center['lng'])
+
+    def contains(self, lat, lng):
+        inside = _points_in_ring(lng, lat, self.rings[0])
+        for hole in self.rings[1:]:
+            inside &= ~_points_in_ring(lng, lat, hole)
+        return inside
+
+
+def load_regions(path):
+    """
+    Regions from a zones file (zones with bounds, ward names and centre) or a
+    GeoJSON FeatureCollection of (Multi)Polygons with zone/ward/locality properties.
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    regions = []
+    if data.get('type') == 'FeatureCollection':
+        for feature in data['features']:
+            geometry = feature.get('geometry') or {}
+            props = feature.get('properties') or {}
+            polygons = {'Polygon': [geometry.get('coordinates')],
+                        'MultiPolygon': geometry.get('coordinates')}.get(geometry.get('type'), [])
+            for rings in polygons:
+                regions.append(Region(
+                    rings,
+                    zone=props.get('zone', 'Unknown'),
+                    ward=props.get('ward') or props.get('name'),
+                    locality=props.get('locality')
+                ))
+    else:
+        for zone in data.get('zones', []):
+            regions.append(Region(
+                [_bounds_ring(zone['bounds'])],
+                zone=zone['name'],
+                wards=zone.get('wards', []),
+                center=zone.get('center')
+            ))
+    return regions
+
+
+class GeoIndex:
+    """
+    O(1) point -> (zone, ward, locality) lookup.
+
+    Region bounding boxes are bucketed on a coarse grid; the exact lookup
+    tests only the bucket's candidate regions, resolves overlapping regions
+    by nearest region centre and, for zone polygons without ward geometry,
+    picks the nearest known ward centre in the zone. The exact lookup is run
+    once for every cell of a fine raster over the city; cells whose label
+    differs from a neighbour are marked as boundary cells, so a query is a
+    raster read and only boundary points take the exact path. Labels index
+    into a table of (zone, ward, locality).
+    """
+
+    def __init__(self, regions, ward_centers=None, ward_localities=None,
+                 bounds=CITY_BOUNDS, raster_deg=RASTER_DEG, bucket_deg=BUCKET_DEG):
+        self.regions = regions
+        self.bounds = bounds
+        self.labels = []
+        self._label_ids = {}
+
+        names = [n for n, c in (ward_centers or {}).items()]
+        self._ward_names = names
+        self._ward_lat = np.array([ward_centers[n]['lat'] for n in names], dtype=float)
+        self._ward_lng = np.array([ward_centers[n]['lng'] for n in names], dtype=float)
+        self._ward_localities = ward_localities or {}
+        self._region_lat = np.array([r.center[0] for r in regions], dtype=float)
+        self._region_lng = np.array([r.center[1] for r in regions], dtype=float)
+
+        # Bucket grid: buckets x regions membership from bounding boxes
+        self.bucket_deg = bucket_deg
+        self.bucket_rows = int(np.ceil((bounds['lat_max'] - bounds['lat_min']) / bucket_deg))
+        self.bucket_cols = int(np.ceil((bounds['lng_max'] - bounds['lng_min']) / bucket_deg))
+        self._buckets = np.zeros((self.bucket_rows * self.bucket_cols, len(regions)), dtype=bool)
+        for i, region in enumerate(regions):
+            lat_min, lat_max, lng_min, lng_max = region.bbox
+            r0, c0 = self._bucket_rc(lat_min, lng_min)
+            r1, c1 = self._bucket_rc(lat_max, lng_max)
+            rows = np.arange(max(r0, 0), min(r1, self.bucket_rows - 1) + 1)
+            cols = np.arange(max(c0, 0), min(c1, self.bucket_cols - 1) + 1)
+            self._buckets[(rows[:, None] * self.bucket_cols + cols[None, :]).ravel(), i] = True
+
+        self.default_label = self._label(*DEFAULT_REGION)
+
+        # Lookup raster of exact labels at cell centres, boundary cells flagged
+        self.raster_deg = raster_deg
+        self.rows = int(np.ceil((bounds['lat_max'] - bounds['lat_min']) / raster_deg))
+        self.cols = int(np.ceil((bounds['lng_max'] - bounds['lng_min']) / raster_deg))
+        r, c = np.divmod(np.arange(self.rows * self.cols), self.cols)
+        labels = self.lookup_exact(bounds['lat_min'] + (r + 0.5) * raster_deg,
+                                   bounds['lng_min'] + (c + 0.5) * raster_deg).reshape(self.rows, self.cols)
+        padded = np.pad(labels, 1, mode='edge')
+        boundary = np.zeros(labels.shape, dtype=bool)
+        for dr in (0, 1, 2):
+            for dc in (0, 1, 2):
+                boundary |= padded[dr:dr + self.rows, dc:dc + self.cols] != labels
+        self.raster = np.where(boundary, BOUNDARY, labels).astype(np.int16)
+
+    def _bucket_rc(self, lat, lng):
+        return (np.floor((np.asarray(lat) - self.bounds['lat_min']) / self.bucket_deg).astype(int),
+                np.floor((np.asarray(lng) - self.bounds['lng_min']) / self.bucket_deg).astype(int))
+
+    def _label(self, zone, ward, locality):
+        key = (zone, ward, locality)
+        if key not in self._label_ids:
+            self._label_ids[key] = len(self.labels)
+            self.labels.append(key)
+        return self._label_ids[key]
+
+    def _within_bounds(self, lat, lng):
+        b = self.bounds
+        return (lat >= b['lat_min']) & (lat <= b['lat_max']) & (lng >= b['lng_min']) & (lng <= b['lng_max'])
+
+    def _region_label(self, region, lat, lng):
+        """
+        Labels for points inside one region, choosing the nearest known ward when
+        the region is a zone.
+        """
+        if region.ward:
+            locality = region.locality or (self._ward_localities.get(region.ward) or ['Unknown'])[0]
+            return np.full(len(lat), self._label(region.zone, region.ward, locality))
+
+        known = [i for i, n in enumerate(self._ward_names) if n in region.wards]
+        if not known:
+            ward = region.wards[0] if region.wards else 'Unknown'
+            return np.full(len(lat), self._label(region.zone, ward, 'Unknown'))
+
+        d = (lat[:, None] - self._ward_lat[known]) ** 2 + (lng[:, None] - self._ward_lng[known]) ** 2
+        ids = []
+        for i in known:
+            ward = self._ward_names[i]
+            ids.append(self._label(region.zone, ward, (self._ward_localities.get(ward) or ['Unknown'])[0]))
+        return np.asarray(ids)[d.argmin(axis=1)]
+
+    def lookup_exact(self, lat, lng):
+        """
+        Exact labels: candidate regions from the bucket grid, point-in-polygon, nearest
+        centre among overlapping regions. OUTSIDE beyond the city bounds.
+        """
+        lat = np.asarray(lat, dtype=float).ravel()
+        lng = np.asarray(lng, dtype=float).ravel()
+        labels = np.full(len(lat), OUTSIDE, dtype=np.int64)
+        inside_city = self._within_bounds(lat, lng)
+        if not self.regions:
+            labels[inside_city] = self.default_label
+            return labels
+
+        r, c = self._bucket_rc(lat, lng)
+        bucket = np.clip(r, 0, self.bucket_rows - 1) * self.bucket_cols + np.clip(c, 0, self.bucket_cols - 1)
+        candidates = self._buckets[bucket] & inside_city[:, None]
+
+        best_region = np.full(len(lat), -1)
+        best_distance = np.full(len(lat), np.inf)
+        for i, region in enumerate(self.regions):
+            idx = np.flatnonzero(candidates[:, i])
+            if not len(idx):
+                continue
+            idx = idx[region.contains(lat[idx], lng[idx])]
+            d = (lat[idx] - self._region_lat[i]) ** 2 + (lng[idx] - self._region_lng[i]) ** 2
+            closer = d < best_distance[idx]
+            best_region[idx[closer]] = i
+            best_distance[idx[closer]] = d[closer]
+
+        for i, region in enumerate(self.regions):
+            idx = np.flatnonzero(best_region == i)
+            if len(idx):
+                labels[idx] = self._region_label(region, lat[idx], lng[idx])
+
+        labels[inside_city & (best_region < 0)] = self.default_label
+        return labels
+
+    def lookup(self, lat, lng):
+        """
+        Vectorized labels for any number of points: raster read, exact lookup only for
+        boundary cells.
+        """
+        lat = np.asarray(lat, dtype=float)
+        lng = np.asarray(lng, dtype=float)
+        shape = np.broadcast(lat, lng).shape
+        lat = np.broadcast_to(lat, shape).ravel()
+        lng = np.broadcast_to(lng, shape).ravel()
+
+        labels = np.full(len(lat), OUTSIDE, dtype=np.int64)
+        inside = np.flatnonzero(self._within_bounds(lat, lng))
+        r = np.minimum(((lat[inside] - self.bounds['lat_min']) / self.raster_deg).astype(int), self.rows - 1)
+        c = np.minimum(((lng[inside] - self.bounds['lng_min']) / self.raster_deg).astype(int), self.cols - 1)
+        labels[inside] = self.raster[r, c]
+
+        boundary = inside[labels[inside] == BOUNDARY]
+        if len(boundary):
+            labels[boundary] = self.lookup_exact(lat[boundary], lng[boundary])
+        return labels.reshape(shape)
+
+    def describe(self, label):
+        """
+        Reverse-geocode dict for one label.
+        """
+        if label < 0:
+            return {
+                'locality': 'Unknown',
+                'ward': 'Unknown',
+                'zone': 'Unknown',
+                'address': 'Location outside Ahmedabad city limits'
+            }
+        zone, ward, locality = self.labels[label]
+        return {
+            'locality': locality,
+            'ward': ward,
+            'zone': zone,
+            'address': f'{locality}, {ward}, Ahmedabad'
+        }
+
+
+_index = None
+
+
+def get_geo_index():
+    """
+    Shared GeoIndex built from settings.GEO_REGIONS_FILE on first use.
+    """
+    global _index
+    if _index is None:
+        from utils.geocoding import AHMEDABAD_LOCATIONS
+
+        wards = AHMEDABAD_LOCATIONS['wards']
+        _index = GeoIndex(
+            load_regions(settings.GEO_REGIONS_FILE),
+            ward_centers={name: w['center'] for name, w in wards.items()},
+            ward_localities={name: w['localities'] for name, w in wards.items()}
+        )
+    return _index
@@ -53,6 +53,8 @@ def reverse_geocode_tomtom(lat, lng):
     In production, this would call:
     https://api.tomtom.com/search/2/reverseGeocode/{lat},{lng}.json?key={TOMTOM_API_KEY}
     
+    The mock resolves the point with the shared GeoIndex (utils.geo_index).
+    
     Args:
         lat: Latitude
         lng: Longitude
@@ -65,55 +67,29 @@ def reverse_geocode_tomtom(lat, lng):
             'address': 'SG Highway, Vastrapur, Ahmedabad'
         }
     """
-    # Validate Ahmedabad bounds
-    if not (22.8000 <= lat <= 23.2000 and 72.4000 <= lng <= 72.7000):
-        return {
-            'locality': 'Unknown',
-            'ward': 'Unknown',
-            'zone': 'Unknown',
-            'address': 'Location outside Ahmedabad city limits'
-        }
-    
-    # Find nearest zone and ward based on coordinates
-    nearest_zone = None
-    nearest_ward = None
-    nearest_locality = None
-    min_distance = float('inf')
-    
-    for zone_name, zone_data in AHMEDABAD_LOCATIONS['zones'].items():
-        bounds = zone_data['bounds']
-        if (bounds['lat_min'] <= lat <= bounds['lat_max'] and 
-            bounds['lng_min'] <= lng <= bounds['lng_max']):
-            nearest_zone = zone_name
-            
-            # Find nearest ward
-            for ward_name in zone_data['wards']:
-                if ward_name in AHMEDABAD_LOCATIONS['wards']:
-                    ward_center = AHMEDABAD_LOCATIONS['wards'][ward_name]['center']
-                    distance = math.sqrt(
-                        (lat - ward_center['lat'])**2 + 
-                        (lng - ward_center['lng'])**2
-                    )
-                    if distance < min_distance:
-                        min_distance = distance
-                        nearest_ward = ward_name
-                        # Get first locality as default
-                        localities = AHMEDABAD_LOCATIONS['wards'][ward_name]['localities']
-                        nearest_locality = localities[0] if localities else 'Unknown'
-            break
+    from utils.geo_index import get_geo_index
+
+    index = get_geo_index()
+    return index.describe(int(index.lookup(lat, lng)))
+
+
+def reverse_geocode_batch(lats, lngs):
+    """
+    Reverse geocode many coordinates at once.
     
-    if not nearest_zone:
-        # Default to city center area
-        nearest_zone = 'West Zone'
-        nearest_ward = 'Vastrapur'
-        nearest_locality = 'SG Highway'
+    Args:
+        lats: Sequence of latitudes
+        lngs: Sequence of longitudes
     
-    return {
-        'locality': nearest_locality,
-        'ward': nearest_ward,
-        'zone': nearest_zone,
-        'address': f'{nearest_locality}, {nearest_ward}, Ahmedabad'
-    }
+    Returns:
+        tuple: (label per point, {label: reverse geocode dict}) - points sharing a
+        label share the same zone, ward and locality
+    """
+    from utils.geo_index import get_geo_index
+
+    index = get_geo_index()
+    labels = index.lookup(lats, lngs)
+    return labels, {int(label): index.describe(int(label)) for label in set(labels.ravel().tolist())}
 
 
 def get_distance(lat1, lng1, lat2, lng2):
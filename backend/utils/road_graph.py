@@ -0,0 +1,173 @@
+"""
+Road graph built from the cached Overpass responses in the repository's cache/ folder.
+"""
+import glob
+import json
+import os
+import re
+
+import numpy as np
+from django.conf import settings
+
+EARTH_RADIUS_KM = 6371.0
+
+# Typical urban speeds (km/h) used for travel times
+SPEED_KMH = {
+    'motorway': 60, 'trunk': 50, 'primary': 40, 'secondary': 35, 'tertiary': 30,
+    'unclassified': 25, 'residential': 20, 'living_street': 10,
+}
+DEFAULT_SPEED_KMH = 25
+LINK_SUFFIX = '_link'
+
+# Speed used for the straight-line hop between a point and its nearest graph node
+ACCESS_SPEED_KMH = 15
+
+# OSMnx oneway values, mirrored from ai/model_traffic2/road_edges.py
+ONEWAY_VALUES = {'yes', 'true', '1', '-1', 'reverse', 't', 'f'}
+REVERSE_VALUES = {'-1', 'reverse', 't'}
+
+# OSMnx network_type="drive" filter, mirrored from ai/model_traffic2/road_edges.py
+# (Overpass !~ is an unanchored regex match)
+DRIVE_EXCLUDE = {
+    'area': re.compile('yes'),
+    'access': re.compile('private'),
+    'highway': re.compile(
+        'abandoned|bridleway|bus_guideway|construction|corridor|cycleway|elevator|escalator|'
+        'footway|no|path|pedestrian|planned|platform|proposed|raceway|razed|service|steps|track'
+    ),
+    'motor_vehicle': re.compile('no'),
+    'motorcar': re.compile('no'),
+    'service': re.compile('alley|driveway|emergency_access|parking|parking_aisle|private'),
+}
+
+
+def _haversine_km(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = (np.radians(v) for v in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
+
+
+def is_drivable(tags):
+    """
+    True when a way passes the OSMnx drive filter.
+    """
+    return 'highway' in tags and not any(
+        key in tags and pattern.search(str(tags[key])) for key, pattern in DRIVE_EXCLUDE.items()
+    )
+
+
+def is_oneway(tags):
+    """
+    OSMnx oneway rule: oneway-tagged ways and roundabouts.
+    """
+    return str(tags.get('oneway', 'no')).lower() in ONEWAY_VALUES or tags.get('junction') == 'roundabout'
+
+
+def _speed(highway):
+    return SPEED_KMH.get(highway.replace(LINK_SUFFIX, ''), DEFAULT_SPEED_KMH)
+
+
+class RoadGraph:
+    """
+    Directed drive graph in CSR form.
+
+    Nodes are OSM nodes used by ways that pass the OSMnx drive filter; every
+    consecutive node pair of a way is an edge in its allowed direction(s). Two
+    CSR matrices share the same structure: `distance` in km and `time` in
+    minutes. Points are snapped to the nearest node with a KD-tree on locally
+    projected coordinates.
+    """
+
+    def __init__(self, cache_dir=None):
+        from scipy.spatial import cKDTree
+
+        cache_dir = cache_dir or settings.ROAD_CACHE_DIR
+        nodes, ways = {}, {}
+        for path in sorted(glob.glob(os.path.join(str(cache_dir), '*.json'))):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            for element in data.get('elements', []):
+                if element['type'] == 'node':
+                    nodes[element['id']] = (element['lat'], element['lon'])
+                elif element['type'] == 'way' and is_drivable(element.get('tags', {})):
+                    ways[element['id']] = element
+
+        index = {}
+        src, dst, speed = [], [], []
+        for way in ways.values():
+            way_nodes = [n for n in way['nodes'] if n in nodes]
+            if len(way_nodes) < 2:
+                continue
+            tags = way['tags']
+            kmh = _speed(tags['highway'])
+            if str(tags.get('oneway', 'no')).lower() in REVERSE_VALUES:
+                way_nodes = way_nodes[::-1]
+            ids = [index.setdefault(n, len(index)) for n in way_nodes]
+            a, b = ids[:-1], ids[1:]
+
+            src += a
+            dst += b
+            if not is_oneway(tags):
+                src += b
+                dst += a
+            speed += [kmh] * (len(src) - len(speed))
+
+        coords = np.empty((len(index), 2))
+        for node_id, i in index.items():
+            coords[i] = nodes[node_id]
+        self.node_lat = coords[:, 0]
+        self.node_lng = coords[:, 1]
+
+        src = np.array(src, dtype=np.int64)
+        dst = np.array(dst, dtype=np.int64)
+        length_km = _haversine_km(self.node_lat[src], self.node_lng[src], self.node_lat[dst], self.node_lng[dst])
+        # Zero-length edges would vanish from the sparse matrix
+        length_km = np.maximum(length_km, 1e-6)
+        minutes = length_km / np.array(speed, dtype=float) * 60.0
+
+        n = len(index)
+        self.distance = self._csr(src, dst, length_km, n)
+        self.time = self._csr(src, dst, minutes, n)
+
+        self.ref_lat = float(self.node_lat.mean()) if n else 0.0
+        self._tree = cKDTree(np.column_stack(self.project(self.node_lat, self.node_lng)))
+
+    @staticmethod
+    def _csr(src, dst, weight, n):
+        import scipy.sparse as sp
+
+        # csr_matrix would sum parallel edges; keep the cheapest one instead
+        key = src * n + dst
+        order = np.lexsort((weight, key))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = key[order][1:] != key[order][:-1]
+        keep = order[first]
+        return sp.csr_matrix((weight[keep], (src[keep], dst[keep])), shape=(n, n))
+
+    @property
+    def size(self):
+        return len(self.node_lat)
+
+    def project(self, lat, lng):
+        lat = np.asarray(lat, dtype=float)
+        lng = np.asarray(lng, dtype=float)
+        return (np.radians(lng) * EARTH_RADIUS_KM * np.cos(np.radians(self.ref_lat)),
+                np.radians(lat) * EARTH_RADIUS_KM)
+
+    def nearest_node(self, lat, lng):
+        """
+        Nearest graph node for each point. Returns (node index, straight-line km).
+        """
+        x, y = self.project(np.atleast_1d(lat), np.atleast_1d(lng))
+        distance, node = self._tree.query(np.column_stack([x, y]))
+        return node, distance
+
+
+_graph = None
+
+
+def get_road_graph():
+    global _graph
+    if _graph is None:
+        _graph = RoadGraph()
+    return _graph
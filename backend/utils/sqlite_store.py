@@ -0,0 +1,58 @@
+"""
+Shared plumbing for the SQLite-backed stores: per-thread WAL connections,
+compressed JSON payloads and (created_at, id) cursors.
+"""
+import base64
+import json
+import os
+import sqlite3
+import threading
+import zlib
+
+
+def encode_cursor(created_at, record_id):
+    return base64.urlsafe_b64encode(f'{created_at}|{record_id}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    (created_at, id) from a cursor. Raises ValueError for a malformed cursor.
+    """
+    try:
+        created_at, record_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|', 1)
+    except Exception:
+        raise ValueError('Invalid cursor')
+    return created_at, record_id
+
+
+def compress(record):
+    return zlib.compress(json.dumps(record, separators=(',', ':')).encode(), 6)
+
+
+def decompress(blob):
+    return json.loads(zlib.decompress(blob).decode())
+
+
+class SQLiteStore:
+    """
+    SQLite database in WAL mode (readers never block the writer) with one
+    connection per thread and a lock serialising writes from this process.
+    """
+
+    schema = ''
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.created = not os.path.exists(self.path)
+        self._connection().executescript(self.schema)
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn